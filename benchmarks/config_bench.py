@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+"""
+Microbenchmark for the 'SkaffConfig' accessors used by the 'driver' module.
+
+Run from the top-level source directory:
+
+python3 -m benchmarks.config_bench --projects 1000
+"""
+
+# --------------------------------- MODULES -----------------------------------
+import argparse
+import timeit
+
+from skaff.config import SkaffConfig
+# --------------------------------- MODULES -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+def driver_access(config: SkaffConfig) -> None:
+    """
+    Mimics the accessor calls 'skaff_drive' issues for every project.
+    """
+    for base_dir in config.directories_get():
+        for sub_dir in config.subdirectories_get():
+            pass
+        # 'jobs_create' validates each project exactly once
+        if not config.directory_contains(base_dir):
+            raise RuntimeError("inconsistent 'directories_get' result")
+        ", ".join(config.authors_get())
+        ", ".join(config.authors_get())
+        config.language_get()
+        config.license_get()
+        config.quiet_get()
+        config.paths_get()
+
+
+def main() -> None:
+    """
+    Times 'driver_access' for a configurable number of project directories.
+    """
+    description = "Microbenchmark for the 'SkaffConfig' accessors"
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("-n",
+                        "--projects",
+                        type=int,
+                        default=1000,
+                        help="number of project directories")
+    parser.add_argument("-r",
+                        "--repeat",
+                        type=int,
+                        default=5,
+                        help="number of timing repetitions")
+    args = parser.parse_args()
+    directories = ["project{0}".format(i) for i in range(args.projects)]
+    config = SkaffConfig(directories, authors=("Ada", "Grace"))
+    # Construction is lazy; the first access pays for reading the layers and
+    # probing the license and template paths
+    construct = timeit.Timer(lambda: SkaffConfig(directories[:1]))
+    construct_best = min(construct.repeat(repeat=args.repeat, number=100))
+    timer = timeit.Timer(lambda: driver_access(config))
+    best = min(timer.repeat(repeat=args.repeat, number=1))
+
+    print("projects: {0}".format(args.projects))
+    print("construction: {0:.3f} us".format(construct_best / 100 * 1e6))
+    print("driver access pattern: {0:.6f} s (best of {1})".format(
+        best, args.repeat))
+    print("per project: {0:.3f} us".format(best / args.projects * 1e6))
+# -------------------------------- FUNCTIONS ----------------------------------
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark for the generation of project-directories by 'skaff_drive' under
+each of the durability modes, along with the concurrency the file operations
+settled on.
+
+Run from the top-level source directory:
+
+python3 -m benchmarks.generate_bench --projects 50 --directory /tmp
+"""
+
+# --------------------------------- MODULES -----------------------------------
+import argparse
+import os
+import time
+
+from tempfile import TemporaryDirectory
+from skaff.config import SkaffConfig
+from skaff.driver import skaff_drive
+from skaff.schedtools import IOScheduler
+from skaff.synctools import DURABILITY_MODES
+# --------------------------------- MODULES -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+def generate(directory: str, projects: int, durability: str) -> tuple:
+    """
+    Generates 'projects' quiet project-directories under 'directory' with the
+    given 'durability' and returns the wall-clock seconds spent along with
+    the 'IOMetrics' of the run.
+    """
+    directories = [directory + "project{0}".format(i)
+                   for i in range(projects)]
+    config = SkaffConfig(directories, authors=("Ada", "Grace"), quiet=True)
+    start = time.monotonic()
+    with IOScheduler() as scheduler:
+        skaff_drive(config, durability=durability, scheduler=scheduler)
+    return time.monotonic() - start, scheduler.metrics_get()
+
+
+def main() -> None:
+    """
+    Times 'generate' for each of the durability modes.
+    """
+    description = "Benchmark for the durability modes of 'skaff_drive'"
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("-n",
+                        "--projects",
+                        type=int,
+                        default=50,
+                        help="number of project directories")
+    parser.add_argument("-r",
+                        "--repeat",
+                        type=int,
+                        default=3,
+                        help="number of timing repetitions")
+    parser.add_argument("-d",
+                        "--directory",
+                        type=str,
+                        default=None,
+                        help=("directory to generate in; the file system "
+                              "in use decides the cost of flushing"))
+    args = parser.parse_args()
+
+    print("projects: {0}".format(args.projects))
+    for durability in DURABILITY_MODES:
+        timings = list()
+        for _ in range(args.repeat):
+            with TemporaryDirectory(dir=args.directory) as tmp_dir:
+                timings.append(generate(tmp_dir + os.sep, args.projects,
+                                        durability))
+        best, metrics = min(timings, key=lambda timing: timing[0])
+        print("durability {0}: {1:.3f} s, {2:.3f} ms per project, "
+              "concurrency {3} (peak {4}; best of {5})".format(
+                  durability, best, best / args.projects * 1e3,
+                  metrics.concurrency, metrics.peak, args.repeat))
+# -------------------------------- FUNCTIONS ----------------------------------
+
+
+if __name__ == "__main__":
+    main()
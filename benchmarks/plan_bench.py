@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark for the memory taken by the generation plan of a batch of
+project-directories: as the cached layout the drivers write each project
+from (the paths of one project at a time, see 'layout_write'), as a 'Plan'
+and as a list of full path strings built by concatenation (one 'PlanOp' per
+entry).
+
+Run from the top-level source directory:
+
+python3 -m benchmarks.plan_bench --projects 100000
+"""
+
+# --------------------------------- MODULES -----------------------------------
+import argparse
+import time
+import tracemalloc
+
+from skaff.config import SkaffConfig
+from skaff.jobtools import jobs_create
+from skaff.layouttools import (
+    doxygen_found,
+    layout_get,
+    layout_paths_get
+)
+from skaff.plantools import plan_create
+# --------------------------------- MODULES -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+def measure(function, *args) -> tuple:
+    """
+    Calls 'function' with 'args' and returns its result along with the
+    bytes it still holds afterwards and the wall-clock seconds spent.
+    """
+    tracemalloc.start()
+    start = time.monotonic()
+    result = function(*args)
+    seconds = time.monotonic() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, seconds
+
+
+def layouts_walk(jobs) -> int:
+    """
+    Joins the paths of the layout of each of 'jobs' the way the drivers do
+    while writing them, and returns the number of entries.
+    """
+    doxygen = doxygen_found()
+    count = 0
+
+    for job in jobs:
+        layout = layout_get(job, doxygen)
+        count += len(layout_paths_get(job, layout)) + 1
+
+    return count
+
+
+def main() -> None:
+    """
+    Measures the layouts the drivers walk and a 'Plan' against the list of
+    the 'PlanOp'(s) of the same batch.
+    """
+    description = "Benchmark for the memory taken by 'Plan'"
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("-n",
+                        "--projects",
+                        type=int,
+                        default=100000,
+                        help="number of project directories")
+    args = parser.parse_args()
+
+    directories = ["project{0}".format(i) for i in range(args.projects)]
+    jobs = tuple(jobs_create(SkaffConfig(directories, quiet=True)))
+    # Resolves the shared fields of the jobs (and the caches of the plan)
+    # before anything is measured
+    plan_create(jobs[:1])
+
+    _, layout_size, layout_seconds = measure(layouts_walk, jobs)
+    plan, plan_size, plan_seconds = measure(plan_create, jobs)
+    _, list_size, list_seconds = measure(list, plan)
+    print(("{0} projects, {1} entries\n"
+           "layouts:     {2:8.1f} MiB {3:6.2f} s\n"
+           "Plan:        {4:8.1f} MiB {5:6.2f} s "
+           "({6} bytes by 'nbytes_get')\n"
+           "path list:   {7:8.1f} MiB {8:6.2f} s").format(
+               args.projects, len(plan), layout_size / 2 ** 20,
+               layout_seconds, plan_size / 2 ** 20, plan_seconds,
+               plan.nbytes_get(), list_size / 2 ** 20, list_seconds))
+# -------------------------------- FUNCTIONS ----------------------------------
+
+
+if __name__ == "__main__":
+    main()
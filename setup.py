@@ -88,7 +88,9 @@ def main() -> None:
     # Note the following would not be properly executed
     # if permission is not satisfied
     if "install" in sys.argv and all(manual_conditions):
-        manuals_install(manpath_select(), True, *skaff_man_sources)
+        # Only the changed manual pages are indexed, in the background
+        manuals_install(manpath_select(), True, *skaff_man_sources,
+                        background=True)
 # -------------------------------- FUNCTIONS ----------------------------------
 
 
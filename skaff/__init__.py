@@ -38,7 +38,10 @@ library with built-in (CMake-based) C/C++ support.
 # ------------------------------- MODULE INFO ---------------------------------
 # Note the naming convention shown here coming from the 'ranger' program from
 # http://ranger.nongnu.org/
-__all__ = ["clitools", "config", "driver", "info", "manualtools"]
+__all__ = ["asyncdriver", "clitools", "config", "conftools", "driver",
+           "gittools", "hooktools", "info", "jobtools", "journaltools",
+           "layouttools", "manualtools", "plantools", "registry", "schedtools",
+           "stagetools", "synctools"]
 __author__ = "Jiahui Xie"
 __email__ = ".".join(__author__.lower().split()) + "@outlook.com"
 __license__ = "BSD2"
@@ -52,36 +55,146 @@ __version__ = "1.0"
 # "
 # (only used in 'driver_test' unit test module to access private functions)
 # from breaking -- DEPRECATED
+from skaff.asyncdriver import skaff_async_drive
+
 from skaff.clitools import (
     key_get,
+    names_read,
     timeout,
+    timed_key_async_get,
     timed_key_get,
     ANSIColor,
+    RawSession,
     SmartFormatter
 )
 
 from skaff.config import SkaffConfig
 
+from skaff.conftools import (
+    conf_load,
+    conf_parse,
+    conf_write
+)
+
 from skaff.driver import (
     skaff_drive,
-    _arguments_check,
-    _conf_doc_prompt,
+    _conf_batch_edit,
     _conf_edit,
     _conf_spawn,
     _doc_create,
     _doxyfile_generate,
-    _doxyfile_attr_match,
     _license_sign
 )
 
+from skaff.gittools import (
+    GitDefaults,
+    git_defaults_get,
+    git_repository_init,
+    git_repositories_init
+)
+
+from skaff.hooktools import (
+    HOOK_PHASES,
+    Hook,
+    HookResult,
+    HookRunner,
+    hook_async_run,
+    hook_create,
+    hook_format,
+    hook_run
+)
+
 from skaff.info import (
     skaff_description_get,
     skaff_info_get
 )
 
+from skaff.jobtools import (
+    DigestSet,
+    SkaffJob,
+    job_check,
+    job_create,
+    job_directory_key,
+    job_hooks_get,
+    job_root_get,
+    job_template_get,
+    jobs_create,
+    jobs_stream
+)
+
+from skaff.journaltools import (
+    JOURNAL_EVENTS,
+    JOURNAL_HEADER,
+    Journal
+)
+
+from skaff.layouttools import (
+    CHANGELOG_FILE,
+    CMAKE_FILE,
+    CONF_FILES,
+    DOXYFILE,
+    INCLUDE_DIR,
+    LAYOUT_OPS,
+    LAYOUT_STEPS,
+    LICENSE_FILE,
+    README_FILE,
+    SIGNED_LICENSES,
+    TRAVIS_FILE,
+    LayoutEntry,
+    doxyfile_rewrite,
+    doxygen_found,
+    layout_get,
+    layout_paths_get,
+    layout_write,
+    template_path_get,
+    tree_plan_get,
+    _doxyfile_attr_match
+)
+
 from skaff.manualtools import (
     manual_check,
+    manual_compress,
+    manuals_compress,
+    manuals_index,
     manuals_install,
     manuals_probe,
+    manpath_resolve,
     manpath_select
 )
+
+from skaff.plantools import (
+    PLAN_OPS,
+    Plan,
+    PlanOp,
+    plan_create
+)
+
+from skaff.registry import (
+    LicenseEntry,
+    LicenseRegistry,
+    TemplateEntry,
+    TemplateRegistry,
+    license_registry_get,
+    template_registry_get
+)
+
+from skaff.schedtools import (
+    IOMetrics,
+    IOScheduler
+)
+
+from skaff.stagetools import (
+    STAGE_PREFIX,
+    rename_noreplace,
+    stage_create,
+    stage_discard,
+    stage_publish,
+    stages_clean,
+    stages_parents_clean
+)
+
+from skaff.synctools import (
+    DURABILITY_MODES,
+    durability_check,
+    tree_sync
+)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+
+"""
+Asynchronous driver module of the skaff program, for embedding it in
+'asyncio' based services.
+
+External programs ('doxygen' and the hooks) run through
+'asyncio.create_subprocess_exec' and the file I/O is done on a bounded
+executor, so the event loop is never blocked; any number of generations can
+be awaited concurrently, and cancelling one of them kills its running
+programs.
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = ["skaff_async_drive"]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import asyncio
+import concurrent.futures
+import os
+import tempfile
+
+from skaff.config import SkaffConfig
+from skaff.hooktools import hook_async_run
+from skaff.jobtools import (
+    job_hooks_get,
+    job_root_get,
+    jobs_create
+)
+from skaff.layouttools import (
+    DOXYFILE,
+    doxyfile_rewrite,
+    doxygen_found,
+    layout_write
+)
+from skaff.stagetools import (
+    stage_create,
+    stage_discard,
+    stage_publish,
+    stages_parents_clean
+)
+from skaff.synctools import durability_check
+from typing import (
+    List,
+    Optional
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+# Number of threads doing the file I/O of a single 'skaff_async_drive' call
+# if no executor is given
+_IO_WORKERS = 4
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+async def skaff_async_drive(config: SkaffConfig, *,
+                            executor: Optional[
+                                concurrent.futures.Executor]=None,
+                            hook_workers: Optional[int]=None,
+                            hook_timeout: Optional[float]=None,
+                            durability: str="none",
+                            stage_directory: Optional[str]=None) -> List:
+    """
+    Coroutine variant of 'skaff_drive': generates all the project-directories
+    of 'config' concurrently and returns the 'HookResult' of every hook run.
+
+    The file I/O is done on 'executor'; if it is not given, a private one with
+    a few threads is used, so pass a shared executor to bound the file I/O
+    of several concurrent calls as a whole. At most 'hook_workers' hooks
+    (defaults to the number of processors) run at the same time.
+
+    There is no interactive prompt or editing: every project is generated as
+    if 'quiet' were set. Each project is generated in a staging directory
+    (under 'stage_directory' if given) and published once it is complete,
+    flushed to the disk on 'executor' according to 'durability' (see
+    'skaff_drive').
+
+    If the coroutine is cancelled (or fails), the programs it runs are killed
+    and the projects not started yet are not generated; the ones not
+    published yet are removed, and the ones already published are left as
+    they are.
+    """
+    if not isinstance(config, SkaffConfig):
+        raise ValueError("'config' argument must be of 'SkaffConfig' type")
+
+    durability_check(durability)
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+
+    if own_executor:
+        executor = concurrent.futures.ThreadPoolExecutor(_IO_WORKERS)
+
+    try:
+        # Evaluating 'config' probes the license and template paths
+        jobs = await loop.run_in_executor(
+            executor, lambda: tuple(job._replace(quiet=True)
+                                    for job in jobs_create(config)))
+        await loop.run_in_executor(executor, stages_parents_clean,
+                                   [job.directory for job in jobs],
+                                   stage_directory)
+        # Looked up once per call rather than once per project
+        doxygen = await loop.run_in_executor(executor, doxygen_found)
+        hooks = asyncio.Semaphore(hook_workers or os.cpu_count() or 1)
+        projects = [asyncio.ensure_future(
+            _project_async_generate(job, executor, hooks, hook_timeout,
+                                    durability, stage_directory, doxygen))
+            for job in jobs]
+        try:
+            project_results = await asyncio.gather(*projects)
+        except BaseException:
+            for project in projects:
+                project.cancel()
+            # Each of them submits the removal of its stage to 'executor'
+            # before it may be shut down
+            if projects:
+                await asyncio.wait(projects)
+            raise
+
+        results = [result for project in project_results for result in project]
+        post_batch_hooks = config.hooks_get("post_batch")
+        if post_batch_hooks:
+            # 'post_batch' hooks see every project-directory (separated by
+            # 'os.pathsep') through the 'SKAFF_DIRECTORIES' environment
+            # variable, and one per line in the 'SKAFF_DIRECTORIES_FILE'
+            listing_fd, listing = tempfile.mkstemp(prefix="skaff-",
+                                                   suffix=".list")
+            with open(listing_fd, "w", encoding="utf-8") as listing_file:
+                listing_file.writelines(job.directory + "\n"
+                                        for job in jobs)
+            environ = dict(os.environ)
+            environ["SKAFF_DIRECTORIES"] = os.pathsep.join(job.directory
+                                                           for job in jobs)
+            environ["SKAFF_DIRECTORIES_FILE"] = listing
+            try:
+                results.extend(await _hooks_async_run(
+                    post_batch_hooks, "post_batch", None, hooks,
+                    hook_timeout, environ))
+            finally:
+                os.remove(listing)
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False)
+
+    return results
+
+
+async def _doxyfile_async_generate(job, executor, doxygen):
+    """
+    Coroutine variant of '_doxyfile_generate' without the editing.
+    """
+    loop = asyncio.get_running_loop()
+    doxyfile = job_root_get(job) + DOXYFILE
+
+    if not doxygen:
+        await loop.run_in_executor(executor, layout_write, job, "doxyfile",
+                                   False)
+        return
+
+    process = await asyncio.create_subprocess_exec(
+        "doxygen", "-g", doxyfile,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.DEVNULL)
+    try:
+        await process.wait()
+    except asyncio.CancelledError:
+        process.kill()
+        await process.wait()
+        raise
+
+    await loop.run_in_executor(executor, doxyfile_rewrite, job)
+
+
+async def _hooks_async_run(hooks, phase, directory, semaphore, timeout,
+                           environ=None):
+    """
+    Runs 'hooks' of 'phase' for 'directory' one after another while holding
+    'semaphore' and returns their results; stops at the first hook that
+    fails (see 'HookRunner.run').
+    """
+    results = list()
+
+    for hook in hooks:
+        async with semaphore:
+            result = await hook_async_run(hook, phase, directory, environ,
+                                          timeout)
+        results.append(result)
+        if 0 != result.returncode:
+            break
+
+    return results
+
+
+async def _project_async_generate(job, executor, semaphore, timeout,
+                                  durability="none", stage_directory=None,
+                                  doxygen=False):
+    """
+    Generates the project-directory of 'job' (see '_project_build') and
+    returns the results of its hooks.
+    """
+    base_dir = job.directory
+    results = await _hooks_async_run(job_hooks_get(job, "pre_tree"),
+                                     "pre_tree", base_dir, semaphore, timeout)
+
+    for result in results:
+        if 0 != result.returncode:
+            raise RuntimeError(("'pre_tree' hook '{0}' failed for "
+                                "'{1}':\n{2}").format(" ".join(result.command),
+                                                      base_dir,
+                                                      result.output))
+
+    # File I/O already running on 'executor' cannot be interrupted; if the
+    # generation fails (or is cancelled) during 'step', the stage is removed
+    # once 'step' is done so nothing is written into it afterwards
+    step = executor.submit(stage_create, base_dir, stage_directory)
+    try:
+        stage = await asyncio.wrap_future(step)
+    except BaseException:
+        _stage_discard_after(executor, step)
+        raise
+
+    staged_job = job._replace(stage=stage)
+    step = None
+    try:
+        # The same layout as 'skaff_drive' writes, one step at a time
+        for layout_step in ("tree", "license", "conf", "doc"):
+            step = executor.submit(layout_write, staged_job, layout_step)
+            await asyncio.wrap_future(step)
+        step = None
+        await _doxyfile_async_generate(staged_job, executor, doxygen)
+        step = executor.submit(stage_publish, stage, base_dir, durability)
+        await asyncio.wrap_future(step)
+    except BaseException:
+        _stage_discard_after(executor, step, stage)
+        raise
+
+    results.extend(await _hooks_async_run(job_hooks_get(job, "post_license"),
+                                          "post_license", base_dir, semaphore,
+                                          timeout))
+    results.extend(await _hooks_async_run(job_hooks_get(job, "post_project"),
+                                          "post_project", base_dir, semaphore,
+                                          timeout))
+
+    return results
+
+
+def _stage_discard_after(executor, future, stage=None):
+    """
+    Removes 'stage' (the one 'future' results in if not given) on 'executor'
+    once 'future' (if any) is done, so the event loop is never blocked by
+    the removal; nothing is done if 'future' results in no stage.
+    """
+    def discard(future):
+        if stage is not None:
+            stage_discard(stage)
+        elif not future.cancelled() and future.exception() is None:
+            stage_discard(future.result())
+
+    if future is None or future.done():
+        executor.submit(discard, future)
+    else:
+        future.add_done_callback(discard)
+# -------------------------------- FUNCTIONS ----------------------------------
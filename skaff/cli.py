@@ -6,16 +6,23 @@ Main command line driver program for skaff.
 
 # --------------------------------- MODULES -----------------------------------
 import argparse
+import itertools
 import os
 import sys
 
-from skaff.clitools import SmartFormatter
+from skaff.clitools import (
+    SmartFormatter,
+    names_read
+)
 from skaff.config import SkaffConfig
+from skaff.conftools import conf_load
 from skaff.driver import skaff_drive
 from skaff.info import (
     skaff_description_get,
     skaff_info_get
 )
+from skaff.schedtools import IOScheduler
+from skaff.synctools import DURABILITY_MODES
 # --------------------------------- MODULES -----------------------------------
 
 
@@ -43,7 +50,7 @@ def main() -> None:
                         help="author(s) of the project")
     parser.add_argument("directories",
                         type=str,
-                        nargs="+",
+                        nargs="*",
                         help="name(s) for the output project-directory(ies)")
     parser.add_argument("-x",
                         "--language",
@@ -51,18 +58,92 @@ def main() -> None:
                         required=False,
                         choices=SkaffConfig.languages_fetch(),
                         help="major programming language used")
+    parser.add_argument("-b",
+                        "--batch-edit",
+                        action="store_true",
+                        default=None,
+                        required=False,
+                        help=("edit the configuration files of all the "
+                              "projects in one editor session at the end"))
+    parser.add_argument("--durability",
+                        type=str,
+                        required=False,
+                        choices=DURABILITY_MODES,
+                        help=("how the generated files are flushed to the "
+                              "disk (default: none)"))
+    parser.add_argument("--from-stdin",
+                        action="store_true",
+                        default=None,
+                        required=False,
+                        help=("read the names of the project-directories "
+                              "from stdin, one per line, instead of the "
+                              "arguments (implies --quiet)"))
+    parser.add_argument("-g",
+                        "--git",
+                        action="store_true",
+                        default=None,
+                        required=False,
+                        help=("create a git repository with an initial "
+                              "commit in each project-directory"))
+    parser.add_argument("--hook-jobs",
+                        type=int,
+                        required=False,
+                        metavar="N",
+                        help="number of hooks run concurrently")
+    parser.add_argument("--hook-timeout",
+                        type=float,
+                        required=False,
+                        metavar="SECONDS",
+                        help="default time limit of each hook")
+    parser.add_argument("--io-jobs",
+                        type=int,
+                        required=False,
+                        metavar="N",
+                        help=("largest number of file operations in flight "
+                              "(default: 32)"))
+    parser.add_argument("--journal",
+                        type=str,
+                        required=False,
+                        metavar="FILE",
+                        help=("record the progress of the batch in FILE "
+                              "(see --resume)"))
     parser.add_argument("-l",
                         "--license",
                         type=str,
                         required=False,
                         choices=SkaffConfig.licenses_fetch(),
                         help="type of license")
+    parser.add_argument("-0",
+                        "--null",
+                        action="store_true",
+                        default=None,
+                        required=False,
+                        help=("names read by --from-stdin are separated by "
+                              "NUL characters instead of newlines"))
     parser.add_argument("-q",
                         "--quiet",
                         action="store_true",
+                        default=None,
                         required=False,
                         help=("no interactive "
                               "CMakeLists.txt and Doxyfile editing"))
+    parser.add_argument("--resume",
+                        action="store_true",
+                        default=None,
+                        required=False,
+                        help=("skip the projects committed in the --journal "
+                              "of an interrupted batch and redo the rest"))
+    parser.add_argument("--stats",
+                        action="store_true",
+                        default=None,
+                        required=False,
+                        help="print the metrics of the file operations")
+    parser.add_argument("--stage-dir",
+                        type=str,
+                        required=False,
+                        metavar="DIRECTORY",
+                        help=("generate the projects under DIRECTORY (like "
+                              "a tmpfs) before copying them into place"))
     parser.add_argument("-V",
                         "--version",
                         action="version",
@@ -71,13 +152,93 @@ def main() -> None:
 
     args = parser.parse_args()
 
+    if args.resume and args.journal is None:
+        parser.error("--resume requires --journal")
+
+    if args.from_stdin:
+        if args.directories:
+            parser.error("directories cannot be given with --from-stdin")
+        # The names are read as the generation goes (see 'skaff_drive'), so
+        # the batch may be of any size; stdin is not available for prompting
+        names = names_read(sys.stdin.buffer, b"\0" if args.null else b"\n")
+        first = next(names, None)
+        if first is None:
+            parser.error("no project-directory name read from stdin")
+        args.directories = [first]
+        args.quiet = True
+        directories = itertools.chain((first,), names)
+    elif args.null:
+        parser.error("--null requires --from-stdin")
+    elif not args.directories:
+        parser.error("the following arguments are required: directories")
+    else:
+        directories = None
+
     # Processing all the "non-private" attributes of args and store them into
-    # the 'skaff_cli_dict' dictionary to be passed as arguments
+    # the 'skaff_cli_dict' dictionary to be passed as arguments; options that
+    # are not given are left for the configuration layers to decide
     for attr in filter(lambda attr: not attr.startswith('_'), dir(args)):
-        skaff_cli_dict[attr] = getattr(args, attr)
+        if getattr(args, attr) is not None:
+            skaff_cli_dict[attr] = getattr(args, attr)
 
+    # Interactive editing is the default of the command-line tool unless
+    # any of the configuration layers (refer to 'skaff.conf(5)') says otherwise
+    if "quiet" not in skaff_cli_dict and "quiet" not in conf_load():
+        skaff_cli_dict["quiet"] = False
+
+    hook_workers = skaff_cli_dict.pop("hook_jobs", None)
+    hook_timeout = skaff_cli_dict.pop("hook_timeout", None)
+    git_init = skaff_cli_dict.pop("git", False)
+    batch_edit = skaff_cli_dict.pop("batch_edit", False)
+    durability = skaff_cli_dict.pop("durability", "none")
+    stage_directory = skaff_cli_dict.pop("stage_dir", None)
+    journal = skaff_cli_dict.pop("journal", None)
+    resume = skaff_cli_dict.pop("resume", False)
+    scheduler = IOScheduler(skaff_cli_dict.pop("io_jobs", None))
+    stats = skaff_cli_dict.pop("stats", False)
+    skaff_cli_dict.pop("from_stdin", None)
+    skaff_cli_dict.pop("null", None)
     config = SkaffConfig(**skaff_cli_dict)
-    skaff_drive(config)
+    hook_failed = False
+
+    def _hook_report(result):
+        # Failures are reported as they happen, so no result is kept however
+        # long the batch is
+        nonlocal hook_failed
+        if 0 == result.returncode:
+            return
+        hook_failed = True
+        reason = ("timed out" if result.timed_out
+                  else "exited with {0}".format(result.returncode))
+        print("skaff: {0} hook '{1}' {2} ({3})".format(
+            result.phase, " ".join(result.command), reason,
+            result.directory or os.getcwd()), file=sys.stderr)
+        sys.stderr.write(result.output)
+
+    with scheduler:
+        skaff_drive(config,
+                    hook_workers=hook_workers,
+                    hook_timeout=hook_timeout,
+                    git_init=git_init,
+                    batch_edit=batch_edit,
+                    durability=durability,
+                    stage_directory=stage_directory,
+                    journal=journal,
+                    resume=resume,
+                    scheduler=scheduler,
+                    directories=directories,
+                    hook_callback=_hook_report)
+
+    if stats:
+        metrics = scheduler.metrics_get()
+        print(("skaff: {0} file operations in {1:.3f} s ({2:.1f} per second, "
+               "{3:.3f} ms each); concurrency {4} (peak {5})").format(
+                   metrics.operations, metrics.seconds, metrics.throughput,
+                   metrics.latency * 1e3, metrics.concurrency, metrics.peak),
+              file=sys.stderr)
+
+    if hook_failed:
+        sys.exit(1)
 # -------------------------------- FUNCTIONS ----------------------------------
 
 
@@ -7,31 +7,48 @@ A suite of command line based tools.
 # ------------------------------- MODULE INFO ---------------------------------
 __all__ = [
     "key_get",
+    "names_read",
+    "timed_key_async_get",
     "timed_key_get",
     "timeout",
     "ANSIColor",
+    "RawSession",
     "SmartFormatter",
 ]
 # ------------------------------- MODULE INFO ---------------------------------
 
 # --------------------------------- MODULES -----------------------------------
 import argparse
+import asyncio
+import codecs
 import os
 import signal
 import sys
+import time
 
 if "posix" == os.name:
     import fcntl
+    import selectors
     import termios
 elif "nt" == os.name:
     import msvcrt
-    import time
 
 from functools import wraps
-from typing import Callable
+from typing import (
+    BinaryIO,
+    Callable,
+    Iterator,
+    Optional
+)
 # --------------------------------- MODULES -----------------------------------
 
 
+# ------------------------------- CONSTANTS -----------------------------------
+# Number of bytes read at a time by 'names_read'
+_NAMES_CHUNK = 64 * 1024
+# ------------------------------- CONSTANTS -----------------------------------
+
+
 # --------------------------------- CLASSES -----------------------------------
 class ANSIColor:
     RED = "\x1b[31m"
@@ -46,6 +63,135 @@ class ANSIColor:
     RESET = "\x1b[0m"
 
 
+class RawSession:
+    """
+    Context manager that puts the terminal of 'fd' (defaults to stdin) into
+    raw mode once for all the keys read within it, instead of once per key.
+
+    Sessions can be nested (or the same session entered again); the terminal
+    is only restored when the outermost one exits. If 'fd' is not a terminal
+    (e.g. a pipe) the keys are read as is.
+
+    Waiting is done through 'selectors' with a monotonic deadline, so keys
+    can be read with sub-second timeouts from any thread, and the session can
+    be shared with an 'asyncio' event loop (see 'timed_key_async_get').
+    """
+    __slots__ = ("__attrs_save", "__decoder", "__depth", "__fd",
+                 "__flags_save")
+
+    def __init__(self, fd: Optional[int]=None):
+        self.__fd = sys.stdin.fileno() if fd is None else fd
+        self.__attrs_save = None
+        self.__decoder = codecs.getincrementaldecoder(
+            sys.stdin.encoding or "utf-8")(errors="replace")
+        self.__depth = 0
+        self.__flags_save = None
+
+    def __enter__(self):
+        self.__depth += 1
+        if 1 == self.__depth and "posix" == os.name:
+            self.__raw_enter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__depth -= 1
+        if 0 == self.__depth and "posix" == os.name:
+            self.__raw_exit()
+        return False
+
+    def fileno(self) -> int:
+        """
+        Returns the file descriptor keys are read from.
+        """
+        return self.__fd
+
+    def key_get(self, seconds: Optional[float]=None) -> str:
+        """
+        Waits at most 'seconds' (fractions are allowed; 'None' means no limit)
+        for a single key press and returns the character of it; returns an
+        empty string at the end of the input.
+
+        Raises 'TimeoutError' upon expiration.
+        """
+        deadline = None if seconds is None else time.monotonic() + seconds
+
+        if "nt" == os.name:
+            while not msvcrt.kbhit():
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError()
+                time.sleep(0.01)
+            return msvcrt.getch().decode()
+
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.__fd, selectors.EVENT_READ)
+            while True:
+                remaining = None
+                if deadline is not None:
+                    remaining = max(deadline - time.monotonic(), 0)
+                if not selector.select(remaining):
+                    raise TimeoutError()
+                key = self.key_read()
+                if key is not None:
+                    return key
+
+    def key_read(self) -> Optional[str]:
+        """
+        Reads (without waiting) the next byte that is ready and returns the
+        character it completes, an empty string at the end of the input, or
+        None if the character is still incomplete (multibyte encodings).
+        """
+        data = os.read(self.__fd, 1)
+
+        if not data:
+            self.__decoder.reset()
+            return str()
+
+        return self.__decoder.decode(data) or None
+
+    def __raw_enter(self):
+        """
+        Saves the state of the terminal and makes it raw - the way to do this
+        comes from the termios(3) man page.
+        """
+        try:
+            attrs_save = termios.tcgetattr(self.__fd)
+        except termios.error:
+            # Not a terminal; nothing to be saved or restored
+            return
+
+        self.__attrs_save = attrs_save
+        self.__flags_save = fcntl.fcntl(self.__fd, fcntl.F_GETFL)
+        attrs = list(attrs_save)  # copy the stored version to update
+        # iflag
+        attrs[0] &= ~(termios.IGNBRK | termios.BRKINT | termios.PARMRK
+                      | termios.ISTRIP | termios.INLCR | termios. IGNCR
+                      | termios.ICRNL | termios.IXON)
+        # oflag
+        attrs[1] &= ~termios.OPOST
+        # cflag
+        attrs[2] &= ~(termios.CSIZE | termios. PARENB)
+        attrs[2] |= termios.CS8
+        # lflag
+        attrs[3] &= ~(termios.ECHONL | termios.ECHO | termios.ICANON
+                      | termios.ISIG | termios.IEXTEN)
+        termios.tcsetattr(self.__fd, termios.TCSANOW, attrs)
+        # turn off non-blocking
+        fcntl.fcntl(self.__fd, fcntl.F_SETFL,
+                    self.__flags_save & ~os.O_NONBLOCK)
+
+    def __raw_exit(self):
+        """
+        Restores the state of the terminal saved by '__raw_enter'.
+        """
+        if self.__attrs_save is None:
+            return
+
+        termios.tcsetattr(self.__fd, termios.TCSAFLUSH, self.__attrs_save)
+        fcntl.fcntl(self.__fd, fcntl.F_SETFL, self.__flags_save)
+        self.__attrs_save = None
+        self.__flags_save = None
+
+
 class SmartFormatter(argparse.HelpFormatter):
     """
     You can only specify one formatter in standard argparse, so you cannot
@@ -110,28 +256,87 @@ class SmartFormatter(argparse.HelpFormatter):
 
 
 # -------------------------------- FUNCTIONS ----------------------------------
-def timed_key_get(seconds: int) -> str:
+async def timed_key_async_get(seconds: Optional[float]=None,
+                              session: Optional[RawSession]=None,
+                              loop: Optional[asyncio.AbstractEventLoop]=None
+                              ) -> str:
+    """
+    Coroutine variant of 'timed_key_get': waits for a single key press through
+    the reader callbacks of the event 'loop' (defaults to the running one), so
+    the loop keeps running other tasks in the meantime.
+
+    Keys are read within 'session' (defaults to a new 'RawSession' of stdin).
+    Raises 'TimeoutError' if no key is pressed within 'seconds'.
+
+    NOTE: The Windows console cannot be watched by an event loop; there the
+    blocking 'RawSession.key_get' is run in the default executor instead.
+    """
+    if loop is None:
+        loop = asyncio.get_running_loop()
+
+    if session is None:
+        session = RawSession()
+
+    with session:
+        if "nt" == os.name:
+            return await loop.run_in_executor(None, session.key_get, seconds)
+
+        future = loop.create_future()
+
+        def _key_ready():
+            key = session.key_read()
+            if key is not None and not future.done():
+                future.set_result(key)
+
+        loop.add_reader(session.fileno(), _key_ready)
+        try:
+            return await asyncio.wait_for(future, seconds)
+        except asyncio.TimeoutError:
+            raise TimeoutError()
+        finally:
+            loop.remove_reader(session.fileno())
+
+
+def names_read(stream: BinaryIO, delimiter: bytes=b"\n") -> Iterator[str]:
+    """
+    Returns an iterator of the names in the binary 'stream' separated by
+    'delimiter' (such as b"\0" for the output of 'find -print0'), decoded
+    the way the operating system decodes file names; empty names are skipped.
+
+    The 'stream' is read in fixed-size chunks as the iterator advances, so
+    only the name being read (not the whole input) is held in memory.
+    """
+    if not isinstance(delimiter, bytes) or 1 != len(delimiter):
+        raise ValueError("'delimiter' argument must be a single byte")
+
+    # Tolerates lines ending with "\r\n" (written on Windows)
+    strip = b"\r" if b"\n" == delimiter else b""
+    rest = bytes()
+
+    for chunk in iter(lambda: stream.read(_NAMES_CHUNK), b""):
+        names = (rest + chunk).split(delimiter)
+        rest = names.pop()
+        for name in names:
+            name = name.rstrip(strip)
+            if name:
+                yield os.fsdecode(name)
+
+    rest = rest.rstrip(strip)
+    if rest:
+        yield os.fsdecode(rest)
+
+
+def timed_key_get(seconds: float) -> str:
     """
     Gets a single key press from the terminal within the given number of
-    'seconds' and returns a 'str' representing the key pressed; returns empty
-    "" string upon time out.
+    'seconds' (fractions are allowed) and returns a 'str' representing the key
+    pressed; raises 'TimeoutError' upon time out.
 
-    Based on the version from StackOverflow by Paul:
-    http://stackoverflow.com/questions/3471461/raw-input-and-timeout/3911560
+    Unlike the 'timeout' decorator this does not rely on 'SIGALRM', so it can
+    be called from any thread.
     """
-    if "posix" == os.name:
-        return timeout(seconds)(key_get)()
-    elif "nt" == os.name:
-        start_time = time.time()
-        key = str()
-
-        while True:
-            if msvcrt.kbhit():
-                key = key_get()
-                break
-            if len(key) == 0 and (time.time() - start_time) > seconds:
-                raise TimeoutError()
-        return key
+    with RawSession() as session:
+        return session.key_get(seconds)
 
 
 def timeout(seconds: int) -> Callable:
@@ -139,6 +344,9 @@ def timeout(seconds: int) -> Callable:
     Sets a timer on a function; should be used as a decorator.
     Raises 'TimeOutError' upon expiration.
 
+    NOTE: This relies on 'SIGALRM', which only works in the main thread and
+    with one-second granularity; 'RawSession.key_get' has neither limit.
+
     Reference (StackOverflow):
     /questions/2281850/timeout-function-if-it-takes-too-long-to-finish
     """
@@ -168,55 +376,15 @@ def key_get() -> str:
     """
     Waits for a single keypress on stdin.
 
-    This is a silly function to call if you need to do it a lot because it has
-    to store stdin's current setup, setup stdin for reading single keystrokes
-    then read the single keystroke then revert stdin back after reading the
-    keystroke.
-
     Returns the character of the key that was pressed (zero on
     KeyboardInterrupt which can happen when a signal gets handled)
 
-    Reference (StackOverflow):
-    /questions/983354/how-do-i-make-python-to-wait-for-a-pressed-key
+    Use a 'RawSession' to read several keys without saving and restoring the
+    state of the terminal for each of them.
     """
-    if "posix" == os.name:
-        fd = sys.stdin.fileno()
-        # save old state
-        flags_save = fcntl.fcntl(fd, fcntl.F_GETFL)
-        attrs_save = termios.tcgetattr(fd)
-        # make raw - the way to do this comes from the termios(3) man page.
-        attrs = list(attrs_save)  # copy the stored version to update
-        # iflag
-        attrs[0] &= ~(termios.IGNBRK | termios.BRKINT | termios.PARMRK
-                      | termios.ISTRIP | termios.INLCR | termios. IGNCR
-                      | termios.ICRNL | termios.IXON)
-        # oflag
-        attrs[1] &= ~termios.OPOST
-        # cflag
-        attrs[2] &= ~(termios.CSIZE | termios. PARENB)
-        attrs[2] |= termios.CS8
-        # lflag
-        attrs[3] &= ~(termios.ECHONL | termios.ECHO | termios.ICANON
-                      | termios.ISIG | termios.IEXTEN)
-        termios.tcsetattr(fd, termios.TCSANOW, attrs)
-        # turn off non-blocking
-        fcntl.fcntl(fd, fcntl.F_SETFL, flags_save & ~os.O_NONBLOCK)
-        # read a single keystroke
-        try:
-            ret = sys.stdin.read(1)  # returns a single character
-        except KeyboardInterrupt:
-            ret = str()
-        finally:
-            # restore old state
-            termios.tcsetattr(fd, termios.TCSAFLUSH, attrs_save)
-            fcntl.fcntl(fd, fcntl.F_SETFL, flags_save)
-        return ret
-    elif "nt" == os.name:
-        try:
-            # 'getch' by default returns a 'bytes' object;
-            # so an extra conversion is required
-            ret = msvcrt.getch().decode()
-        except KeyboardInterrupt:
-            ret = str()
-        return ret
+    try:
+        with RawSession() as session:
+            return session.key_get()
+    except KeyboardInterrupt:
+        return str()
 # -------------------------------- FUNCTIONS ----------------------------------
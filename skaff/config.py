@@ -10,16 +10,31 @@ __all__ = ["SkaffConfig"]
 
 # --------------------------------- MODULES -----------------------------------
 import collections
-import copy
-import glob
+import collections.abc
 import os
 if "posix" == os.name:
     import pwd
 elif "nt" == os.name:
     import getpass
 import shutil
+import types
 
 from datetime import datetime
+from skaff.conftools import (
+    conf_layers_get,
+    conf_load,
+    conf_write
+)
+from skaff.hooktools import (
+    HOOK_PHASES,
+    Hook,
+    hook_create,
+    hook_format
+)
+from skaff.registry import (
+    license_registry_get,
+    template_registry_get
+)
 # --------------------------------- MODULES -----------------------------------
 
 
@@ -36,15 +51,6 @@ class SkaffConfig:
     # Similarly, 'authors', 'language', 'license', and 'quiet' are associated
     # with a list of 'directories'.
     #
-    # NOTE: 'languages', 'licenses', and 'templates' attributes may be dropped
-    # without actually affecting the behavior of this class since mutators for
-    # all three ('language_set', 'license_set', 'templates_set') automatically
-    # call 'languages_probe', 'licenses_probe', and 'templates_probe'
-    # respectively to enforce the dependency.
-    # However, for verbosity and most importantly completeness they are listed
-    # here as well: the only drawback I can think of is THREE MORE REDUNDANT
-    # calls at object construction time.
-    #
     #
     # A dependency graph for the first relation stated above is:
     #
@@ -73,12 +79,49 @@ class SkaffConfig:
     #                      |authors|language|license|quiet|
     #                      +-------+--------+-------+-----+
     #
-    __ATTRIBUTES = ("paths",
-                    "languages", "licenses", "subdirectories",
-                    "directories",
-                    "authors", "language", "license", "quiet")
+    #
+    # Both graphs are evaluated lazily: the constructor only records the
+    # arguments given, and each attribute is computed on its first use.
+    # Derived values ('languages', 'licenses', the template index, and the
+    # configuration layers) are cached in their own slots, where 'None' means
+    # "not computed yet"; a mutator only resets the slots derived from the
+    # attribute it changes, so for example 'paths_set' drops the cached
+    # license and template listings but keeps the chosen 'license'.
+    #
+    # The attributes in the second graph (along with 'subdirectories' and
+    # 'templates') that are still waiting for their first use are kept in the
+    # '__pending' dictionary together with the argument to be passed to their
+    # mutator; '__LAYERED' stands for "look it up from the configuration
+    # layers, then fall back to the default value".
+    #
+    # Instances created by 'derive' share every slot with their parent; the
+    # containers that are modified in place ('authors', 'directories',
+    # 'subdirectories', and 'templates') are listed in the '__shared' set of
+    # both of them and only copied by the first mutator that changes them
+    # (copy-on-write), so a derived instance only pays for its differences.
+    #
+    # Every attribute is stored in its own slot instead of a per-instance
+    # dictionary; the sorted tuple views returned by 'authors_get',
+    # 'directories_get', and 'subdirectories_get' are cached in the
+    # corresponding '*_view' slots and only reset by their own mutators.
+    __slots__ = ("__authors", "__authors_view",
+                 "__directories", "__directories_view", "__hooks",
+                 "__language", "__languages", "__layers",
+                 "__license", "__licenses", "__license_entries",
+                 "__paths", "__paths_view", "__pending", "__quiet", "__shared",
+                 "__subdirectories", "__subdirectories_view",
+                 "__template_entries", "__templates", "__templates_view")
+    # Attributes evaluated on their first use, and the ones among them whose
+    # arguments are validated right away since that does not need any I/O
+    __DEFERRED = ("authors", "hooks", "language", "license", "quiet",
+                  "subdirectories", "templates")
+    __EAGER = frozenset(("authors", "hooks", "language", "quiet",
+                         "subdirectories"))
+    __LAYERED = object()
+    # Containers shared with the parent/derived instances until modified
+    __SHAREABLE = frozenset(("authors", "directories", "hooks",
+                             "subdirectories", "templates"))
     __LANGUAGES = frozenset(("c", "cpp"))
-    __LICENSE_FORMATS = frozenset((".txt", ".md"))
     __LICENSES = frozenset(("bsd2", "bsd3", "gpl2", "gpl3", "mit"))
 
     def __init__(self, directories, **kwargs):
@@ -98,6 +141,9 @@ class SkaffConfig:
 
         'directories': set of name(s) for the output project-directory(ies)
 
+        'hooks': mapping from phase(s) to the command(s) run in that phase;
+                 see 'hooks_set'
+
         'language': major programming language used;
                     must be chosen from the 'languages_list' listing
 
@@ -110,53 +156,74 @@ class SkaffConfig:
 
         'subdirectories': set of name(s) for the subdirectory(ies)
         within the project(s)' base directory(ies)
-        """
-        __METHODS = (self.paths_set,
-                     self.languages_probe,
-                     self.licenses_probe,
-                     self.subdirectories_set,
-                     # End of 1st dependency and begin of 2nd dependency
-                     self.directories_set,
-                     self.authors_set,
-                     self.language_set,
-                     self.license_set,
-                     self.quiet_set)
 
+        'templates': set of template(s) (paths relative to the template path)
+        enabled for the project(s)
+
+        Any argument (except for 'directories') that is not given is looked up
+        from the configuration layers (see '_load'), and then falls back to
+        the default value of the corresponding mutator member function.
+
+        The construction itself does not touch the file system; the layers,
+        the default author, and the license and template listings are only
+        read when first needed, so invalid 'license' and 'templates' arguments
+        are reported by the first accessor using them.
+        """
         # The value of 'directories' key will be used if it already exists;
         # otherwise fill in the value from the positional argument
         kwargs.setdefault("directories", directories)
 
-        # Mapping between valid attributes(arguments) and corresponding methods
-        relation = zip(SkaffConfig.__ATTRIBUTES, __METHODS)
-        __ARGUMENTS = collections.OrderedDict(relation)
-
-        # The actual internal per-instance mapping between
-        # attributes(arguments) and corresponding values
-        self.__config = dict.fromkeys(SkaffConfig.__ATTRIBUTES)
-
-        for key in __ARGUMENTS:
-            # Call corresponding mutator function with value specified in the
-            # 'kwargs' dictionary if key is present
-            if key in kwargs:
-                __ARGUMENTS[key](kwargs[key])
-            # Otherwise let the mutator function use default value
-            # NOTE: 'directories_set' would raise exception with default
-            # 'None' actual parameter
+        # Nothing below reads the file system: every derived value is left as
+        # 'None' and computed by the first accessor that needs it
+        self.__layers = None
+        self.__languages = None
+        self.__licenses = None
+        self.__license_entries = None
+        self.__template_entries = None
+        self.__pending = dict()
+        self.__shared = set()
+        self.__authors = None
+        self.__hooks = None
+        self.__language = None
+        self.__license = None
+        self.__quiet = None
+        self.__subdirectories = None
+        self.__templates = None
+        self.__authors_view = None
+        self.__directories_view = None
+        self.__subdirectories_view = None
+        self.__templates_view = None
+
+        # The 'user' configuration layer is located through the 'config'
+        # path; 'paths' found in the layers only fill in the keys not given
+        paths = kwargs.get("paths", dict())
+        self.__paths = None
+        self.paths_set(**paths)
+        if not {"license", "template"} <= paths.keys():
+            self.__pending["paths"] = paths
+
+        self.directories_set(kwargs["directories"])
+
+        for key in SkaffConfig.__DEFERRED:
+            if key in kwargs and key in SkaffConfig.__EAGER:
+                getattr(self, key + "_set")(kwargs[key])
             else:
-                __ARGUMENTS[key]()
+                self.__pending[key] = kwargs.get(key, SkaffConfig.__LAYERED)
 
     def authors_set(self, authors=None):
         """
         Sets the author(s) of the project(s).
         'authors' must be an iterable type containing 'str'(s).
-        This member function is called by the constructor by default.
+        This member function is called by default on the first use.
 
         Sets the single author to be the GECOS or name field of current
         logged-in user if 'authors' is left as default or 'None'.
         """
         if None == authors:
-            self.__config["authors"] = set()
-            self.author_add(SkaffConfig.author_fetch())
+            self.__authors = {SkaffConfig.author_fetch()}
+            self.__shared.discard("authors")
+            self.__authors_view = None
+            self.__pending.pop("authors", None)
             return
 
         if not isinstance(authors, collections.Iterable):
@@ -166,13 +233,43 @@ class SkaffConfig:
             raise TypeError(("'authors' argument must be an iterable "
                              "containing 'str' type"))
 
+        authors = SkaffConfig.__names_validate(authors, "authors")
+
         if 0 == len(authors):
             raise ValueError("'authors' argument must not be empty")
 
-        self.__config["authors"] = set()
+        self.__authors = set(authors)
+        self.__shared.discard("authors")
+        self.__authors_view = None
+        self.__pending.pop("authors", None)
+
+    def authors_update(self, authors):
+        """
+        Adds every author in 'authors' to the internal 'database' in a single
+        pass; names that already exist are ignored.
+
+        All the entries are validated before any of them is added; if any of
+        them is invalid, a 'TypeError' (non-'str' entries present) or
+        'ValueError' listing every offending entry is raised and the internal
+        'database' is left untouched.
+        """
+        if not isinstance(authors, collections.abc.Iterable):
+            raise TypeError("'authors' argument must be iterable")
 
-        for author in authors:
-            self.author_add(author)
+        if isinstance(authors, str):
+            raise TypeError(("'authors' argument must be an iterable "
+                             "containing 'str' type"))
+
+        authors = SkaffConfig.__names_validate(authors, "authors")
+
+        if "authors" in self.__pending:
+            self.__evaluate("authors")
+
+        if authors:
+            if "authors" in self.__shared:
+                self.__unshare("authors")
+            self.__authors.update(authors)
+            self.__authors_view = None
 
     def author_add(self, author):
         """
@@ -188,7 +285,13 @@ class SkaffConfig:
         if not author.isprintable():
             raise ValueError("'author' argument must be a valid name")
 
-        self.__config["authors"].add(author)
+        if "authors" in self.__pending:
+            self.__evaluate("authors")
+
+        if "authors" in self.__shared:
+            self.__unshare("authors")
+        self.__authors.add(author)
+        self.__authors_view = None
 
     def author_discard(self, author):
         """
@@ -204,20 +307,30 @@ class SkaffConfig:
         if not author.isprintable():
             raise ValueError("'author' argument must be a valid name")
 
-        self.__config["authors"].discard(author)
+        if "authors" in self.__pending:
+            self.__evaluate("authors")
+
+        if "authors" in self.__shared:
+            self.__unshare("authors")
+        self.__authors.discard(author)
+        self.__authors_view = None
 
     def authors_get(self):
         """
-        Gets a generator containing author(s) for the project(s).
+        Gets a sorted tuple containing author(s) for the project(s).
         """
-        authors = sorted(self.__config["authors"])
-        yield from (author for author in authors)
+        if self.__authors_view is None:
+            if "authors" in self.__pending:
+                self.__evaluate("authors")
+            self.__authors_view = tuple(sorted(self.__authors))
+        return self.__authors_view
 
     @staticmethod
     def author_fetch():
         """
         Gets the current logged-in username from GECOS or name field.
-        This member function is called by the constructor by default.
+        This member function is called by default on the first use of
+        'authors_get'.
 
         Raises RuntimeError if both attempts fail.
 
@@ -290,6 +403,57 @@ class SkaffConfig:
         for arg in args:
             actions[arg]()
 
+    def derive(self, **kwargs):
+        """
+        Returns a new 'SkaffConfig' instance identical to this one except for
+        the attributes given in 'kwargs', which accepts the same keyword
+        arguments as the constructor (for example
+        config.derive(license="mit", directories=["project"])).
+
+        The derived instance shares all the probed and evaluated state with
+        this one and only stores the differences: containers are copied by
+        whichever of the two instances modifies them first, so deriving many
+        variants costs time and memory proportional to the differences only.
+        Neither instance is affected by later changes made to the other.
+        """
+        unknown = kwargs.keys() - SkaffConfig.__DEFERRED -\
+            {"directories", "paths"}
+
+        if unknown:
+            raise TypeError(("'derive' got unexpected keyword argument(s): " +
+                             ", ".join(sorted(unknown))))
+
+        derived = type(self).__new__(type(self))
+
+        for name in SkaffConfig.__slots__:
+            name = "_SkaffConfig" + name
+            setattr(derived, name, getattr(self, name))
+
+        self.__shared |= SkaffConfig.__SHAREABLE
+        derived.__shared = set(SkaffConfig.__SHAREABLE)
+        derived.__pending = dict(self.__pending)
+
+        if "paths" in kwargs:
+            paths = dict(self.__pending.get("paths", self.__paths))
+            paths.update(kwargs["paths"])
+            derived.paths_set(**paths)
+            if "paths" in self.__pending and\
+                    not {"license", "template"} <= paths.keys():
+                derived.__pending["paths"] = paths
+
+        if "directories" in kwargs:
+            derived.directories_set(kwargs["directories"])
+
+        for key in SkaffConfig.__DEFERRED:
+            if key not in kwargs:
+                continue
+            if key in SkaffConfig.__EAGER:
+                getattr(derived, key + "_set")(kwargs[key])
+            else:
+                derived.__pending[key] = kwargs[key]
+
+        return derived
+
     def directories_set(self, directories=None):
         """
         Sets the name(s) of the outputting project-directory(ies).
@@ -306,19 +470,49 @@ class SkaffConfig:
             raise TypeError(("'directories' argument must be an iterable "
                              "containing 'str' type"))
 
+        directories = SkaffConfig.__names_validate(directories,
+                                                   "directories",
+                                                   separator=True)
+
         if 0 == len(directories):
             raise ValueError("'directories' argument must not be empty")
 
-        self.__config["directories"] = set()
+        self.__directories = dict()
+        self.__shared.discard("directories")
+        self.__directories_view = None
+        self.__directories_insert(directories)
 
-        for directory in directories:
-            self.directory_add(directory)
+    def directories_update(self, directories):
+        """
+        Adds every directory in 'directories' to the internal 'database' in a
+        single pass; names that already exist are ignored.
+        Platform-dependent path separator will be appended if missing.
+
+        All the entries are validated before any of them is added; if any of
+        them is invalid, a 'TypeError' (non-'str' entries present) or
+        'ValueError' listing every offending entry is raised and the internal
+        'database' is left untouched.
+        """
+        if not isinstance(directories, collections.abc.Iterable):
+            raise TypeError("'directories' argument must be iterable")
+
+        if isinstance(directories, str):
+            raise TypeError(("'directories' argument must be an iterable "
+                             "containing 'str' type"))
+
+        directories = SkaffConfig.__names_validate(directories,
+                                                   "directories",
+                                                   separator=True)
+        self.__directories_insert(directories)
 
     def directory_add(self, directory):
         """
         Adds 'directory' to the internal 'database' if the name does not exist;
         otherwise do nothing.
         Platform-dependent path separator will be appended if missing.
+
+        Names referring to the same normalized path (for example "a/./b" and
+        "a/b/") are treated as duplicates; the first one added is kept.
         """
         if not isinstance(directory, str):
             raise TypeError("'directory' argument must be 'str' type")
@@ -332,7 +526,28 @@ class SkaffConfig:
         if not directory.endswith(os.sep):
             directory += os.sep
 
-        self.__config["directories"].add(directory)
+        key = SkaffConfig.__directory_key(directory)
+        if key not in self.__directories:
+            if "directories" in self.__shared:
+                self.__unshare("directories")
+            self.__directories[key] = directory
+            self.__directories_view = None
+
+    def directory_contains(self, directory):
+        """
+        Returns True if 'directory' is in the internal 'database' and False
+        otherwise.
+
+        The lookup is a single hash probe on the normalized path, so it does
+        not depend on the number of directories stored.
+        """
+        if not isinstance(directory, str):
+            raise TypeError("'directory' argument must be 'str' type")
+
+        if 0 == len(directory):
+            return False
+
+        return SkaffConfig.__directory_key(directory) in self.__directories
 
     def directory_discard(self, directory):
         """
@@ -349,43 +564,138 @@ class SkaffConfig:
         if not directory.isprintable():
             raise ValueError("'directory' argument must be a valid file name")
 
-        if not directory.endswith(os.sep):
-            directory += os.sep
-
-        self.__config["directories"].discard(directory)
+        key = SkaffConfig.__directory_key(directory)
+        if key in self.__directories:
+            if "directories" in self.__shared:
+                self.__unshare("directories")
+            del self.__directories[key]
+            self.__directories_view = None
 
     def directories_get(self):
         """
-        Gets a generator containing name(s) for the outputting
+        Gets a sorted tuple containing name(s) for the outputting
         project-directory(ies).
         """
-        directories = sorted(self.__config["directories"])
-        yield from (directory for directory in directories)
+        if self.__directories_view is None:
+            self.__directories_view = tuple(sorted(
+                self.__directories.values()))
+        return self.__directories_view
+
+    def hooks_set(self, hooks=None):
+        """
+        Sets the hooks (external commands) run around the generation of the
+        project(s); no hook is run if left as empty or 'None'.
+        This member function is called by default on the first use.
+
+        'hooks' argument must be a mapping from phase(s) listed in
+        'skaff.hooktools.HOOK_PHASES':
+        'pre_tree', 'post_license', 'post_project', 'post_batch'
+        to iterable(s) of commands, each of which is accepted by
+        'skaff.hooktools.hook_create': a 'str' in shell-like syntax like
+        "git init", a sequence like ("cmake", "-S", ".", "-B", "build"), or a
+        'Hook' with its own timeout.
+        The commands of a phase are run in the order given.
+        """
+        result = {phase: tuple() for phase in HOOK_PHASES}
+
+        if None == hooks:
+            hooks = dict()
 
-    def hooks_set(self, **kwargs):
-        pass
+        if not isinstance(hooks, collections.abc.Mapping):
+            raise TypeError("'hooks' argument must be a mapping")
 
-    def hook_add(self, **kwargs):
-        pass
+        for phase, commands in hooks.items():
+            if phase not in result:
+                raise ValueError(("keys of 'hooks' argument must be one of "
+                                  "the following phases: " +
+                                  ", ".join(HOOK_PHASES)))
+            if isinstance(commands, (str, Hook)) or\
+                    not isinstance(commands, collections.abc.Iterable):
+                raise TypeError(("values of 'hooks' argument must be "
+                                 "iterables of commands"))
+            result[phase] = tuple(hook_create(command)
+                                  for command in commands)
 
-    def hook_discard(self, **kwargs):
-        pass
+        self.__hooks = result
+        self.__shared.discard("hooks")
+        self.__pending.pop("hooks", None)
+
+    def hook_add(self, phase, command, timeout=None):
+        """
+        Appends 'command' (see 'hooks_set') to the hooks run in 'phase';
+        'timeout' (in seconds) overrides the default timeout of the driver.
+        """
+        if phase not in HOOK_PHASES:
+            raise ValueError(("'phase' argument must be one of the following: "
+                              + ", ".join(HOOK_PHASES)))
+
+        hook = hook_create(command, timeout)
+
+        if "hooks" in self.__pending:
+            self.__evaluate("hooks")
+
+        if "hooks" in self.__shared:
+            self.__unshare("hooks")
+        self.__hooks[phase] += (hook,)
+
+    def hook_discard(self, phase, command):
+        """
+        Discards every hook running 'command' (see 'hooks_set') in 'phase' if
+        any; otherwise do nothing.
+        """
+        if phase not in HOOK_PHASES:
+            raise ValueError(("'phase' argument must be one of the following: "
+                              + ", ".join(HOOK_PHASES)))
 
-    def hooks_get(self, **kwargs):
-        pass
+        command = hook_create(command).command
+
+        if "hooks" in self.__pending:
+            self.__evaluate("hooks")
+
+        if "hooks" in self.__shared:
+            self.__unshare("hooks")
+        self.__hooks[phase] = tuple(hook for hook in self.__hooks[phase]
+                                    if hook.command != command)
+
+    def hooks_get(self, *args):
+        """
+        Gets the hooks of the phases given in 'args' (see 'hooks_set').
+
+        If called without any actual argument, returns a read-only mapping
+        from every phase to a tuple of 'Hook'(s).
+
+        If called with a single argument, returns the tuple of 'Hook'(s) of
+        that phase; if called with multiple arguments, a list with
+        corresponding results will be returned.
+        """
+        if "hooks" in self.__pending:
+            self.__evaluate("hooks")
+
+        if not all(arg in HOOK_PHASES for arg in args):
+            raise ValueError(("'args' must be selected from: " +
+                              ", ".join(HOOK_PHASES)))
+
+        if 0 == len(args):
+            return types.MappingProxyType(self.__hooks)
+
+        if 1 == len(args):
+            return self.__hooks[args[0]]
+
+        return [self.__hooks[arg] for arg in args]
 
     def language_set(self, language=None):
         """
         Sets the major programming language used.
         Defaults to 'c' language if left as empty or 'None'.
-        This member function is called by the constructor by default.
+        This member function is called by default on the first use.
 
         'language' argument must be the ones listed in 'languages_list'.
         """
         languages = self.languages_list()
 
         if None == language:
-            self.__config["language"] = "c"
+            self.__language = "c"
+            self.__pending.pop("language", None)
             return
 
         if language not in languages:
@@ -393,13 +703,16 @@ class SkaffConfig:
                               " "
                               ", ".join(languages)))
 
-        self.__config["language"] = language
+        self.__language = language
+        self.__pending.pop("language", None)
 
     def language_get(self):
         """
         Gets the major programming language used.
         """
-        return self.__config["language"]
+        if "language" in self.__pending:
+            self.__evaluate("language")
+        return self.__language
 
     @staticmethod
     def languages_fetch():
@@ -411,43 +724,48 @@ class SkaffConfig:
 
     def languages_list(self):
         """
-        Gets a generator containing the supported programming languages.
+        Gets a sorted tuple containing the supported programming languages.
 
         By default they are the following:
         {"c", "cpp"}.
         """
-        languages = sorted(SkaffConfig.__LANGUAGES)
-        yield from (language for language in languages)
+        if self.__languages is None:
+            self.languages_probe()
+        return self.__languages
 
     def languages_probe(self):
         """
-        This member function is called by the constructor by default.
+        This member function is called by 'languages_list' on its first use.
         """
-        pass
+        self.__languages = tuple(sorted(SkaffConfig.__LANGUAGES))
 
     def license_set(self, license=None):
         """
         Sets the type of license used.
         Defaults to 'bsd2' license if left as empty or 'None'.
-        This member function is called by the constructor by default.
+        This member function is called by default on the first use.
 
         'license' argument must be the ones listed in 'licenses_list'.
         """
-        # Ensure all the stock licenses do indeed exist
-        self.licenses_validate()
-        # Also probes the user path for possible custom licenses
-        self.licenses_probe()
-        licenses = self.licenses_list()
-
         if None == license:
-            self.__config["license"] = "bsd2"
+            self.__license = "bsd2"
+            self.__pending.pop("license", None)
             return
 
-        if license not in licenses:
+        if self.__licenses is None:
+            self.__licenses_evaluate()
+
+        # Probes the user path again for custom licenses added since the
+        # last probe before giving up
+        if license not in self.__licenses:
+            self.licenses_probe()
+
+        if license not in self.__licenses:
             raise ValueError(("'license' choice must be one of the following: "
-                              ", ".join(licenses)))
+                              ", ".join(self.__licenses)))
 
-        self.__config["license"] = license
+        self.__license = license
+        self.__pending.pop("license", None)
 
     def license_get(self, fullname=False):
         """
@@ -459,28 +777,20 @@ class SkaffConfig:
         are governed by the rules specified in the docstrings of 'paths_set'
         and 'licenses_list'.
         """
-        user_license_path = self.paths_get("license")
-        system_license_path = (SkaffConfig.basepath_fetch() +
-                               "config" + os.sep + "license" + os.sep)
-        license_results = list()
+        if "license" in self.__pending:
+            self.__evaluate("license")
 
         if not fullname:
-            return self.__config["license"]
-
-        for extension in SkaffConfig.__LICENSE_FORMATS:
-            user_license_file_name = (user_license_path +
-                                      self.__config["license"] + extension)
-            sys_license_file_name = (system_license_path +
-                                     self.__config["license"] + extension)
-            if os.path.isfile(user_license_file_name):
-                license_results.append(user_license_file_name)
-            elif os.path.isfile(sys_license_file_name):
-                license_results.append(sys_license_file_name)
-            else:
-                raise FileNotFoundError(("License file '{}' not found".format(
-                    self.__config["license"])))
+            return self.__license
+
+        if self.__license_entries is None:
+            self.__licenses_evaluate()
 
-        return license_results
+        if self.__license not in self.__license_entries:
+            raise FileNotFoundError(("License file '{}' not found".format(
+                self.__license)))
+
+        return list(self.__license_entries[self.__license])
 
     def license_sign(self):
         """
@@ -539,7 +849,8 @@ class SkaffConfig:
     def licenses_list(self, fullname=False):
         """
         Gets a generator containing the supported licenses with or without
-        paths and file exntensions, depending on whether 'fullname' is enabled.
+        paths and file exntensions, depending on whether 'fullname' is enabled;
+        the ".txt" file of each license comes before its ".md" file.
         For new licenses added in the license path (refer to docstrings for
         'paths_set' mutator member function for details), remember to call
         'licenses_probe' mutator member function to actually add them to the
@@ -580,26 +891,18 @@ class SkaffConfig:
         By default they are the following:
         {"bsd2", "bsd3", "gpl2", "gpl3", "mit"}.
         """
-        licenses = sorted(self.__config["licenses"])
-        user_license_path = self.paths_get("license")
-        system_license_path = (SkaffConfig.basepath_fetch() +
-                               "config" + os.sep + "license" + os.sep)
+        if self.__licenses is None:
+            self.__licenses_evaluate()
 
         if not fullname:
-            yield from (license for license in licenses)
+            yield from self.__licenses
         else:
-            for license in licenses:
-                for ext in SkaffConfig.__LICENSE_FORMATS:
-                    user_license_file_name = user_license_path + license + ext
-                    sys_license_file_name = system_license_path + license + ext
-                    if os.path.isfile(user_license_file_name):
-                        yield user_license_file_name
-                    elif os.path.isfile(sys_license_file_name):
-                        yield sys_license_file_name
-                    else:
-                        raise FileNotFoundError(("The corresponding files for "
-                                                 "'{}' license is not found"
-                                                 .format(license)))
+            for license in self.__licenses:
+                if license not in self.__license_entries:
+                    raise FileNotFoundError(("The corresponding files for "
+                                             "'{}' license is not found"
+                                             .format(license)))
+                yield from self.__license_entries[license]
 
     def licenses_probe(self):
         """
@@ -609,37 +912,21 @@ class SkaffConfig:
 
         NOTE: normally this member function does not need to be called manually
         (if some new license files get copied to the 'license' path, for
-        example) since 'license_set' automatically calls this member function;
-        unless you just want to add those custom licenses to the internal
-        'database' WITHOUT switching the CURRENT license selected.
-        """
-        # Reset the internal licenses database
-        self.__config["licenses"] = set(SkaffConfig.__LICENSES)
-        user_license_path = self.paths_get("license")
-        # Temporary dictionary used for comparison between licenses
-        # named with ".txt" and ".md" extension
-        license_extensions = SkaffConfig.__LICENSE_FORMATS
-        temp_license_dict = {key: set() for key in license_extensions}
-        normalize_funcs = (os.path.basename, os.path.splitext, lambda x: x[0])
-
-        if not os.path.isdir(user_license_path):
-            return
-
-        for file_ext in temp_license_dict.keys():
-            for user_license in glob.iglob(user_license_path + "*" + file_ext):
-                # Remove the file extension and path
-                for func in normalize_funcs:
-                    user_license = func(user_license)
-                temp_license_dict[file_ext].add(os.path.basename(user_license))
-
-        if temp_license_dict[".txt"] != temp_license_dict[".md"]:
-            raise FileNotFoundError(("The number of license files end with "
-                                     "those file extensions must equal; "
-                                     "there must be a file with same name for "
-                                     "each of the following file extension: "
-                                     ", ".join(temp_license_dict.keys())))
-
-        self.__config["licenses"] |= temp_license_dict[".txt"]
+        example) since 'license_set' automatically calls this member function
+        for licenses not found by the last probe; unless you just want to add
+        those custom licenses to the internal 'database' WITHOUT switching the
+        CURRENT license selected.
+
+        The license files are resolved through a registry shared by all the
+        instances with the same 'license' path; it is only re-scanned when
+        the modification time of the 'user' or 'system' license path changes.
+        """
+        registry = self.__license_registry_get()
+        entries = registry.refresh()
+        user_licenses = entries.keys() - registry.system_names_get()
+        # Only the stock licenses and the ones in the 'user' path are listed
+        self.__licenses = tuple(sorted(SkaffConfig.__LICENSES | user_licenses))
+        self.__license_entries = entries
 
     def licenses_validate(self):
         """
@@ -656,20 +943,20 @@ class SkaffConfig:
                               "config" + os.sep)
         system_license_path = system_config_path + "license" + os.sep
         # system_template_path = system_config_path + "template" + os.sep
-        file_extensions = (".txt", ".md")
 
         for system_path in (system_config_path, system_license_path):
             if not os.path.isdir(system_path):
                 raise FileNotFoundError("The system path: '{}' does not exist"
                                         .format(system_path))
 
-        for license in SkaffConfig.__LICENSES:
-            for file_ext in file_extensions:
-                license_file = system_license_path + license + file_ext
-                if not os.path.isfile(license_file):
-                    raise FileNotFoundError(("The stock version of license "
-                                             "file: '{}' does not exist"
-                                             .format(license_file)))
+        registry = self.__license_registry_get()
+        registry.refresh()
+        missing = SkaffConfig.__LICENSES - registry.system_names_get()
+
+        if missing:
+            raise FileNotFoundError(("The stock version of license "
+                                     "file(s) for: '{}' does not exist"
+                                     .format(", ".join(sorted(missing)))))
 
     def paths_set(self, **kwargs):
         """
@@ -688,7 +975,7 @@ class SkaffConfig:
         when you create a project using 'bsd' license; same goes for templates.
         You can add new configuration, template, and licenses in this path and
         it will be discovered by corresponding _*probe member functions, which
-        are called by the constructor by default.
+        are called on the first use of the corresponding attributes.
 
         Supported keyword arguments:
 
@@ -723,9 +1010,19 @@ class SkaffConfig:
         kwargs.setdefault("license", user_license)
         kwargs.setdefault("template", user_template)
 
-        self.__config["paths"] = dict()
+        # Only the values derived from 'paths' are reset; the layers are
+        # only read again if they are located elsewhere
+        if self.__paths is None or self.__paths["config"] != kwargs["config"]:
+            self.__layers = None
+        self.__licenses = None
+        self.__license_entries = None
+        self.__template_entries = None
+        self.__pending.pop("paths", None)
+
+        self.__paths = dict()
         for key in keys:
-            self.__config["paths"][key] = kwargs[key]
+            self.__paths[key] = kwargs[key]
+        self.__paths_view = types.MappingProxyType(self.__paths)
 
     def paths_get(self, *args):
         """
@@ -735,8 +1032,9 @@ class SkaffConfig:
         'license':
         'template':
 
-        If called without any actual argument, returns a deep copy of the
-        internal dictionary containing all the stored key-value pairs.
+        If called without any actual argument, returns a read-only mapping
+        proxy of the internal dictionary containing all the stored key-value
+        pairs.
 
         If called with multiple arguments, a list with corresponding results
         will be returned.
@@ -746,14 +1044,19 @@ class SkaffConfig:
         if not all(isinstance(arg, str) for arg in args):
             raise TypeError("'args' must contain 'str' types")
 
+        # The 'config' path never comes from the layers, which are located
+        # through it in the first place
+        if "paths" in self.__pending and ("config",) != args:
+            self.__paths_evaluate()
+
         if 0 == len(args):
-            return copy.deepcopy(self.__config["paths"])
+            return self.__paths_view
 
         if 1 == len(args):
-            return self.__config["paths"][args[0]]
+            return self.__paths[args[0]]
 
         for arg in args:
-            result_paths.append(self.__config["paths"][arg])
+            result_paths.append(self.__paths[arg])
 
         return result_paths
 
@@ -762,24 +1065,28 @@ class SkaffConfig:
         Sets whether there is interactive CMakeLists.txt and Doxyfile editing.
         'True' to turn off the interactive editing.
         Defaults to 'True' if left as empty or 'None'.
-        This member function is called by the constructor by default.
+        This member function is called by default on the first use.
 
         'quiet' argument must be of 'bool' type.
         """
         if None == quiet:
-            self.__config["quiet"] = True
+            self.__quiet = True
+            self.__pending.pop("quiet", None)
             return
 
         if not isinstance(quiet, bool):
             raise TypeError("'quiet' must be of 'bool' type")
 
-        self.__config["quiet"] = quiet
+        self.__quiet = quiet
+        self.__pending.pop("quiet", None)
 
     def quiet_get(self):
         """
         Gets whether there is interactive CMakeLists.txt and Doxyfile editing.
         """
-        return self.__config["quiet"]
+        if "quiet" in self.__pending:
+            self.__evaluate("quiet")
+        return self.__quiet
 
     def subdirectories_set(self, subdirectories=None):
         """
@@ -795,13 +1102,14 @@ class SkaffConfig:
         }
         if left as empty or 'None'.
         Platform-dependent path separator will be appended if missing.
-        This member function is called by the constructor by default.
+        This member function is called by default on the first use.
 
         'subdirectories' argument must be of 'collections.Iterable' type
         containing instance of 'str'(s).
         """
         if None == subdirectories:
-            self.__config["subdirectories"] = {
+            self.__subdirectories_view = None
+            self.__subdirectories = {
                 "build",
                 "cmake",
                 "cmake" + os.sep + "modules",
@@ -817,6 +1125,8 @@ class SkaffConfig:
                 "tests",
                 "tools"
             }
+            self.__shared.discard("subdirectories")
+            self.__pending.pop("subdirectories", None)
             return
 
         if not isinstance(subdirectories, collections.Iterable):
@@ -826,13 +1136,48 @@ class SkaffConfig:
             raise TypeError(("'subdirectories' argument must be an iterable "
                              "containing 'str' type"))
 
+        subdirectories = SkaffConfig.__names_validate(subdirectories,
+                                                      "subdirectories",
+                                                      separator=True)
+
         if 0 == len(subdirectories):
             raise ValueError("'subdirectories' argument must not be empty")
 
-        self.__config["subdirectories"] = set()
+        self.__subdirectories = set(subdirectories)
+        self.__shared.discard("subdirectories")
+        self.__subdirectories_view = None
+        self.__pending.pop("subdirectories", None)
+
+    def subdirectories_update(self, subdirectories):
+        """
+        Adds every subdirectory in 'subdirectories' to the internal 'database'
+        in a single pass; names that already exist are ignored.
+        Platform-dependent path separator will be appended if missing.
+
+        All the entries are validated before any of them is added; if any of
+        them is invalid, a 'TypeError' (non-'str' entries present) or
+        'ValueError' listing every offending entry is raised and the internal
+        'database' is left untouched.
+        """
+        if not isinstance(subdirectories, collections.abc.Iterable):
+            raise TypeError("'subdirectories' argument must be iterable")
+
+        if isinstance(subdirectories, str):
+            raise TypeError(("'subdirectories' argument must be an iterable "
+                             "containing 'str' type"))
+
+        subdirectories = SkaffConfig.__names_validate(subdirectories,
+                                                      "subdirectories",
+                                                      separator=True)
+
+        if "subdirectories" in self.__pending:
+            self.__evaluate("subdirectories")
 
-        for directory in subdirectories:
-            self.subdirectory_add(directory)
+        if subdirectories:
+            if "subdirectories" in self.__shared:
+                self.__unshare("subdirectories")
+            self.__subdirectories.update(subdirectories)
+            self.__subdirectories_view = None
 
     def subdirectory_add(self, subdirectory):
         """
@@ -853,7 +1198,13 @@ class SkaffConfig:
         if not subdirectory.endswith(os.sep):
             subdirectory += os.sep
 
-        self.__config["subdirectories"].add(subdirectory)
+        if "subdirectories" in self.__pending:
+            self.__evaluate("subdirectories")
+
+        if "subdirectories" in self.__shared:
+            self.__unshare("subdirectories")
+        self.__subdirectories.add(subdirectory)
+        self.__subdirectories_view = None
 
     def subdirectory_discard(self, subdirectory):
         """
@@ -874,48 +1225,345 @@ class SkaffConfig:
         if not subdirectory.endswith(os.sep):
             subdirectory += os.sep
 
-        self.__config["subdirectories"].discard(subdirectory)
+        if "subdirectories" in self.__pending:
+            self.__evaluate("subdirectories")
+
+        if "subdirectories" in self.__shared:
+            self.__unshare("subdirectories")
+        self.__subdirectories.discard(subdirectory)
+        self.__subdirectories_view = None
 
     def subdirectories_get(self):
         """
-        Gets a generator containing name(s) of the subdirectory(ies) within the
-        project(s)' base directory(ies).
+        Gets a sorted tuple containing name(s) of the subdirectory(ies) within
+        the project(s)' base directory(ies).
         """
-        subdirectories = sorted(self.__config["subdirectories"])
-        yield from (subdirectory for subdirectory in subdirectories)
+        if self.__subdirectories_view is None:
+            if "subdirectories" in self.__pending:
+                self.__evaluate("subdirectories")
+            self.__subdirectories_view = tuple(sorted(self.__subdirectories))
+        return self.__subdirectories_view
 
     def templates_set(self, templates=None):
         """
+        Sets the template(s) enabled for the project(s); each of them is a path
+        relative to the template path, such as "c" + os.sep + "CMakeLists.txt".
+        Enables all the templates found by 'templates_probe' if left as empty
+        or 'None'.
+        This member function is called by default on the first use.
+
+        'templates' argument must be of 'collections.abc.Iterable' type
+        containing instance of 'str'(s) listed by 'templates_probe'.
         """
-        pass
+        if self.__template_entries is None:
+            self.templates_probe()
+
+        if None == templates:
+            self.__templates = set(self.__template_entries)
+            self.__shared.discard("templates")
+            self.__templates_view = None
+            self.__pending.pop("templates", None)
+            return
+
+        if not isinstance(templates, collections.abc.Iterable):
+            raise TypeError("'templates' argument must be iterable")
+
+        if isinstance(templates, str):
+            raise TypeError(("'templates' argument must be an iterable "
+                             "containing 'str' type"))
+
+        templates = SkaffConfig.__names_validate(templates, "templates")
+
+        # Probes the template paths again for templates added since the last
+        # probe before giving up
+        if not all(template in self.__template_entries
+                   for template in templates):
+            self.templates_probe()
+
+        missing = [template for template in templates
+                   if template not in self.__template_entries]
+
+        if missing:
+            raise ValueError(("'templates' argument contains unknown "
+                              "template(s): " + ", ".join(missing)))
+
+        self.__templates = set(templates)
+        self.__shared.discard("templates")
+        self.__templates_view = None
+        self.__pending.pop("templates", None)
 
     def template_add(self, template):
         """
+        Enables 'template' if it is not enabled yet; otherwise do nothing.
+        'template' must be one of the templates found by 'templates_probe'.
         """
-        pass
+        if not isinstance(template, str):
+            raise TypeError("'template' argument must be 'str' type")
+
+        if "templates" in self.__pending:
+            self.__evaluate("templates")
+
+        if template not in self.__template_entries:
+            self.templates_probe()
+
+        if template not in self.__template_entries:
+            raise ValueError("'template' argument must be a known template")
+
+        if "templates" in self.__shared:
+            self.__unshare("templates")
+        self.__templates.add(template)
+        self.__templates_view = None
 
     def template_discard(self, template):
         """
+        Disables 'template' if it is enabled; otherwise do nothing.
         """
-        pass
+        if not isinstance(template, str):
+            raise TypeError("'template' argument must be 'str' type")
+
+        if "templates" in self.__pending:
+            self.__evaluate("templates")
+
+        if "templates" in self.__shared:
+            self.__unshare("templates")
+        self.__templates.discard(template)
+        self.__templates_view = None
 
     def templates_get(self, fullname=False):
         """
+        Gets a sorted tuple containing the enabled template(s) relative to the
+        template path if 'fullname' is 'False'; otherwise gets a tuple of the
+        fully qualified files the template(s) resolve to, in the same order.
         """
-        pass
+        if "templates" in self.__pending:
+            self.__evaluate("templates")
+        elif self.__template_entries is None:
+            self.templates_probe()
+
+        if self.__templates_view is None:
+            self.__templates_view = tuple(sorted(self.__templates))
+
+        if not fullname:
+            return self.__templates_view
+
+        return tuple(self.__template_entries[template].path
+                     for template in self.__templates_view)
+
+    def template_resolve(self, template):
+        """
+        Returns the 'TemplateEntry' (fully qualified 'path' and 'size') that
+        'template' resolves to; the 'user' template path takes precedence
+        over the 'system' one (see the docstring of 'paths_set').
+
+        Raises 'FileNotFoundError' if 'template' is not found by the latest
+        'templates_probe'.
+        """
+        if self.__template_entries is None:
+            self.templates_probe()
+
+        try:
+            return self.__template_entries[template]
+        except KeyError:
+            raise FileNotFoundError(("Template file '{}' not found"
+                                     .format(template))) from None
 
     def templates_probe(self):
         """
+        Probes both the 'template' path set by the 'paths_set' member function
+        and the 'system' template path, and builds the overlay index used by
+        'template_resolve'.
+
+        The index is shared by all the instances with the same 'template'
+        path and is only rebuilt when the modification time of any directory
+        in the template trees changes; templates that no longer exist are
+        disabled.
+        """
+        system_template_path = (SkaffConfig.basepath_fetch() +
+                                "config" + os.sep + "template" + os.sep)
+        registry = template_registry_get(self.paths_get("template"),
+                                         system_template_path)
+        entries = registry.refresh()
+
+        self.__template_entries = entries
+        if "templates" not in self.__pending and\
+                not self.__templates <= entries.keys():
+            self.__templates = self.__templates & entries.keys()
+            self.__templates_view = None
+
+    @staticmethod
+    def __directory_key(directory):
+        """
+        Returns the normalized form of 'directory' used as the key of the
+        internal directory index.
+        """
+        # Names without any '.' component or repeated separators only need
+        # their trailing separator stripped; 'normpath' is comparatively slow
+        if "posix" == os.name and "." not in directory and\
+                "//" not in directory:
+            return directory.rstrip("/") or "/"
+        return os.path.normcase(os.path.normpath(directory))
+
+    def __evaluate(self, key):
+        """
+        Evaluates the pending attribute 'key' by calling its mutator with
+        the argument recorded by the constructor, or the value found in the
+        configuration layers (if any) for the ones not given.
+
+        The attribute stays pending if the mutator raises an exception.
+        """
+        argument = self.__pending[key]
+
+        if argument is SkaffConfig.__LAYERED:
+            if self.__layers is None:
+                self.__layers = self._load()
+            argument = self.__layers.get(key)
+
+        getattr(self, key + "_set")(argument)
+
+    def __licenses_evaluate(self):
+        """
+        Validates the stock licenses and probes the license paths; called
+        by the accessors the first time the license listing is needed after
+        construction or 'paths_set'.
         """
-        pass
+        self.licenses_validate()
+        self.licenses_probe()
 
-    def _load(self, *args):
+    def __paths_evaluate(self):
         """
+        Fills in the 'license' and 'template' paths not given to the
+        constructor from the configuration layers.
         """
-        pass
+        if self.__layers is None:
+            self.__layers = self._load()
+
+        paths = dict(self.__layers.get("paths", dict()))
+        paths.update(self.__pending["paths"])
+        paths.setdefault("config", self.__paths["config"])
+        self.paths_set(**paths)
 
-    def _save(self, *args):
+    def __unshare(self, key):
         """
+        Replaces the container of attribute 'key' shared with the
+        parent/derived instances with a private copy.
         """
-        pass
+        name = "_SkaffConfig__" + key
+        setattr(self, name, getattr(self, name).copy())
+        self.__shared.discard(key)
+
+    def __license_registry_get(self):
+        """
+        Returns the license registry for the current 'license' path.
+        """
+        system_license_path = (SkaffConfig.basepath_fetch() +
+                               "config" + os.sep + "license" + os.sep)
+        return license_registry_get(self.paths_get("license"),
+                                    system_license_path)
+
+    def __directories_insert(self, directories):
+        """
+        Inserts the already validated 'directories' into the internal
+        directory index; the first name of each normalized path wins.
+        """
+        if "directories" in self.__shared:
+            self.__unshare("directories")
+        index = self.__directories
+        key = SkaffConfig.__directory_key
+        posix = "posix" == os.name
+        size = len(index)
+
+        # The common case of '__directory_key' is inlined here
+        for directory in directories:
+            if posix and "." not in directory and "//" not in directory:
+                index.setdefault(directory.rstrip("/") or "/", directory)
+            else:
+                index.setdefault(key(directory), directory)
+
+        if size != len(index):
+            self.__directories_view = None
+
+    @staticmethod
+    def __names_validate(names, argument, separator=False):
+        """
+        Validates every entry of the iterable 'names' in a single pass and
+        returns a list of the accepted names; the platform-dependent path
+        separator is appended to each of them if 'separator' is True.
+
+        Entries that are not of 'str' type, empty, or contain non-printable
+        characters are all collected and reported at once: 'TypeError' is
+        raised if any non-'str' entry is present, 'ValueError' otherwise.
+        'argument' is the name of the argument shown in the message.
+        """
+        sep = os.sep
+        accepted = list()
+        invalid = list()
+        wrong_type = False
+
+        for name in names:
+            if not isinstance(name, str):
+                wrong_type = True
+                invalid.append(name)
+            elif not name or not name.isprintable():
+                invalid.append(name)
+            elif separator and not name.endswith(sep):
+                accepted.append(name + sep)
+            else:
+                accepted.append(name)
+
+        if invalid:
+            message = ("'{0}' argument contains {1} invalid entry(ies): {2}"
+                       .format(argument,
+                               len(invalid),
+                               ", ".join(repr(name) for name in invalid)))
+            if wrong_type:
+                raise TypeError(message)
+            raise ValueError(message)
+
+        return accepted
+
+    def _load(self):
+        """
+        Returns a dictionary of the settings merged from the configuration
+        layers below the command-line (lowest precedence first):
+
+        1. "skaff.conf" under the 'system' config path
+
+        2. "skaff.conf" under the 'config' path set by 'paths_set'
+
+        3. ".skaff.conf" under the current working directory
+
+        4. 'SKAFF_*' environment variables
+
+        The file layers are parsed once and cached (refer to the 'conftools'
+        module for details); only the settings actually present in the layers
+        appear in the result.
+        """
+        return conf_load(user_path=self.paths_get("config"))
+
+    def _save(self, conf_file=None):
+        """
+        Saves the current 'authors', 'hooks' (without their timeouts),
+        'language', 'license', 'quiet', 'subdirectories', and the 'license'
+        and 'template' paths to
+        'conf_file', which defaults to the 'user' configuration file:
+        "$HOME/.config/skaff/skaff.conf"
+
+        The saved file can be loaded as one of the configuration layers; see
+        '_load' for details.
+        """
+        if conf_file is None:
+            conf_file = conf_layers_get(self.paths_get("config"))[1]
+
+        settings = {
+            "authors": self.authors_get(),
+            "hooks": {phase: [hook_format(hook) for hook in hooks]
+                      for phase, hooks in self.hooks_get().items()},
+            "language": self.language_get(),
+            "license": self.license_get(),
+            "paths": {key: self.paths_get(key)
+                      for key in ("license", "template")},
+            "quiet": self.quiet_get(),
+            "subdirectories": self.subdirectories_get()
+        }
+        conf_write(conf_file, settings)
 # --------------------------------- CLASSES -----------------------------------
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+
+"""
+A suite of 'skaff.conf' configuration file processing tools.
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = [
+    "conf_cache_path_get",
+    "conf_environ_get",
+    "conf_layers_get",
+    "conf_load",
+    "conf_parse",
+    "conf_snapshot_get",
+    "conf_write"
+]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import configparser
+import marshal
+import os
+import time
+
+from skaff.hooktools import HOOK_PHASES
+from typing import (
+    Dict,
+    List,
+    Mapping,
+    Optional
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+# Name of the configuration file in each of the 'file' layers
+_CONF_FILE = "skaff.conf"
+# Name of the project-local configuration file in the working directory
+_CONF_LOCAL_FILE = ".skaff.conf"
+# Section holding the per-project settings and the one holding 'paths'
+_CONF_SECTION = "skaff"
+_CONF_PATHS_SECTION = "paths"
+_CONF_HOOKS_SECTION = "hooks"
+# Keys with one value per line (multi-line values in INI syntax)
+_CONF_LIST_KEYS = frozenset(("authors", "subdirectories"))
+_CONF_BOOL_KEYS = frozenset(("quiet",))
+_CONF_STR_KEYS = frozenset(("language", "license"))
+_CONF_PATHS_KEYS = frozenset(("license", "template"))
+# Phases accepted by the '[hooks]' section
+_CONF_HOOKS_KEYS = frozenset(HOOK_PHASES)
+# Bumped whenever the layout of the marshalled snapshot changes
+_CONF_SNAPSHOT_VERSION = 2
+# Files modified within this many seconds of being parsed are not cached,
+# since a later modification may not change their time stamps (racy case)
+_CONF_RACY_SECONDS = 2
+# In-process snapshots, keyed by the time stamps of the source files
+_conf_snapshots = dict()
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+def conf_cache_path_get() -> str:
+    """
+    Returns the path of the file holding the marshalled snapshot of the merged
+    configuration file layers:
+    "$XDG_CACHE_HOME/skaff/skaff.conf.marshal", where 'XDG_CACHE_HOME' falls
+    back to "$HOME/.cache" if it is not set.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+
+    if not cache_home:
+        cache_home = os.path.expanduser("~") + os.sep + ".cache"
+
+    return (cache_home + os.sep + "skaff" + os.sep +
+            _CONF_FILE + ".marshal")
+
+
+def conf_environ_get(environ: Optional[Mapping[str, str]]=None) -> Dict:
+    """
+    Returns the configuration layer defined by the environment variables in
+    'environ' (defaults to 'os.environ'):
+
+    'SKAFF_AUTHORS', 'SKAFF_SUBDIRECTORIES': values separated by 'os.pathsep'
+
+    'SKAFF_LANGUAGE', 'SKAFF_LICENSE': single values
+
+    'SKAFF_QUIET': boolean value ("yes"/"no", "true"/"false", "on"/"off",
+    "1"/"0")
+
+    Variables that are not set or empty are not part of the result.
+    """
+    if environ is None:
+        environ = os.environ
+
+    result = dict()
+
+    for key in _CONF_LIST_KEYS | _CONF_BOOL_KEYS | _CONF_STR_KEYS:
+        value = environ.get("SKAFF_" + key.upper())
+        if not value:
+            continue
+        if key in _CONF_LIST_KEYS:
+            result[key] = _conf_list_convert(value.split(os.pathsep), key)
+        elif key in _CONF_BOOL_KEYS:
+            result[key] = _conf_bool_convert(value, "SKAFF_" + key.upper())
+        else:
+            result[key] = value.strip()
+
+    return result
+
+
+def conf_layers_get(user_path: Optional[str]=None,
+                    project_path: Optional[str]=None) -> List[str]:
+    """
+    Returns the configuration files in the order they are merged, from the
+    lowest precedence to the highest:
+
+    1. The 'system' file distributed along with skaff:
+    "/usr/lib/python3/dist-packages/skaff/config/skaff.conf"
+
+    2. The 'user' file under 'user_path', which defaults to:
+    "$HOME/.config/skaff/"
+
+    3. The 'project-local' file ".skaff.conf" under 'project_path', which
+    defaults to the current working directory.
+
+    The files listed do not necessarily exist.
+    """
+    system_path = (os.path.dirname(os.path.abspath(__file__)) + os.sep +
+                   "config" + os.sep)
+
+    if user_path is None:
+        user_path = (os.path.expanduser("~") + os.sep + ".config" + os.sep +
+                     "skaff" + os.sep)
+
+    if project_path is None:
+        project_path = os.getcwd()
+
+    for path in (user_path, project_path):
+        if not isinstance(path, str):
+            raise TypeError("paths of the layers must be of 'str' type")
+
+    if not user_path.endswith(os.sep):
+        user_path += os.sep
+
+    if not project_path.endswith(os.sep):
+        project_path += os.sep
+
+    return [system_path + _CONF_FILE,
+            user_path + _CONF_FILE,
+            project_path + _CONF_LOCAL_FILE]
+
+
+def conf_load(user_path: Optional[str]=None,
+              project_path: Optional[str]=None,
+              environ: Optional[Mapping[str, str]]=None,
+              cache_path: Optional[str]=None) -> Dict:
+    """
+    Returns the configuration merged from all the layers except for the
+    command-line: the files listed by 'conf_layers_get' (see its docstring
+    for the meaning of 'user_path' and 'project_path') followed by the
+    environment variables in 'environ' (see 'conf_environ_get').
+
+    Settings from a later layer override the ones from an earlier layer; the
+    resulting dictionary only contains keys that are set by at least one of
+    the layers, so the callers can apply their own defaults for the rest.
+
+    The merged file layers are parsed at most once per process and are also
+    cached in 'cache_path' (see 'conf_snapshot_get') across processes.
+    """
+    layers = conf_layers_get(user_path, project_path)
+    result = _conf_copy(conf_snapshot_get(layers, cache_path))
+    _conf_merge(result, conf_environ_get(environ))
+    return result
+
+
+def conf_parse(conf_file: str) -> Dict:
+    """
+    Parses a single INI-style 'conf_file' and returns a dictionary containing
+    the settings found in it.
+
+    The '[skaff]' section may contain the following keys:
+
+    'authors', 'subdirectories': one value per line
+
+    'language', 'license': single values
+
+    'quiet': boolean value
+
+    The '[paths]' section may contain 'license' and 'template' keys, which
+    are returned as a nested dictionary under the 'paths' key.
+
+    The '[hooks]' section may contain a key for each of the 'HOOK_PHASES'
+    (see 'skaff.hooktools') with one command per line, which are returned as
+    a nested dictionary of lists under the 'hooks' key.
+
+    Unknown sections and keys are ignored; subdirectories written with "/"
+    are converted to use the platform-dependent path separator.
+    """
+    parser = configparser.ConfigParser(interpolation=None)
+    result = dict()
+
+    with open(conf_file, "r", encoding="utf-8") as conf:
+        parser.read_file(conf)
+
+    if parser.has_section(_CONF_SECTION):
+        section = parser[_CONF_SECTION]
+        for key in section:
+            if key in _CONF_LIST_KEYS:
+                result[key] = _conf_list_convert(section[key].splitlines(),
+                                                 key)
+            elif key in _CONF_BOOL_KEYS:
+                result[key] = _conf_bool_convert(section[key], key)
+            elif key in _CONF_STR_KEYS:
+                result[key] = section[key].strip()
+
+    if parser.has_section(_CONF_PATHS_SECTION):
+        section = parser[_CONF_PATHS_SECTION]
+        paths = dict()
+        for key in section:
+            if key in _CONF_PATHS_KEYS and section[key].strip():
+                paths[key] = os.path.expanduser(section[key].strip())
+        if paths:
+            result["paths"] = paths
+
+    if parser.has_section(_CONF_HOOKS_SECTION):
+        section = parser[_CONF_HOOKS_SECTION]
+        hooks = dict()
+        for key in section:
+            if key in _CONF_HOOKS_KEYS:
+                hooks[key] = _conf_list_convert(section[key].splitlines(), key)
+        if hooks:
+            result["hooks"] = hooks
+
+    return result
+
+
+def conf_snapshot_get(layers: List[str],
+                      cache_path: Optional[str]=None) -> Dict:
+    """
+    Returns the merged settings of the configuration files in 'layers' (files
+    that do not exist are skipped).
+
+    The result is keyed by the modification time and size of every file in
+    'layers': it is computed once per process, and also stored as a
+    'marshal' snapshot in 'cache_path' (defaults to the result of
+    'conf_cache_path_get'), so that an unchanged set of files is loaded
+    without parsing any of them again.
+
+    NOTE: the dictionary returned is shared; do not modify it.
+    """
+    if cache_path is None:
+        cache_path = conf_cache_path_get()
+
+    stamps = tuple(_conf_stamp(layer) for layer in layers)
+    key = (cache_path, stamps)
+
+    if key in _conf_snapshots:
+        return _conf_snapshots[key]
+
+    merged = _conf_snapshot_read(cache_path, stamps)
+
+    if merged is None:
+        merged = dict()
+        for layer, stamp in zip(layers, stamps):
+            if stamp[1] is not None:
+                _conf_merge(merged, conf_parse(layer))
+        newest = max((stamp[1] for stamp in stamps if stamp[1] is not None),
+                     default=0)
+        # Racily modified files would be cached with stale content
+        if time.time() - newest / 1e9 > _CONF_RACY_SECONDS:
+            _conf_snapshot_write(cache_path, stamps, merged)
+
+    _conf_snapshots[key] = merged
+    return merged
+
+
+def conf_write(conf_file: str, settings: Mapping) -> None:
+    """
+    Writes 'settings' (in the format returned by 'conf_parse') to
+    'conf_file' in INI syntax; missing parent directories are created and
+    the file is replaced atomically.
+    """
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.add_section(_CONF_SECTION)
+
+    for key in sorted(settings):
+        value = settings[key]
+        if key in _CONF_LIST_KEYS:
+            lines = (item.replace(os.sep, "/") if "subdirectories" == key
+                     else item for item in value)
+            parser[_CONF_SECTION][key] = "\n" + "\n".join(lines)
+        elif key in _CONF_BOOL_KEYS:
+            parser[_CONF_SECTION][key] = "yes" if value else "no"
+        elif key in _CONF_STR_KEYS:
+            parser[_CONF_SECTION][key] = value
+        elif "paths" == key:
+            parser.add_section(_CONF_PATHS_SECTION)
+            for path_key in sorted(value):
+                if path_key in _CONF_PATHS_KEYS:
+                    parser[_CONF_PATHS_SECTION][path_key] = value[path_key]
+        elif "hooks" == key:
+            parser.add_section(_CONF_HOOKS_SECTION)
+            for phase in sorted(value):
+                if phase in _CONF_HOOKS_KEYS and value[phase]:
+                    parser[_CONF_HOOKS_SECTION][phase] =\
+                        "\n" + "\n".join(value[phase])
+
+    directory = os.path.dirname(os.path.abspath(conf_file))
+    os.makedirs(directory, exist_ok=True)
+    temp_file = "{0}.{1}.tmp".format(conf_file, os.getpid())
+
+    with open(temp_file, "w", encoding="utf-8") as conf:
+        parser.write(conf)
+    os.replace(temp_file, conf_file)
+
+
+def _conf_bool_convert(value, key):
+    """
+    Converts the boolean string 'value' of 'key' to 'bool'.
+    """
+    states = configparser.ConfigParser.BOOLEAN_STATES
+    value = value.strip().lower()
+
+    if value not in states:
+        raise ValueError("'{0}' must be a boolean value".format(key))
+
+    return states[value]
+
+
+def _conf_copy(settings):
+    """
+    Returns a copy of 'settings' that does not share any mutable value.
+    """
+    result = dict()
+
+    for key, value in settings.items():
+        if isinstance(value, dict):
+            result[key] = {nested_key: (list(nested_value)
+                                        if isinstance(nested_value, list)
+                                        else nested_value)
+                           for nested_key, nested_value in value.items()}
+        elif isinstance(value, list):
+            result[key] = list(value)
+        else:
+            result[key] = value
+
+    return result
+
+
+def _conf_list_convert(lines, key):
+    """
+    Strips every line in 'lines' and drops the empty ones; "/" is replaced by
+    the platform-dependent path separator for 'subdirectories'.
+    """
+    result = [line.strip() for line in lines if line.strip()]
+
+    if "subdirectories" == key and "/" != os.sep:
+        result = [line.replace("/", os.sep) for line in result]
+
+    return result
+
+
+def _conf_merge(settings, layer):
+    """
+    Merges 'layer' into 'settings' in place; 'paths' and 'hooks' are merged
+    key by key (so a layer only replaces the hooks of the phases it sets).
+    """
+    for key, value in layer.items():
+        if key in ("hooks", "paths"):
+            settings.setdefault(key, dict()).update(value)
+        else:
+            settings[key] = value
+
+
+def _conf_snapshot_read(cache_path, stamps):
+    """
+    Returns the merged settings stored in 'cache_path' if they were computed
+    for the same 'stamps'; returns None otherwise.
+    """
+    try:
+        with open(cache_path, "rb") as cache:
+            version, cached_stamps, merged = marshal.load(cache)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if _CONF_SNAPSHOT_VERSION != version or stamps != cached_stamps:
+        return None
+
+    return merged
+
+
+def _conf_snapshot_write(cache_path, stamps, merged):
+    """
+    Stores the merged settings for 'stamps' to 'cache_path'; failures are
+    ignored since the snapshot is only an optimization.
+    """
+    temp_file = "{0}.{1}.tmp".format(cache_path, os.getpid())
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_file, "wb") as cache:
+            marshal.dump((_CONF_SNAPSHOT_VERSION, stamps, merged), cache)
+        os.replace(temp_file, cache_path)
+    except OSError:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+
+
+def _conf_stamp(conf_file):
+    """
+    Returns a tuple of the path, modification time (in nanoseconds) and size
+    of 'conf_file'; both of the latter are None if it does not exist.
+    """
+    try:
+        stat = os.stat(conf_file)
+    except OSError:
+        return (conf_file, None, None)
+
+    return (conf_file, stat.st_mtime_ns, stat.st_size)
+# -------------------------------- FUNCTIONS ----------------------------------
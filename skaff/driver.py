@@ -10,70 +10,406 @@ __all__ = ["skaff_drive"]
 
 # --------------------------------- MODULES -----------------------------------
 import collections
+import collections.abc
+import concurrent.futures
+import errno
+import itertools
 import os
-import re
+import shlex
 import shutil
 import subprocess
 import tempfile
 
-from datetime import datetime
 from distutils import spawn
 from skaff.clitools import (
-    timed_key_get,
-    ANSIColor
+    ANSIColor,
+    RawSession
 )
 from skaff.config import SkaffConfig
+from skaff.gittools import (
+    git_defaults_get,
+    git_repositories_init
+)
+from skaff.hooktools import (
+    HookResult,
+    HookRunner
+)
+from skaff.journaltools import Journal
+from skaff.layouttools import (
+    CMAKE_FILE,
+    DOXYFILE,
+    doxygen_found,
+    layout_write,
+    template_path_get
+)
+from skaff.schedtools import IOScheduler
+from skaff.jobtools import (
+    job_check,
+    job_create,
+    job_hooks_get,
+    job_root_get,
+    job_template_get,
+    jobs_create,
+    jobs_stream
+)
+from skaff.stagetools import (
+    STAGE_PREFIX,
+    stage_create,
+    stage_discard,
+    stage_publish,
+    stages_parents_clean
+)
+from skaff.synctools import (
+    durability_check,
+    tree_sync
+)
+from typing import (
+    Callable,
+    Iterable,
+    List,
+    Optional
+)
 # --------------------------------- MODULES -----------------------------------
 
 
+# ------------------------------- CONSTANTS -----------------------------------
+# Files of a project-directory opened for editing when 'quiet' is off
+_CONF_EDIT_FILES = (CMAKE_FILE, DOXYFILE)
+# Editors that open each of the files given in a tab page of its own
+_TAB_EDITORS = frozenset(("gvim", "nvim", "vim"))
+# Number of projects generated at a time when the project-directories are
+# streamed (see 'skaff_drive'); bounds the memory held by a batch of any size
+_STREAM_CHUNK = 256
+# ------------------------------- CONSTANTS -----------------------------------
+
+
 # -------------------------------- FUNCTIONS ----------------------------------
-def skaff_drive(config: SkaffConfig) -> None:
+def skaff_drive(config: SkaffConfig, *,
+                hook_workers: Optional[int]=None,
+                hook_timeout: Optional[float]=None,
+                git_init: bool=False,
+                batch_edit: bool=False,
+                durability: str="none",
+                stage_directory: Optional[str]=None,
+                journal: Optional[str]=None,
+                resume: bool=False,
+                scheduler: Optional[IOScheduler]=None,
+                directories: Optional[Iterable[str]]=None,
+                hook_callback: Optional[
+                    Callable[[HookResult], None]]=None) -> List:
     """
     Creates all the necessary subdirectories in addition to the project root.
+
+    The hooks of 'config' (see 'SkaffConfig.hooks_set') are run as follows:
+    'pre_tree' hooks run before the tree of each project is created and a
+    failing one raises 'RuntimeError' before anything of that project is
+    written; 'post_license' and 'post_project' hooks run on at most
+    'hook_workers' threads while the rest of the batch is generated;
+    'post_batch' hooks run once all of them have finished.
+    'hook_timeout' (in seconds) applies to hooks without their own timeout.
+    If 'hook_callback' is given, it is called with the 'HookResult' of each
+    hook as soon as the hook finishes (see 'HookRunner') instead of the
+    result being kept.
+
+    If 'git_init' is 'True', a git repository holding a single initial commit
+    of the files generated by skaff (as edited, but neither the ones created
+    by the hooks nor the ones ignored by the generated '.gitignore') is
+    created in each project-directory, several of them in parallel, after
+    the 'post_project' hooks and before the 'post_batch' hooks (see
+    'git_repositories_init').
+
+    If 'batch_edit' is 'True' and 'quiet' is off, the configuration files of
+    all the projects are opened in a single editor invocation once the whole
+    batch is generated, instead of one prompt and two editor invocations per
+    project; the 'post_project' hooks then run after the editing.
+
+    Otherwise the projects are generated by background threads while the
+    user is prompted for (and edits, unless 'quiet' is set) the ones already
+    generated, in the order they complete.
+
+    The file operations of the projects run on 'scheduler' (a private
+    'IOScheduler' if not given), which adjusts how many of them are in
+    flight to the storage as it goes and starts the largest outputs first;
+    pass one to read its 'metrics_get' afterwards.
+
+    Each project (and its git repository, if any) is flushed to the disk as
+    soon as it is generated according to 'durability', which is one of the
+    'DURABILITY_MODES' (see 'tree_sync').
+
+    Each project is generated in a hidden staging directory (under
+    'stage_directory' if given, next to the project-directory otherwise) and
+    published by a single rename once it is complete, so a failure never
+    leaves a partially generated project-directory behind; its 'post_license'
+    hooks run once it is published. Staging directories left behind by
+    earlier runs that crashed are removed first (see 'stages_clean').
+
+    If 'journal' (a path) is given, the events of each project are recorded
+    in it (see 'Journal'): a project is committed once it is published (and
+    its git repository is created, if 'git_init' is 'True'). If 'resume' is
+    'True' as well, the projects committed in the journal by an earlier run
+    are skipped without looking at them, and the staging directories an
+    interrupted run left of the others are removed before they are generated
+    again; their hooks run again as well. 'post_batch' hooks see all the
+    projects. A project-directory started but not committed by the
+    interrupted run is never removed (it may not have been written by
+    skaff): 'FileExistsError' is raised instead if it exists.
+
+    If 'directories' is given, the projects are generated for its names
+    instead of the ones tracked by 'config' (see 'jobs_stream'); they are
+    read as the generation goes, '_STREAM_CHUNK' at a time, so the memory
+    used does not depend on how many there are (as long as the results of
+    the hooks, if any, are handed to 'hook_callback'); the journal only
+    keeps a few bytes per project (see 'Journal'). Each chunk is completed
+    (including its hooks and git repositories) before the next one is read.
+
+    'post_batch' hooks see every project-directory, one per line, in the
+    file named by the 'SKAFF_DIRECTORIES_FILE' environment variable; unless
+    'directories' is given, they are also listed (separated by 'os.pathsep')
+    in the 'SKAFF_DIRECTORIES' environment variable.
+
+    Returns the 'HookResult' of every hook run (none if 'hook_callback' is
+    given); the output of the hooks is captured in the results instead of
+    being written to the terminal.
     """
     if not isinstance(config, SkaffConfig):
         raise ValueError("'config' argument must be of 'SkaffConfig' type")
 
-    for base_dir in config.directories_get():
-        os.makedirs(base_dir)
-        for sub_dir in config.subdirectories_get():
-            os.makedirs(base_dir + sub_dir)
-        # Create parent directory if it does not exist
-        os.makedirs("{0}include{1}{2}".format(base_dir,
-                                              os.sep,
-                                              os.path.basename(base_dir[:-1])))
-        _license_sign(base_dir, config)
-        _conf_doc_prompt(base_dir, config)
+    # 'config' is evaluated lazily; the job specifications resolve the license
+    # and the templates before anything is written so invalid settings cannot
+    # leave a partially generated tree behind
+    durability_check(durability)
+    if resume and journal is None:
+        raise ValueError("'resume' argument requires a 'journal'")
+    if directories is None:
+        jobs = tuple(jobs_create(config))
+        chunks = (jobs,)
+    else:
+        jobs = None
+        chunks = _jobs_chunk(jobs_stream(config, directories), _STREAM_CHUNK)
+    # Resolved up front so a missing 'git' is reported before anything is
+    # written
+    git_defaults = git_defaults_get() if git_init else None
+    runner = HookRunner(hook_workers, hook_timeout, hook_callback)
+    post_batch_hooks = config.hooks_get("post_batch")
+    # Parents of the project-directories whose stale staging directories are
+    # removed already
+    parents = set()
+    listing = None
+
+    if journal is not None:
+        journal = Journal(journal, resume, "none" != durability)
+
+    own_scheduler = scheduler is None
+    if own_scheduler:
+        scheduler = IOScheduler()
+
+    try:
+        if post_batch_hooks:
+            listing_fd, listing = tempfile.mkstemp(prefix="skaff-",
+                                                   suffix=".list")
+            listing_file = open(listing_fd, "w", encoding="utf-8")
+        # Without a git repository to create, each project is committed as
+        # soon as it is published; otherwise the files generated in each
+        # project-directory are recorded, so that only they are committed
+        written = dict() if git_init else None
+        # The sizes of the source files are looked at once per call, so the
+        # sources edited between two calls are looked at again
+        build_options = dict(durability=durability,
+                             stage_directory=stage_directory,
+                             journal=journal,
+                             commit=not git_init,
+                             scheduler=scheduler,
+                             written=written,
+                             sizes=dict(),
+                             # Looked up once per call rather than once
+                             # per project
+                             doxygen=doxygen_found())
+
+        for chunk in chunks:
+            stages_parents_clean((job.directory for job in chunk),
+                                 stage_directory, parents)
+            if listing is not None:
+                listing_file.writelines(job.directory + "\n"
+                                        for job in chunk)
+            pending = chunk
+            if journal is not None:
+                pending = _jobs_resume(chunk, journal)
+            _jobs_generate(pending, runner, batch_edit, build_options)
+
+            if git_init:
+                git_repositories_init((job.directory for job in pending),
+                                      defaults=git_defaults,
+                                      paths=written)
+                for job in pending:
+                    tree_sync(job.directory + ".git", durability)
+                    if journal is not None:
+                        journal.commit(job.directory)
+                written.clear()
+
+        if listing is not None:
+            listing_file.close()
+    finally:
+        if own_scheduler:
+            scheduler.close()
+        if journal is not None:
+            journal.close()
+        if listing is not None and not listing_file.closed:
+            listing_file.close()
+            os.remove(listing)
+
+    if listing is None:
+        return runner.results_get()
+
+    try:
+        environ = dict(os.environ)
+        environ["SKAFF_DIRECTORIES_FILE"] = listing
+        if jobs is not None:
+            environ["SKAFF_DIRECTORIES"] = os.pathsep.join(job.directory
+                                                           for job in jobs)
+        runner.run(post_batch_hooks, "post_batch", None, environ)
+    finally:
+        os.remove(listing)
+
+    return runner.results_get()
+
+
+def _jobs_chunk(jobs, size):
+    """
+    Returns an iterator of tuples of at most 'size' consecutive 'jobs' each,
+    which only takes the jobs of a tuple from 'jobs' when it is reached.
+    """
+    jobs = iter(jobs)
+
+    return iter(lambda: tuple(itertools.islice(jobs, size)), tuple())
+
+
+def _jobs_generate(jobs, runner, batch_edit, build_options):
+    """
+    Generates the project-directories of 'jobs' (see '_project_build' for
+    'build_options') and returns once all their hooks submitted to 'runner'
+    have finished; the configuration files are edited as described by
+    'skaff_drive'.
+    """
+    with runner:
+        if not batch_edit or all(job.quiet for job in jobs):
+            # The threads mostly wait for the file operations, so there are
+            # as many as operations allowed in flight
+            _projects_pipeline(jobs, runner,
+                               build_options["scheduler"].limit_max_get(),
+                               **build_options)
+            return
+
+        # Pairs of (job, future of its 'post_license' hooks) whose editing is
+        # deferred to the end of the batch
+        deferred = list()
+        for job in jobs:
+            license_hooks = _project_build(job, runner, **build_options)
+            if job.quiet:
+                _post_project_submit(job, runner, license_hooks)
+            else:
+                deferred.append((job, license_hooks))
+        if deferred:
+            _conf_batch_edit([job.directory + conf_file
+                              for job, _ in deferred
+                              for conf_file in _CONF_EDIT_FILES])
+        for job, license_hooks in deferred:
+            _post_project_submit(job, runner, license_hooks)
+
+
+def _jobs_resume(jobs, journal):
+    """
+    Returns the 'jobs' whose project-directories are not committed in
+    'journal' (by an earlier run) in the same order and records them as
+    planned; the staging directories of the ones started but not committed
+    (by an earlier run) are removed first.
+
+    Raises 'FileExistsError' before anything is removed if the
+    project-directory of any of the started ones exists: it was either
+    published by the earlier run or created by someone else since, so it is
+    left for the user to deal with.
+    """
+    pending = tuple(job for job in jobs
+                    if not journal.committed_contains(job.directory))
+    started = tuple(job.directory for job in pending
+                    if journal.partial_contains(job.directory))
+
+    for directory in started:
+        if os.path.lexists(directory):
+            raise FileExistsError(errno.EEXIST,
+                                  ("Project-directory started by an "
+                                   "interrupted run exists; remove it to "
+                                   "generate it again"),
+                                  directory)
+
+    for directory in started:
+        stage = journal.stage_get(directory)
+        # Only a staging directory is ever removed, whatever the journal says
+        if stage is not None and os.path.basename(
+                os.path.dirname(stage.rstrip(os.sep))).startswith(
+                    STAGE_PREFIX):
+            stage_discard(stage)
+
+    journal.plan(job.directory for job in pending)
+
+    return pending
+
+
+def _conf_batch_edit(conf_files):
+    """
+    Edits all the (fully qualified) 'conf_files' interactively in a single
+    invocation of the editor given by '_editor_get'; 'vim' and its variants
+    open each of them in a tab page of its own.
+    """
+    if not isinstance(conf_files, collections.abc.Iterable):
+        raise ValueError("'conf_files' argument must be of iterable type")
+
+    conf_files = list(conf_files)
+    if 0 == len(conf_files):
+        raise ValueError("'conf_files' argument must not be empty")
+
+    editor = _editor_get()
+
+    if os.path.basename(editor[0]) in _TAB_EDITORS:
+        editor.append("-p")
 
+    subprocess.call(editor + conf_files)
 
-def _arguments_check(directory, config):
+
+def _conf_edit(directory, conf_files):
     """
-    Performs 3 separate checks for the input 'directory' and 'config':
-    1. Whether 'directory' actually exist in the physical file system.
-    2. Whether 'config' is a (sub)class instance of 'SkaffConfig'.
-    3. Whether 'directory' can be obtained by 'directories_get' member function
-    call.
+    Edits all the 'conf_files' under 'directory' interactively.
+
+    By default the environment variable 'EDITOR' is used; if it is empty,
+    fall back to either 'vim' or 'vi'.
     """
-    if not os.path.isdir(directory):
+    if not directory or not os.path.isdir(directory):
         raise ValueError("'directory' must already exist")
 
-    if not isinstance(config, SkaffConfig):
-        raise ValueError("'config' argument must be of 'SkaffConfig' type")
+    if not directory.endswith(os.sep):
+        directory += os.sep
+
+    if not isinstance(conf_files, collections.abc.Iterable):
+        raise ValueError("'conf_files' argument must be of iterable type")
+    elif 0 == len(conf_files):
+        raise ValueError("'conf_files' argument must not be empty")
 
-    if directory not in config.directories_get():
-        raise ValueError(("'directory' argument must appear in the result of "
-                          "'directories_get()' member function invocation"))
+    editor = _editor_get()
+
+    for conf_file in conf_files:
+        subprocess.call(editor + [directory + conf_file])
 
 
-def _conf_doc_prompt(directory, config):
+def _conf_prompt(job):
     """
-    Prints interactive prompt related to the current 'directory' if 'quiet' is
-    False.
+    Prints interactive prompt related to the 'directory' of 'job' if 'quiet'
+    is False and waits (for at most 5 seconds) for the answer of the user.
 
-    Calls '_conf_spawn' and '_doc_create()' with the arguments given
-    afterwards.
+    Returns the (lower case) key pressed by the user, or an empty string if
+    none: "k" means the editing of this 'job' is skipped, and "a" means the
+    caller should skip the editing of all the rest.
     """
-    _arguments_check(directory, config)
+    job_check(job)
+    directory = job.directory
 
     terminal_info = shutil.get_terminal_size()
     hints = list()
@@ -88,9 +424,8 @@ def _conf_doc_prompt(directory, config):
     hints.append("Press [{0}a{1}] to skip all the rest.".format(
         ANSIColor.PURPLE, ANSIColor.RESET))
     key = str()
-    quiet = config.quiet_get()
 
-    if not quiet:
+    if not job.quiet:
         if "posix" == os.name:
             os.system("clear")
         elif "nt" == os.name:
@@ -100,11 +435,15 @@ def _conf_doc_prompt(directory, config):
             print(line.center(terminal_info.columns))
         print("\n" + "-" * terminal_info.columns)
         try:
-            while "c" != key.lower():
-                key = timed_key_get(5)
-                if "a" == key.lower() or "k" == key.lower():
-                    config.quiet_set(True)
-                    break
+            # The terminal stays in raw mode for all the keys of the prompt
+            with RawSession() as session:
+                while "c" != key:
+                    key = session.key_get(5).lower()
+                    if "a" == key or "k" == key:
+                        break
+                    # End of the input; nobody is there to answer
+                    if not key:
+                        break
         except TimeoutError:
             pass
         if "posix" == os.name:
@@ -112,275 +451,279 @@ def _conf_doc_prompt(directory, config):
         elif "nt" == os.name:
             os.system("cls")
 
-    _conf_spawn(directory, config)
-    _doc_create(directory, config)
+    return key
 
-    # Revert the changes if only the current 'directory' is affected
-    # by the 'quiet' setting
-    if "k" == key.lower():
-        config.quiet_set(False)
 
+def _conf_spawn(job):
+    """
+    Spawns configuration files under the project root directory of 'job'.
 
-def _conf_edit(directory, conf_files):
+    The spawned configuration files in the project root include:
+    {
+    ".editorconfig", ".gdbinit", ".gitattributes",
+    ".gitignore", ".travis.yml", "CMakeLists.txt"
+    }
+
+    An additional "CMakeLists.txt" will also be spawned in 'src' subdirectory
+    if it exists.
     """
-    Edits all the 'conf_files' under 'directory' interactively.
+    layout_write(job, "conf")
 
-    By default the environment variable 'EDITOR' is used; if it is empty,
-    fall back to either 'vim' or 'vi'.
+    if not job.quiet:
+        _conf_edit(job_root_get(job), [CMAKE_FILE])
+
+
+def _doc_create(job, doxyfile=True):
     """
-    if not directory or not os.path.isdir(directory):
-        raise ValueError("'directory' must already exist")
+    Creates 'CHANGELOG.md', 'Doxyfile', and 'README.md' template; the
+    'Doxyfile' is left to the caller if 'doxyfile' is set to False.
 
-    if not directory.endswith(os.sep):
-        directory += os.sep
+    Launches $EDITOR or vim on the 'Doxyfile' upon completion, can be turned
+    off by setting quiet to True.
+    """
+    layout_write(job, "doc")
+
+    if doxyfile:
+        _doxyfile_generate(job)
+
+
+def _doxyfile_generate(job, doxygen=None):
+    """
+    Generates or uses existing template 'Doxyfile' within the 'directory' of
+    'job', depending on whether 'doxygen' is found (looked up if not given).
+
+    Launches $EDITOR or vim afterwards if 'quiet' is set to False.
+    """
+    layout_write(job, "doxyfile", doxygen)
+
+    if not job.quiet:
+        _conf_edit(job_root_get(job), [DOXYFILE])
 
-    if not isinstance(conf_files, collections.Iterable):
-        raise ValueError("'conf_files' argument must be of iterable type")
-    elif 0 == len(conf_files):
-        raise ValueError("'conf_files' argument must not be empty")
+
+def _editor_get():
+    """
+    Returns the command line (as a list) of the editor to be used.
+
+    By default the environment variable 'EDITOR' (which may carry arguments)
+    is used; if it is not set, fall back to either 'vim', 'vi', or 'notepad'.
+    """
+    if os.environ.get("EDITOR"):
+        return shlex.split(os.environ["EDITOR"])
 
     # Default to 'vi' or 'vim' if the environment variable is not set.
-    default_editor = None
     editor_candidates = ("vim", "vi", "notepad")
 
     for candidate in editor_candidates:
         if spawn.find_executable(candidate):
-            default_editor = candidate
-            break
-    else:
-        raise RuntimeError("editors not found")
+            return [candidate]
 
-    editor = os.environ.get("EDITOR", default_editor)
+    raise RuntimeError("editors not found")
 
-    for conf_file in conf_files:
-        subprocess.call([editor, directory + conf_file])
 
+def _io_submit(scheduler, function, *args, size=0):
+    """
+    Submits 'function' with 'args' to 'scheduler' (see 'IOScheduler.submit')
+    and returns the 'Future' of its result; if 'scheduler' is None, calls it
+    right away in the calling thread instead.
+    """
+    if scheduler is not None:
+        return scheduler.submit(function, *args, size=size)
+
+    future = concurrent.futures.Future()
+    try:
+        future.set_result(function(*args))
+    except Exception as exception:
+        future.set_exception(exception)
+
+    return future
 
-def _conf_spawn(directory, config):
+
+def _license_sign(job):
     """
-    Spawns configuration files under the project root directory.
+    Copies the license chosen by authors to the 'directory' of 'job', signs it
+    with authors and current year prepended if applicable; 'directory' must
+    already exist.
 
-    The spawned configuration files in the project root include:
-    {
-    ".editorconfig", ".gdbinit", ".gitattributes",
-    ".gitignore", ".travis.yml", "CMakeLists.txt"
-    }
+    Note only the 'SIGNED_LICENSES' ({"bsd2", "bsd3", "mit"}) will be signed
+    by names in authors.
+    """
+    layout_write(job, "license")
 
-    An additional "CMakeLists.txt" will also be spawned in 'src' subdirectory
-    if it exists.
+
+def _post_project_submit(job, runner, license_hooks):
+    """
+    Schedules the 'post_project' hooks of 'job' on 'runner' to run after
+    'license_hooks' (the future of its 'post_license' hooks).
     """
-    _arguments_check(directory, config)
-
-    language = config.language_get()
-    quiet = config.quiet_get()
-    cmake_file = "CMakeLists.txt"
-    cmake_source_prefix = SkaffConfig.basepath_fetch() +\
-        "config" + os.sep +\
-        "template" + os.sep +\
-        language + os.sep
-    sample_source_file = "main." + language
-
-    shutil.copy(cmake_source_prefix + cmake_file, directory)
-
-    if os.path.isdir(directory + "src"):
-        shutil.copy(cmake_source_prefix + "src" + os.sep + cmake_file,
-                    directory + "src" + os.sep)
-        shutil.copy(cmake_source_prefix + "src" + os.sep + sample_source_file,
-                    directory + "src" + os.sep)
-
-    # Again, "figuring out where the configuration resides" may belong to the
-    # responsibility of 'SkaffConfig' class; this responsibiltiy will be
-    # moved to 'SkaffConfig' after "ini-parsing" functionality is implemented.
-    conf_files = ("editorconfig", "gdbinit", "gitattributes", "gitignore")
-    conf_source_prefix = SkaffConfig.basepath_fetch() +\
-        "config" + os.sep +\
-        "template" + os.sep
-    conf_target_prefix = directory + "."
-    travis_file = "travis.yml"
-    travis_source_file = conf_source_prefix + travis_file
-    travis_target_file = conf_target_prefix + travis_file
-    language_header = "language: {0}\n".format(language)
-
-    for configuration in conf_files:
-        shutil.copy(conf_source_prefix + configuration + ".txt",
-                    conf_target_prefix + configuration)
-
-    with open(travis_source_file, "r", encoding="utf-8") as travis_source:
-        travis_text = travis_source.read()
-        with open(travis_target_file, "w", encoding="utf-8") as travis_target:
-            travis_target.write(language_header)
-            travis_target.write(travis_text)
-    if not quiet:
-        _conf_edit(directory, [cmake_file])
-
-
-def _doc_create(directory, config):
-    """
-    Creates 'CHANGELOG.md', 'Doxyfile', and 'README.md' template.
+    runner.submit(job_hooks_get(job, "post_project"),
+                  "post_project",
+                  job.directory,
+                  after=license_hooks)
 
-    Launches $EDITOR or vim on the 'Doxyfile' upon completion, can be turned
-    off by setting quiet to True.
+
+def _project_build(job, runner, durability="none", stage_directory=None,
+                   journal=None, commit=True, scheduler=None, written=None,
+                   sizes=None, doxygen=None):
     """
-    _arguments_check(directory, config)
-
-    changelog_header = (
-        "# Change Log\n"
-        "This document records all notable changes to {0}.  \n"
-        "This project adheres to [Semantic Versioning](http://semver.org/).\n"
-        "\n## 0.1 (Upcoming)\n"
-        "* New feature here\n"
-    ).format(directory[:-1].title())
-    readme_header = (
-        "![{0}](misc{1}img{1}banner.png)\n"
-        "\n## Overview\n"
-        "\n## License\n"
-    ).format(directory[:-1], os.sep)
-    changelog_text = directory + "CHANGELOG.md"
-    copyright_line = "Copyright © {year} {authors}\n".format(
-        year=datetime.now().year,
-        authors=", ".join(config.authors_get())
-    )
-    license_text = SkaffConfig.basepath_fetch() +\
-        "config" + os.sep +\
-        "license" + os.sep +\
-        config.license_get() + ".md"
-    readme_text = directory + "README.md"
-
-    with open(license_text, "r", encoding="utf-8") as license_file:
-        license_markdown = license_file.read()
-        with open(readme_text, "w", encoding="utf-8") as readme_file:
-            readme_file.write(readme_header)
-            readme_file.write(copyright_line)
-            readme_file.write(license_markdown)
-
-    with open(changelog_text, "w", encoding="utf-8") as changelog_file:
-        changelog_file.write(changelog_header)
-
-    _doxyfile_generate(directory, config)
-
-
-def _doxyfile_attr_match(project_name, line):
-    """
-    Determines whether there is any 'Doxyfile' options available in 'line'.
-
-    Return the updated version if 'line' contains options that need to be
-    changed; otherwise return None.
-    """
-    arguments = (project_name, line)
-
-    if not all(argument for argument in arguments):
-        raise ValueError(("Both 'project_name' and 'line' "
-                         "have to be non-empty 'str' type"))
-
-    if not all(isinstance(argument, str) for argument in arguments):
-        raise ValueError(("Both 'project_name' and 'line' "
-                         "have to be of 'str' type"))
-
-    # Gets rid of the trailing separator character
-    if project_name.endswith(os.sep):
-        project_name = project_name[:-1]
-
-    # Tests whether the length of 'project_name' become 0 after truncation
-    if not project_name:
-        raise ValueError("'project_name' cannot be a single slash character")
-
-    attr_dict = {"PROJECT_NAME": "\"" + project_name.title() + "\"",
-                 "OUTPUT_DIRECTORY": "." + os.sep + "doc",
-                 "TAB_SIZE": 8,
-                 "EXTRACT_ALL": "YES",
-                 "EXTRACT_STATIC": "YES",
-                 "RECURSIVE": "YES",
-                 "EXCLUDE": "build",
-                 "HAVE_DOT": "YES",
-                 "UML_LOOK": "YES",
-                 "TEMPLATE_RELATIONS": "YES",
-                 "CALL_GRAPH": "YES",
-                 "DOT_IMAGE_FORMAT": "svg",
-                 "INTERACTIVE_SVG": "YES"}
-    line = line.lstrip()
-
-    # If the line is solely composed of whitespace or is a comment
-    if not line or line.startswith("#"):
-        return None
-
-    for attr in attr_dict:
-        # '\s' stands for whitespace characters
-        match = re.match(R"\s*" + attr + R"\s*=", line)
-        if match:
-            split_index = match.string.find("=") + 1
-            return match.string[:split_index] + " " +\
-                str(attr_dict[attr]) + "\n"
-
-    return None
-
-
-def _doxyfile_generate(directory, config):
-    """
-    Generates or uses existing template 'Doxyfile' within 'directory'.
+    Generates the project-directory of 'job' without any prompt or editing
+    in a staging directory under 'stage_directory' (see 'stage_create'),
+    publishes it once it is complete (flushed to the disk according to
+    'durability', see 'stage_publish') and schedules its 'post_license'
+    hooks on 'runner'.
 
-    Launches $EDITOR or vim afterwards if 'quiet' is set to False.
+    Raises 'FileExistsError' if the project-directory already exists; the
+    staging directory is removed if the generation fails.
+
+    The start of the generation is recorded in 'journal' (a 'Journal') if
+    given, and so is its commit once published if 'commit' is True.
+
+    If 'written' (a 'dict') is given, the paths of the files generated
+    (relative to the project-directory) are recorded in it under the
+    project-directory before it is published.
+
+    The file operations run on 'scheduler' (an 'IOScheduler') if given, the
+    independent ones (configuration files, documents, and 'Doxyfile') at the
+    same time, the ones with the largest source files first (the sizes of
+    which are cached in 'sizes', a 'dict', if given); otherwise they run one
+    after another in the calling thread.
+
+    'doxygen' tells whether 'doxygen' is found (looked up if not given, see
+    '_doxyfile_generate').
+
+    Returns the future of the 'post_license' hooks given by 'runner.submit'.
     """
-    _arguments_check(directory, config)
-
-    doxyfile = "Doxyfile"
-    doxyfile_source_prefix = SkaffConfig.basepath_fetch() +\
-        "config" + os.sep +\
-        "template" + os.sep
-    doxyfile_target_prefix = directory
-    doxygen_cmd = ["doxygen", "-g", doxyfile_target_prefix + doxyfile]
-    quiet = config.quiet_get()
-
-    if spawn.find_executable("doxygen"):
-        # Redirects the terminal output of 'doxygen' to null device
-        with open(os.devnull, "w") as null_device:
-            subprocess.call(doxygen_cmd, stdout=null_device)
-        with tempfile.TemporaryFile("w+") as tmp_file:
-            with open(doxyfile_target_prefix + doxyfile, "r+") as output_file:
-                for line in output_file:
-                    match = _doxyfile_attr_match(directory, line)
-                    tmp_file.write(line if not match else match)
-                tmp_file.seek(0)
-                output_file.seek(0)
-                output_file.truncate()
-                shutil.copyfileobj(tmp_file, output_file)
-    else:
-        shutil.copy(doxyfile_source_prefix + doxyfile,
-                    doxyfile_target_prefix + doxyfile)
+    job_check(job)
+    base_dir = job.directory
+    pre_tree = job_hooks_get(job, "pre_tree")
+
+    if pre_tree:
+        for result in runner.run(pre_tree, "pre_tree", base_dir):
+            if 0 != result.returncode:
+                raise RuntimeError(("'pre_tree' hook '{0}' failed for "
+                                    "'{1}':\n{2}").format(
+                                        " ".join(result.command),
+                                        base_dir,
+                                        result.output))
+
+    stage = stage_create(base_dir, stage_directory)
+    staged_job = job._replace(quiet=True, stage=stage)
+    try:
+        if journal is not None:
+            journal.start(base_dir, stage)
+        _io_submit(scheduler, _project_tree_create, staged_job,
+                   size=_source_size_get(job.license_sources.text,
+                                         sizes)).result()
+        futures = (_io_submit(scheduler, _doxyfile_generate, staged_job,
+                              doxygen,
+                              size=_source_size_get(
+                                  template_path_get(staged_job, DOXYFILE),
+                                  sizes)),
+                   _io_submit(scheduler, _doc_create, staged_job, False,
+                              size=_source_size_get(
+                                  job.license_sources.markdown, sizes)),
+                   # Only small files
+                   _io_submit(scheduler, _conf_spawn, staged_job))
+        # All of them are finished before the stage may be removed
+        concurrent.futures.wait(futures)
+        for future in futures:
+            future.result()
+        if written is not None:
+            written[base_dir] = _tree_files_get(stage)
+        _io_submit(scheduler, stage_publish, stage, base_dir,
+                   durability).result()
+    except BaseException:
+        stage_discard(stage)
+        raise
+
+    if journal is not None and commit:
+        journal.commit(base_dir)
+
+    return runner.submit(job_hooks_get(job, "post_license"),
+                         "post_license",
+                         base_dir)
+
+
+def _project_tree_create(job):
+    """
+    Creates the project-directory of 'job' along with its subdirectories and
+    signs its license; the files are written to its 'stage' if it is being
+    staged (see 'job_root_get').
+    """
+    layout_write(job, "tree")
+    _license_sign(job)
+
+
+def _projects_pipeline(jobs, runner, workers=None, **build_options):
+    """
+    Generates the project-directories of 'jobs' on at most 'workers' threads
+    (defaults to the number of processors; see '_project_build' for
+    'build_options') while the calling thread prompts
+    for and edits the configuration files of each generated project, in the
+    order they complete; the 'post_project' hooks of a project are scheduled
+    on 'runner' once its editing is done.
+
+    The wall-clock time thus approaches the longer of the generation and the
+    editing instead of their sum.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # Set once the user chooses to skip the editing of all the rest projects
+    quiet = False
+
+    with concurrent.futures.ThreadPoolExecutor(
+            max(1, min(workers, len(jobs)))) as executor:
+        futures = {executor.submit(_project_build, job, runner,
+                                   **build_options): job
+                   for job in jobs}
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                job = futures[future]
+                license_hooks = future.result()
+                if not quiet and not job.quiet:
+                    key = _conf_prompt(job)
+                    if "a" == key:
+                        quiet = True
+                    elif "k" != key:
+                        _conf_edit(job.directory, _CONF_EDIT_FILES)
+                _post_project_submit(job, runner, license_hooks)
+        except BaseException:
+            # Projects not started yet are not generated at all
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def _source_size_get(path, sizes=None):
+    """
+    Returns the size (in bytes) of the source file at 'path', or 0 if 'path'
+    is None or cannot be read; if 'sizes' (a 'dict' keyed by paths) is given,
+    each path is only looked at once through it.
+    """
+    if sizes is not None and path in sizes:
+        return sizes[path]
+
+    try:
+        size = os.stat(path).st_size
+    except (OSError, TypeError):
+        size = 0
 
-    if not quiet:
-        _conf_edit(directory, [doxyfile])
+    if sizes is not None:
+        sizes[path] = size
 
+    return size
 
-def _license_sign(directory, config):
+
+def _tree_files_get(directory):
     """
-    Copies the license chosen by authors to the 'directory', signs it
-    with authors and current year prepended if applicable; 'directory' must
-    already exist.
+    Returns a tuple of the paths of all the files under 'directory' (which
+    ends with a path separator), relative to it.
+    """
+    files = list()
 
-    Note only licenses in {"bsd2", "bsd3", "mit"} will be signed by names in
-    authors.
-    """
-    _arguments_check(directory, config)
-
-    copyright_line = "Copyright (c) {year}, {authors}\n".format(
-        year=datetime.now().year,
-        authors=", ".join(config.authors_get())
-    )
-    # Note "figuring out where the source license resides" may belong to the
-    # responsibility of 'SkaffConfig' class; this responsibiltiy will be
-    # moved to 'SkaffConfig' after "ini-parsing" functionality is implemented.
-    license_source = SkaffConfig.basepath_fetch() +\
-        "config" + os.sep +\
-        "license" + os.sep +\
-        config.license_get() + ".txt"
-    license_target = directory + "LICENSE.txt"
-
-    if config.license_get() in frozenset(("bsd2", "bsd3", "mit")):
-        with open(license_source, "r", encoding="utf-8") as from_file:
-            vanilla_license_text = from_file.read()
-            with open(license_target, "w", encoding="utf-8") as to_file:
-                to_file.write(copyright_line)
-                to_file.write(vanilla_license_text)
-    else:
-        shutil.copy(license_source, license_target)
+    for root, _, names in os.walk(directory):
+        relative = os.path.relpath(root, directory)
+        prefix = str() if os.curdir == relative else relative + os.sep
+        files.extend(prefix + name for name in names)
+
+    return tuple(files)
 # -------------------------------- FUNCTIONS ----------------------------------
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+
+"""
+A suite of git repository initialization tools.
+
+A repository holding a single initial commit of every file in a
+project-directory is written directly as loose objects (together with the
+index and the references), so no git process is forked per repository;
+'git' itself is only run once per batch to resolve the identities and the
+default branch name.
+
+Paths matched by the '.gitignore' at the top of the project-directory are
+left out of the commit, like 'git add' does.
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = [
+    "GitDefaults",
+    "git_defaults_get",
+    "git_repository_init",
+    "git_repositories_init"
+]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import collections
+import concurrent.futures
+import hashlib
+import os
+import re
+import stat
+import struct
+import subprocess
+import zlib
+
+from typing import (
+    Iterable,
+    List,
+    Mapping,
+    Optional
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+# Same settings 'git init' writes for a non-bare repository
+_GIT_CONFIG = ("[core]\n"
+               "\trepositoryformatversion = 0\n"
+               "\tfilemode = true\n"
+               "\tbare = false\n"
+               "\tlogallrefupdates = true\n")
+_GIT_DIRECTORIES = ("objects" + os.sep + "info",
+                    "objects" + os.sep + "pack",
+                    "refs" + os.sep + "heads",
+                    "refs" + os.sep + "tags",
+                    "info")
+_GIT_NULL_SHA = "0" * 40
+# zlib level used by git for loose objects ('core.looseCompression')
+_GIT_ZLIB_LEVEL = 1
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+# 'author', 'committer': identities with time stamps in the form of
+# "Name <email> seconds +hhmm", as given by 'git var'
+# 'branch': name of the branch the initial commit is recorded on
+GitDefaults = collections.namedtuple("GitDefaults",
+                                     ("author", "committer", "branch"))
+# --------------------------------- CLASSES -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+def git_defaults_get(environ: Optional[dict]=None) -> GitDefaults:
+    """
+    Returns the 'GitDefaults' resolved by a single 'git var -l' run with the
+    environment 'environ' (defaults to 'os.environ'), so the usual
+    configuration files and 'GIT_AUTHOR_*'/'GIT_COMMITTER_*' variables apply.
+
+    Raises 'RuntimeError' if 'git' cannot be run.
+    """
+    try:
+        process = subprocess.run(("git", "var", "-l"),
+                                 env=environ,
+                                 stdin=subprocess.DEVNULL,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE,
+                                 check=True)
+    except (OSError, subprocess.CalledProcessError) as exception:
+        raise RuntimeError("'git var' failed: {0}".format(exception))
+
+    variables = dict()
+    for line in process.stdout.decode(errors="replace").splitlines():
+        name, separator, value = line.partition("=")
+        if separator:
+            variables[name] = value
+
+    try:
+        return GitDefaults(author=variables["GIT_AUTHOR_IDENT"],
+                           committer=variables["GIT_COMMITTER_IDENT"],
+                           branch=variables.get("GIT_DEFAULT_BRANCH",
+                                                variables.get(
+                                                    "init.defaultbranch",
+                                                    "master")))
+    except KeyError as exception:
+        raise RuntimeError("'git var' did not report {0}".format(exception))
+
+
+def git_repository_init(directory: str, defaults: GitDefaults,
+                        message: str="Initial commit",
+                        paths: Optional[Iterable[str]]=None) -> str:
+    """
+    Creates a git repository in the existing 'directory' whose single commit
+    (with 'message' and the identities of 'defaults') holds every file
+    already in 'directory' but the ones ignored by its '.gitignore', and
+    returns the hexadecimal name of the commit.
+
+    If 'paths' (relative to 'directory') is given, only the files among them
+    are committed; the rest are left untracked.
+
+    The index is written as well, so the work tree is clean right away;
+    empty directories are left out, just like 'git add' does.
+
+    Raises 'FileExistsError' if 'directory' is already a git repository.
+    """
+    if not isinstance(defaults, GitDefaults):
+        raise ValueError("'defaults' argument must be of 'GitDefaults' type")
+
+    if not isinstance(message, str) or not message.strip():
+        raise ValueError("'message' argument must be a non-empty 'str'")
+
+    if not directory.endswith(os.sep):
+        directory += os.sep
+
+    git_dir = directory + ".git" + os.sep
+    os.mkdir(git_dir)
+    for sub_dir in _GIT_DIRECTORIES:
+        os.makedirs(git_dir + sub_dir)
+
+    # Objects already written by this call, so identical files (or trees)
+    # are only compressed once
+    written = set()
+    entries = list()
+    selected = None
+    if paths is not None:
+        # Every leading directory of 'paths' is walked into as well
+        selected = set()
+        for path in paths:
+            parts = os.fsencode(path.strip(os.sep)).split(
+                os.fsencode(os.sep))
+            selected.update(b"/".join(parts[:index])
+                            for index in range(1, len(parts) + 1))
+    tree = _git_tree_write(git_dir, directory, bytes(), entries, written,
+                           _git_ignore_load(directory), selected)
+    if tree is None:
+        tree = _git_object_write(git_dir, "tree", bytes(), written)
+    commit = "tree {0}\nauthor {1}\ncommitter {2}\n\n{3}\n".format(
+        tree.hex(), defaults.author, defaults.committer, message.rstrip("\n"))
+    commit = _git_object_write(git_dir, "commit", commit.encode(),
+                               written).hex()
+    ref = "refs" + os.sep + "heads" + os.sep + defaults.branch
+    reflog = "{0} {1} {2}\tcommit (initial): {3}\n".format(
+        _GIT_NULL_SHA, commit, defaults.committer,
+        message.strip().splitlines()[0])
+
+    _git_index_write(git_dir, entries)
+    with open(git_dir + "config", "w") as config_file:
+        config_file.write(_GIT_CONFIG)
+    with open(git_dir + "HEAD", "w") as head_file:
+        head_file.write("ref: refs/heads/{0}\n".format(defaults.branch))
+    os.makedirs(os.path.dirname(git_dir + ref), exist_ok=True)
+    with open(git_dir + ref, "w") as ref_file:
+        ref_file.write(commit + "\n")
+    for log in ("HEAD", ref):
+        os.makedirs(os.path.dirname(git_dir + "logs" + os.sep + log),
+                    exist_ok=True)
+        with open(git_dir + "logs" + os.sep + log, "w") as log_file:
+            log_file.write(reflog)
+
+    return commit
+
+
+def git_repositories_init(directories: Iterable[str],
+                          message: str="Initial commit",
+                          workers: Optional[int]=None,
+                          defaults: Optional[GitDefaults]=None,
+                          paths: Optional[Mapping[str, Iterable[str]]]=None
+                          ) -> List[str]:
+    """
+    Calls 'git_repository_init' for each of the 'directories' on at most
+    'workers' threads (defaults to the number of processors) and returns the
+    commit names in the same order; 'defaults' is resolved once by
+    'git_defaults_get' if not given, and the 'paths' committed in each of
+    the 'directories' are looked up in 'paths' (a mapping) if given.
+
+    Every repository is attempted; the first exception raised (in the order of
+    'directories') is raised again afterwards.
+    """
+    directories = tuple(directories)
+
+    if not directories:
+        return list()
+
+    if defaults is None:
+        defaults = git_defaults_get()
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with concurrent.futures.ThreadPoolExecutor(
+            min(workers, len(directories))) as executor:
+        futures = [executor.submit(git_repository_init, directory, defaults,
+                                   message,
+                                   None if paths is None
+                                   else paths[directory])
+                   for directory in directories]
+
+    return [future.result() for future in futures]
+
+
+def _git_ignore_load(directory: str) -> list:
+    """
+    Returns the rules of the '.gitignore' directly under 'directory' as a
+    list of (compiled pattern, whether it is negated, whether it only matches
+    directories), in the order given; the list is empty if there is no such
+    file.
+
+    The patterns are matched against paths relative to 'directory' with "/"
+    as the separator: the ones without a "/" (other than a trailing one)
+    match the name at any level, the others the whole path.
+    """
+    rules = list()
+
+    try:
+        with open(directory + ".gitignore", "r", encoding="utf-8",
+                  errors="surrogateescape") as ignore_file:
+            lines = ignore_file.read().splitlines()
+    except (FileNotFoundError, NotADirectoryError):
+        return rules
+
+    for line in lines:
+        if line.endswith("\\ "):
+            line = line.rstrip(" ") + " "
+        else:
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\"):
+            # Escaped leading '#' or '!'
+            line = line[1:]
+        directory_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        if "/" in line:
+            pattern = _git_ignore_translate(line.lstrip("/"))
+        else:
+            pattern = "(?:.*/)?" + _git_ignore_translate(line)
+        rules.append((re.compile(pattern + r"\Z", re.DOTALL), negated,
+                      directory_only))
+
+    return rules
+
+
+def _git_ignore_match(rules: list, path: str, is_dir: bool) -> bool:
+    """
+    Determines whether 'path' (relative to the work tree, with "/" as the
+    separator) is ignored by 'rules' (see '_git_ignore_load'); the last rule
+    matching it decides.
+    """
+    ignored = False
+
+    for pattern, negated, directory_only in rules:
+        if directory_only and not is_dir:
+            continue
+        if pattern.match(path):
+            ignored = not negated
+
+    return ignored
+
+
+def _git_ignore_translate(pattern: str) -> str:
+    """
+    Returns the regular expression equivalent to the glob 'pattern' of a
+    '.gitignore' rule: "*" and "?" do not match "/", while "**" between
+    slashes matches any number of directories.
+    """
+    result = list()
+    index = 0
+
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            result.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            result.append(".*")
+            index += 2
+            continue
+        if "*" == char:
+            result.append("[^/]*")
+        elif "?" == char:
+            result.append("[^/]")
+        elif "[" == char and "]" in pattern[index + 2:]:
+            end = pattern.index("]", index + 2)
+            members = pattern[index + 1:end]
+            if members.startswith("!"):
+                members = "^" + members[1:]
+            result.append("[" + members.replace("\\", "\\\\") + "]")
+            index = end + 1
+            continue
+        elif "\\" == char and index + 1 < len(pattern):
+            index += 1
+            result.append(re.escape(pattern[index]))
+        else:
+            result.append(re.escape(char))
+        index += 1
+
+    return "".join(result)
+
+
+def _git_index_write(git_dir: str, entries: list) -> None:
+    """
+    Writes 'entries' of (path, 'os.stat_result', mode, object name) as the
+    version 2 index of the repository in 'git_dir'.
+    """
+    # Paths are compared byte-wise, with no special treatment of directories
+    entries.sort(key=lambda entry: entry[0])
+    chunks = [struct.pack(">4sLL", b"DIRC", 2, len(entries))]
+
+    for path, status, mode, name in entries:
+        fields = (int(status.st_ctime), status.st_ctime_ns % 1000000000,
+                  int(status.st_mtime), status.st_mtime_ns % 1000000000,
+                  status.st_dev, status.st_ino, mode, status.st_uid,
+                  status.st_gid, status.st_size)
+        entry = struct.pack(">10L", *(field & 0xFFFFFFFF for field in fields))
+        entry += name + struct.pack(">H", min(len(path), 0xFFF)) + path
+        # Each entry is padded with 1 to 8 NUL bytes to a multiple of 8
+        chunks.append(entry + bytes(8 - len(entry) % 8))
+
+    index = b"".join(chunks)
+    with open(git_dir + "index", "wb") as index_file:
+        index_file.write(index + hashlib.sha1(index).digest())
+
+
+def _git_object_write(git_dir: str, kind: str, data: bytes,
+                      written: set) -> bytes:
+    """
+    Writes 'data' as a loose object of 'kind' in 'git_dir' unless it is in
+    'written' already, and returns the binary name of the object.
+    """
+    data = "{0} {1}\0".format(kind, len(data)).encode() + data
+    name = hashlib.sha1(data).digest()
+
+    if name not in written:
+        written.add(name)
+        hexname = name.hex()
+        object_dir = git_dir + "objects" + os.sep + hexname[:2] + os.sep
+        os.makedirs(object_dir, exist_ok=True)
+        with open(object_dir + hexname[2:], "wb") as object_file:
+            object_file.write(zlib.compress(data, _GIT_ZLIB_LEVEL))
+
+    return name
+
+
+def _git_tree_write(git_dir: str, directory: str, prefix: bytes,
+                    entries: list, written: set, rules: list,
+                    selected: Optional[set]=None) -> Optional[bytes]:
+    """
+    Writes the blobs and trees under 'directory' (whose path relative to the
+    work tree is 'prefix') and appends the index entries of its files to
+    'entries', leaving out the paths ignored by 'rules' (see
+    '_git_ignore_load') and, if 'selected' is given, the ones not in it;
+    returns the binary name of its tree, or 'None' if it holds no file at
+    all.
+    """
+    tree = list()
+
+    with os.scandir(directory) as dir_entries:
+        dir_entries = list(dir_entries)
+
+    for dir_entry in dir_entries:
+        if not prefix and ".git" == dir_entry.name:
+            continue
+        path = prefix + os.fsencode(dir_entry.name)
+        if selected is not None and path not in selected:
+            continue
+        status = dir_entry.stat(follow_symlinks=False)
+
+        if rules and _git_ignore_match(rules, os.fsdecode(path),
+                                       stat.S_ISDIR(status.st_mode)):
+            continue
+
+        if stat.S_ISDIR(status.st_mode):
+            name = _git_tree_write(git_dir, dir_entry.path + os.sep,
+                                   path + b"/", entries, written, rules,
+                                   selected)
+            if name is not None:
+                # Trees sort as if their names ended with a slash
+                tree.append((path[len(prefix):] + b"/", b"40000", name))
+            continue
+
+        if stat.S_ISLNK(status.st_mode):
+            mode = 0o120000
+            data = os.fsencode(os.readlink(dir_entry.path))
+        elif stat.S_ISREG(status.st_mode):
+            mode = 0o100755 if status.st_mode & stat.S_IXUSR else 0o100644
+            with open(dir_entry.path, "rb") as blob_file:
+                data = blob_file.read()
+        else:
+            continue
+
+        name = _git_object_write(git_dir, "blob", data, written)
+        entries.append((path, status, mode, name))
+        tree.append((path[len(prefix):], "{0:o}".format(mode).encode(), name))
+
+    if not tree:
+        return None
+
+    tree.sort(key=lambda entry: entry[0])
+    data = b"".join(mode + b" " + path.rstrip(b"/") + b"\0" + name
+                    for path, mode, name in tree)
+
+    return _git_object_write(git_dir, "tree", data, written)
+# -------------------------------- FUNCTIONS ----------------------------------
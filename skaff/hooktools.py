@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+
+"""
+A suite of hook (external command run around the generation of projects)
+processing tools.
+
+Hooks are declared per phase:
+
+'pre_tree': before the tree of a project-directory is created
+
+'post_license': after a project-directory (with its license signed) is
+published under its final name, before its configuration files are edited
+
+'post_project': after the configuration files of a project-directory are
+edited (or the editing is skipped)
+
+'post_batch': once after all the project-directories are generated
+
+The 'post_license' and 'post_project' hooks of different projects run on a
+bounded pool of worker threads while the rest of the batch is generated;
+the hooks of a single project always run one after another, in order.
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = [
+    "HOOK_PHASES",
+    "Hook",
+    "HookResult",
+    "HookRunner",
+    "hook_async_run",
+    "hook_create",
+    "hook_format",
+    "hook_run"
+]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import asyncio
+import collections
+import collections.abc
+import concurrent.futures
+import os
+import shlex
+import subprocess
+import threading
+import time
+
+from typing import (
+    Callable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+# Phases in the order they happen during a batch
+HOOK_PHASES = ("pre_tree", "post_license", "post_project", "post_batch")
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+# 'command': tuple of the program and its arguments
+# 'timeout': seconds before the command is killed; 'None' for the default
+Hook = collections.namedtuple("Hook", ("command", "timeout"))
+# 'directory': project-directory the hook ran for; 'None' for 'post_batch'
+# 'returncode': exit status of the command; 'None' if it timed out or could
+# not be started at all
+# 'output': captured standard output and standard error (interleaved)
+# 'elapsed': wall-clock seconds spent
+HookResult = collections.namedtuple("HookResult",
+                                    ("phase", "directory", "command",
+                                     "returncode", "output", "elapsed",
+                                     "timed_out"))
+
+
+class HookRunner:
+    """
+    Runs hooks on a pool of at most 'workers' threads; the pool is only
+    started by the first 'submit', so a batch without hooks costs nothing.
+
+    Use it as a context manager: leaving the 'with' statement waits for all
+    the submitted hooks.
+    """
+    __slots__ = ("__callback", "__executor", "__futures", "__lock",
+                 "__results", "__timeout", "__workers")
+
+    def __init__(self, workers: Optional[int]=None,
+                 timeout: Optional[float]=None,
+                 callback: Optional[Callable[[HookResult], None]]=None):
+        """
+        Constructs a new 'HookRunner'; 'workers' defaults to the number of
+        processors, and 'timeout' (in seconds) applies to hooks without a
+        timeout of their own ('None' means no limit).
+
+        If 'callback' is given, it is called with the result of each hook as
+        soon as the hook finishes (one call at a time, from the thread the
+        hook ran on) instead of the result being kept for 'results_get'.
+        """
+        if callback is not None and not callable(callback):
+            raise ValueError("'callback' argument must be callable")
+
+        if workers is not None and\
+                (not isinstance(workers, int) or workers < 1):
+            raise ValueError("'workers' argument must be a positive 'int'")
+
+        if timeout is not None and\
+                (not isinstance(timeout, (int, float)) or timeout <= 0):
+            raise ValueError("'timeout' argument must be a positive number")
+
+        self.__callback = callback
+        self.__executor = None
+        self.__futures = list()
+        self.__lock = threading.Lock()
+        self.__results = list()
+        self.__timeout = timeout
+        self.__workers = workers if workers else (os.cpu_count() or 1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """
+        Waits for all the submitted hooks and stops the worker threads.
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
+        # All of them are done; only their results are kept
+        with self.__lock:
+            self.__futures = [future for future in self.__futures
+                              if not future.done()]
+
+    def results_get(self) -> List[HookResult]:
+        """
+        Waits for all the submitted hooks and returns the results of every
+        hook run so far, in the order they finished; the list is empty if
+        the results are handed to a 'callback' instead.
+        """
+        with self.__lock:
+            futures = list(self.__futures)
+        concurrent.futures.wait(futures)
+
+        with self.__lock:
+            return list(self.__results)
+
+    def run(self, hooks: Sequence[Hook], phase: str,
+            directory: Optional[str]=None,
+            environ: Optional[Mapping[str, str]]=None) -> List[HookResult]:
+        """
+        Runs 'hooks' of 'phase' for 'directory' in the calling thread and
+        returns their results; stops at the first hook that fails.
+        """
+        results = list()
+
+        for hook in hooks:
+            result = hook_run(hook, phase, directory, environ, self.__timeout)
+            results.append(result)
+            with self.__lock:
+                if self.__callback is None:
+                    self.__results.append(result)
+                else:
+                    self.__callback(result)
+            if 0 != result.returncode:
+                break
+
+        return results
+
+    def submit(self, hooks: Sequence[Hook], phase: str,
+               directory: Optional[str]=None,
+               after: Optional[concurrent.futures.Future]=None
+               ) -> Optional[concurrent.futures.Future]:
+        """
+        Schedules 'hooks' of 'phase' for 'directory' on the worker threads
+        and returns a 'Future' of the list given by 'run'; returns 'after' as
+        is if there is no hook to run.
+
+        The hooks only start after 'after' (a 'Future' previously returned
+        by 'submit', or None) completes, whether it succeeded or not, which
+        keeps the phases of a single project in order.
+        """
+        if not hooks:
+            return after
+
+        def _hooks_run():
+            # 'after' was submitted earlier, so it is already running or done
+            # by the time this one is picked up by a worker thread
+            if after is not None:
+                concurrent.futures.wait((after,))
+            return self.run(hooks, phase, directory)
+
+        # Projects may be generated (and their hooks submitted) by several
+        # threads at once
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = concurrent.futures.ThreadPoolExecutor(
+                    self.__workers)
+            future = self.__executor.submit(_hooks_run)
+            self.__futures.append(future)
+
+        return future
+# --------------------------------- CLASSES -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+async def hook_async_run(hook: Hook, phase: str,
+                         directory: Optional[str]=None,
+                         environ: Optional[Mapping[str, str]]=None,
+                         timeout: Optional[float]=None) -> HookResult:
+    """
+    Coroutine variant of 'hook_run' built on
+    'asyncio.create_subprocess_exec', so the event loop is not blocked while
+    the command runs.
+
+    The command is killed if it times out, or if the coroutine is cancelled
+    (the cancellation is propagated afterwards).
+    """
+    if phase not in HOOK_PHASES:
+        raise ValueError(("'phase' argument must be one of the following: " +
+                          ", ".join(HOOK_PHASES)))
+
+    env, cwd = _hook_environ_get(phase, directory, environ)
+
+    if hook.timeout is not None:
+        timeout = hook.timeout
+
+    returncode = None
+    timed_out = False
+    start = time.monotonic()
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *hook.command,
+            cwd=cwd,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT)
+    except OSError as exception:
+        output = str(exception).encode()
+    else:
+        try:
+            output = (await asyncio.wait_for(process.communicate(),
+                                             timeout))[0]
+            returncode = process.returncode
+        except asyncio.TimeoutError:
+            timed_out = True
+            output = bytes()
+            process.kill()
+            await process.wait()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+
+    return HookResult(phase=phase,
+                      directory=directory,
+                      command=hook.command,
+                      returncode=returncode,
+                      output=output.decode(errors="replace"),
+                      elapsed=time.monotonic() - start,
+                      timed_out=timed_out)
+
+
+def hook_create(command: Union[str, Sequence[str], Hook],
+                timeout: Optional[float]=None) -> Hook:
+    """
+    Returns a 'Hook' for 'command', which is either a 'str' split with
+    shell-like syntax, a sequence of the program and its arguments, or a
+    'Hook' (returned as is if 'timeout' is not given).
+    """
+    if isinstance(command, Hook):
+        if timeout is None:
+            timeout = command.timeout
+        command = command.command
+
+    if isinstance(command, str):
+        command = shlex.split(command)
+
+    if isinstance(command, collections.abc.Iterable):
+        command = tuple(command)
+    else:
+        raise TypeError("'command' argument must be 'str' or a sequence")
+
+    if not command or not all(isinstance(arg, str) and arg
+                              for arg in command):
+        raise ValueError(("'command' argument must contain "
+                          "non-empty 'str' type(s)"))
+
+    if timeout is not None and\
+            (not isinstance(timeout, (int, float)) or timeout <= 0):
+        raise ValueError("'timeout' argument must be a positive number")
+
+    return Hook(command, timeout)
+
+
+def hook_format(hook: Hook) -> str:
+    """
+    Returns the command of 'hook' as a single line in shell-like syntax,
+    which is understood by 'hook_create'.
+    """
+    return " ".join(shlex.quote(arg) for arg in hook.command)
+
+
+def hook_run(hook: Hook, phase: str, directory: Optional[str]=None,
+             environ: Optional[Mapping[str, str]]=None,
+             timeout: Optional[float]=None) -> HookResult:
+    """
+    Runs 'hook' of 'phase' and returns its 'HookResult'; the output is
+    captured instead of being written to the terminal.
+
+    The command runs in 'directory' if it exists (the current working
+    directory otherwise) with the environment 'environ' (defaults to
+    'os.environ') plus 'SKAFF_PHASE' and, if 'directory' is given,
+    'SKAFF_DIRECTORY'.
+    The timeout of 'hook' takes precedence over 'timeout'.
+    """
+    if phase not in HOOK_PHASES:
+        raise ValueError(("'phase' argument must be one of the following: " +
+                          ", ".join(HOOK_PHASES)))
+
+    env, cwd = _hook_environ_get(phase, directory, environ)
+
+    if hook.timeout is not None:
+        timeout = hook.timeout
+
+    returncode = None
+    timed_out = False
+    start = time.monotonic()
+
+    try:
+        process = subprocess.run(hook.command,
+                                 cwd=cwd,
+                                 env=env,
+                                 stdin=subprocess.DEVNULL,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT,
+                                 timeout=timeout)
+        returncode = process.returncode
+        output = process.stdout
+    except subprocess.TimeoutExpired as exception:
+        timed_out = True
+        output = exception.output or bytes()
+    except OSError as exception:
+        output = str(exception).encode()
+
+    return HookResult(phase=phase,
+                      directory=directory,
+                      command=hook.command,
+                      returncode=returncode,
+                      output=output.decode(errors="replace"),
+                      elapsed=time.monotonic() - start,
+                      timed_out=timed_out)
+
+
+def _hook_environ_get(phase, directory, environ):
+    """
+    Returns the environment and the working directory (None for the current
+    one) a hook of 'phase' for 'directory' runs with (see 'hook_run').
+    """
+    env = dict(os.environ if environ is None else environ)
+    env["SKAFF_PHASE"] = phase
+    cwd = None
+
+    if directory is not None:
+        env["SKAFF_DIRECTORY"] = directory
+        if os.path.isdir(directory):
+            cwd = directory
+
+    return env, cwd
+# -------------------------------- FUNCTIONS ----------------------------------
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+"""
+A suite of per-project job specification tools.
+
+A 'SkaffJob' is a frozen snapshot of everything needed to generate a single
+project-directory, taken from a 'SkaffConfig'; it holds no reference to the
+configuration, so it can be shared by threads or pickled to worker processes
+without any shared mutable state.
+
+Jobs can also be streamed from names read one at a time (such as from a
+pipe) by 'jobs_stream', with duplicates told apart by a 'DigestSet', which
+takes a fixed few bytes per name instead of the name itself.
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = [
+    "DigestSet",
+    "SkaffJob",
+    "job_check",
+    "job_create",
+    "job_directory_key",
+    "job_hooks_get",
+    "job_root_get",
+    "job_template_get",
+    "jobs_create",
+    "jobs_stream"
+]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import array
+import bisect
+import collections
+import collections.abc
+import hashlib
+import os
+
+from typing import (
+    Iterable,
+    Iterator,
+    Optional
+)
+from skaff.config import SkaffConfig
+from skaff.registry import LicenseEntry
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+# 'directory': project-directory with a trailing path separator
+# 'language', 'license', 'quiet': same as the 'SkaffConfig' attributes
+# 'license_sources': 'LicenseEntry' of the resolved license files
+# 'templates': tuple of (template, fully qualified source) pairs of the
+# enabled templates, sorted by template so they can be bisected (see
+# 'job_template_get')
+# 'authors', 'subdirectories': sorted tuples
+# 'hooks': tuple of (phase, tuple of 'Hook'(s)) pairs of the phases with hooks
+# 'stage': directory (with a trailing path separator) the project is written
+# to before it is published as 'directory', or 'None' if it is written to
+# 'directory' directly
+SkaffJob = collections.namedtuple("SkaffJob",
+                                  ("directory", "language", "license",
+                                   "license_sources", "templates", "authors",
+                                   "quiet", "subdirectories", "hooks",
+                                   "stage"))
+
+
+class DigestSet:
+    """
+    Set of 'str'(s) that only keeps a 64-bit digest of each of them, in an
+    open-addressing table of unsigned integers; it takes 12 to 24 bytes per
+    entry no matter how long the strings are, instead of the strings
+    themselves plus the overhead of a 'set'.
+
+    Two different strings with the same digest are taken as the same one;
+    the chance of that happening among a million strings is below 1 in 30
+    million.
+    """
+    __slots__ = ("__count", "__table")
+
+    def __init__(self, items: Optional[Iterable[str]]=None):
+        self.__count = 0
+        self.__table = array.array("Q", bytes(8 * 8))
+        if items is not None:
+            for item in items:
+                self.add(item)
+
+    def __contains__(self, item):
+        table = self.__table
+        mask = len(table) - 1
+        digest = DigestSet.__digest(item)
+        index = digest & mask
+
+        while table[index]:
+            if digest == table[index]:
+                return True
+            index = (index + 1) & mask
+
+        return False
+
+    def __len__(self):
+        return self.__count
+
+    def add(self, item: str) -> bool:
+        """
+        Adds 'item' to the set; returns False if it was already there, True
+        otherwise.
+        """
+        # Grows at two-thirds full, so the probe sequences stay short
+        if 3 * (self.__count + 1) > 2 * len(self.__table):
+            self.__grow()
+
+        if not DigestSet.__insert(self.__table, DigestSet.__digest(item)):
+            return False
+
+        self.__count += 1
+
+        return True
+
+    @staticmethod
+    def __digest(item):
+        """
+        Returns the (never zero, which marks empty slots) 64-bit digest of
+        'item'.
+        """
+        digest = hashlib.sha1(item.encode("utf-8", "surrogateescape"))
+        return int.from_bytes(digest.digest()[:8], "little") or 1
+
+    def __grow(self):
+        """
+        Doubles the size of the table.
+        """
+        table = array.array("Q", bytes(16 * len(self.__table)))
+
+        for digest in self.__table:
+            if digest:
+                DigestSet.__insert(table, digest)
+
+        self.__table = table
+
+    @staticmethod
+    def __insert(table, digest):
+        """
+        Inserts 'digest' into 'table'; returns False if it was already there,
+        True otherwise.
+        """
+        mask = len(table) - 1
+        index = digest & mask
+
+        while table[index]:
+            if digest == table[index]:
+                return False
+            index = (index + 1) & mask
+
+        table[index] = digest
+
+        return True
+# --------------------------------- CLASSES -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+def job_check(job: SkaffJob) -> None:
+    """
+    Checks whether 'job' is a 'SkaffJob'; raises 'ValueError' otherwise.
+    """
+    if not isinstance(job, SkaffJob):
+        raise ValueError("'job' argument must be of 'SkaffJob' type")
+
+
+def job_create(directory: str, config: SkaffConfig) -> SkaffJob:
+    """
+    Returns the 'SkaffJob' of 'directory' with every other field taken from
+    'config'; 'directory' must be tracked by 'config'.
+    """
+    return next(jobs_create(config, (directory,)))
+
+
+def job_directory_key(directory: str) -> str:
+    """
+    Returns the normalized form of 'directory', which is the same for all the
+    names referring to the same project-directory (like "./a" and "a/").
+    """
+    return os.path.normcase(os.path.normpath(directory))
+
+
+def job_hooks_get(job: SkaffJob, phase: str) -> tuple:
+    """
+    Returns the tuple of 'Hook'(s) recorded in 'job' for 'phase'; the tuple
+    is empty if there is none.
+    """
+    job_check(job)
+
+    for name, hooks in job.hooks:
+        if name == phase:
+            return hooks
+
+    return tuple()
+
+
+def job_root_get(job: SkaffJob) -> str:
+    """
+    Returns the directory the files of 'job' are written to: its 'stage' if
+    it is being staged, its 'directory' otherwise.
+    """
+    job_check(job)
+
+    return job.directory if job.stage is None else job.stage
+
+
+def job_template_get(job: SkaffJob, template: str) -> str:
+    """
+    Returns the fully qualified source of 'template' (relative to the template
+    path) recorded in 'job'; the lookup is a binary search, so it does not
+    depend on the number of templates enabled.
+
+    Raises 'FileNotFoundError' if 'template' is not enabled in 'job'.
+    """
+    job_check(job)
+
+    # '(template,)' sorts right before any pair starting with 'template'
+    index = bisect.bisect_left(job.templates, (template,))
+    if index < len(job.templates) and template == job.templates[index][0]:
+        return job.templates[index][1]
+
+    raise FileNotFoundError(("Template file '{}' not found".format(template)))
+
+
+def jobs_create(config: SkaffConfig,
+                directories: Optional[tuple]=None) -> Iterator[SkaffJob]:
+    """
+    Returns an iterator of 'SkaffJob' for each of the 'directories' (defaults
+    to all the ones in 'config'); the fields other than 'directory' are
+    resolved once and shared by all the jobs.
+
+    Raises 'ValueError' (when the iterator reaches it) if any of the
+    'directories' is not tracked by 'config'.
+    """
+    if not isinstance(config, SkaffConfig):
+        raise ValueError("'config' argument must be of 'SkaffConfig' type")
+
+    if directories is None:
+        directories = config.directories_get()
+
+    fields = _job_fields_get(config)
+
+    return (SkaffJob(directory=_job_directory_check(directory, config),
+                     **fields)
+            for directory in directories)
+
+
+def jobs_stream(config: SkaffConfig,
+                directories: Iterable[str]) -> Iterator[SkaffJob]:
+    """
+    Returns an iterator of 'SkaffJob' for each of the 'directories', which
+    are read one at a time as the iterator advances (so they may come from a
+    pipe of any length) and need not be tracked by 'config'; every other
+    field is taken from 'config' once, before any of 'directories' is read.
+
+    Each name is validated like 'SkaffConfig.directory_add' does when the
+    iterator reaches it, raising 'TypeError' or 'ValueError'; names
+    referring to the same normalized path as an earlier one are skipped,
+    which is the only state kept (in a 'DigestSet').
+    """
+    if not isinstance(config, SkaffConfig):
+        raise ValueError("'config' argument must be of 'SkaffConfig' type")
+
+    if not isinstance(directories, collections.abc.Iterable) or\
+            isinstance(directories, str):
+        raise TypeError(("'directories' argument must be an iterable "
+                         "containing 'str' type"))
+
+    fields = _job_fields_get(config)
+    seen = DigestSet()
+
+    return (SkaffJob(directory=directory, **fields)
+            for directory in map(_job_name_check, directories)
+            if seen.add(job_directory_key(directory)))
+
+
+def _job_fields_get(config: SkaffConfig) -> dict:
+    """
+    Returns the fields of the 'SkaffJob'(s) of 'config' other than
+    'directory', resolved once to be shared by all of them.
+    """
+    license_sources = LicenseEntry(*config.license_get(fullname=True))
+    templates = tuple(sorted(zip(config.templates_get(),
+                                 config.templates_get(fullname=True))))
+
+    return dict(language=config.language_get(),
+                license=config.license_get(),
+                license_sources=license_sources,
+                templates=templates,
+                authors=config.authors_get(),
+                quiet=config.quiet_get(),
+                subdirectories=config.subdirectories_get(),
+                hooks=tuple((phase, hooks) for phase, hooks
+                            in sorted(config.hooks_get().items()) if hooks),
+                stage=None)
+
+
+def _job_name_check(directory: str) -> str:
+    """
+    Returns 'directory' with a trailing path separator appended if missing;
+    raises 'TypeError' if it is not a 'str', or 'ValueError' if it is not a
+    valid name (see 'SkaffConfig.directory_add').
+    """
+    if not isinstance(directory, str):
+        raise TypeError("'directory' argument must be 'str' type")
+
+    if 0 == len(directory):
+        raise ValueError("'directory' argument must not be empty")
+
+    if not directory.isprintable():
+        raise ValueError("'directory' argument must be a valid file name")
+
+    if not directory.endswith(os.sep):
+        directory += os.sep
+
+    return directory
+
+
+def _job_directory_check(directory: str, config: SkaffConfig) -> str:
+    """
+    Returns 'directory' if it is tracked by 'config' (with a trailing path
+    separator appended if missing); raises 'ValueError' otherwise.
+    """
+    if not isinstance(directory, str):
+        raise ValueError("'directory' argument must be of 'str' type")
+
+    if not config.directory_contains(directory):
+        raise ValueError(("'directory' argument must appear in the result of "
+                          "'directories_get()' member function invocation"))
+
+    if not directory.endswith(os.sep):
+        directory += os.sep
+
+    return directory
+# -------------------------------- FUNCTIONS ----------------------------------
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+
+"""
+A suite of batch journal tools, for resuming an interrupted batch run.
+
+The journal is an append-only text file starting with 'JOURNAL_HEADER',
+followed by one event per line: the name of the event and the
+project-directory it applies to, separated by a tab (which cannot appear in
+a project-directory, see 'SkaffConfig.directory_add').
+
+'plan': the project-directory is part of the batch
+'start': its generation has started in the staging directory following the
+project-directory on the line (after another tab), if any; whatever is left
+there was left by this batch, unlike whatever is found at the
+project-directory itself, which may have been created by anyone
+'commit': the project-directory is complete
+
+A line cut short by a crash is dropped when the journal is read back.
+
+The journal is read back one line at a time, and only a 'DigestSet' of the
+committed project-directories is kept (along with the ones started but not
+committed), so resuming a batch of any size takes a few bytes per project.
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = [
+    "JOURNAL_EVENTS",
+    "JOURNAL_HEADER",
+    "Journal"
+]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import os
+import threading
+
+from skaff.jobtools import (
+    DigestSet,
+    job_directory_key
+)
+from typing import (
+    FrozenSet,
+    Iterable,
+    Optional
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+JOURNAL_EVENTS = ("plan", "start", "commit")
+JOURNAL_HEADER = "skaff-journal 1\n"
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class Journal:
+    """
+    Append-only journal of a batch run stored at 'path'; the events of each
+    project-directory are recorded by 'plan', 'start', and 'commit' (see
+    'JOURNAL_EVENTS'), which may be called by several threads at once.
+    The project-directories are looked up by their normalized form (see
+    'job_directory_key'), so any name of one refers to the same entry.
+
+    If 'resume' is True, the events already in the journal are read back
+    first (see 'committed_contains' and 'partial_get') and the new ones are
+    appended; otherwise the journal is started over.
+
+    Each event is handed to the operating system as soon as it is recorded,
+    so it survives the process being killed; if 'sync' is True, 'commit'
+    events are flushed to the disk as well.
+
+    Can be used as a context manager, which closes the journal on exit.
+    """
+    __slots__ = ("__committed", "__file", "__lock", "__path", "__started",
+                 "__sync")
+
+    def __init__(self, path: str, resume: bool=False, sync: bool=False):
+        if not isinstance(path, str) or not path:
+            raise ValueError("'path' argument must be a non-empty 'str'")
+
+        self.__path = path
+        self.__committed = DigestSet()
+        self.__lock = threading.Lock()
+        # Staging directories (or None) of the project-directories started
+        # but not committed
+        self.__started = dict()
+        self.__sync = sync
+
+        if resume and os.path.isfile(path):
+            self.__read()
+            self.__file = open(path, "a", encoding="utf-8")
+        else:
+            self.__file = open(path, "w", encoding="utf-8")
+            self.__file.write(JOURNAL_HEADER)
+            self.__file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """
+        Closes the journal; recording any further event raises 'ValueError'.
+        """
+        self.__file.close()
+
+    def commit(self, directory: str) -> None:
+        """
+        Records that the generation of 'directory' is complete.
+        """
+        self.__record("commit", (directory,))
+
+    def committed_contains(self, directory: str) -> bool:
+        """
+        Determines whether 'directory' is committed so far, including the
+        commits read back from the journal.
+        """
+        with self.__lock:
+            return job_directory_key(directory) in self.__committed
+
+    def partial_contains(self, directory: str) -> bool:
+        """
+        Determines whether 'directory' is started but not committed so far,
+        including the events read back from the journal.
+        """
+        with self.__lock:
+            return job_directory_key(directory) in self.__started
+
+    def partial_get(self) -> FrozenSet[str]:
+        """
+        Returns the normalized project-directories (see 'job_directory_key')
+        started but not committed so far, including the ones read back from
+        the journal.
+        """
+        with self.__lock:
+            return frozenset(self.__started)
+
+    def path_get(self) -> str:
+        """
+        Returns the path of the journal.
+        """
+        return self.__path
+
+    def plan(self, directories: Iterable[str]) -> None:
+        """
+        Records that 'directories' are part of the batch.
+        """
+        self.__record("plan", directories)
+
+    def stage_get(self, directory: str) -> Optional[str]:
+        """
+        Returns the staging directory recorded by the last 'start' of
+        'directory' if it is not committed since, or None otherwise.
+        """
+        with self.__lock:
+            return self.__started.get(job_directory_key(directory))
+
+    def start(self, directory: str, stage: Optional[str]=None) -> None:
+        """
+        Records that the generation of 'directory' has started in 'stage' (as
+        returned by 'stage_create') if given; 'directory' must not exist at
+        this point. 'stage' is left out if it cannot be told apart from the
+        rest of the line (because of a tab or a line break in it).
+        """
+        if stage is not None and not stage.isprintable():
+            stage = None
+
+        self.__record("start", (directory,), stage)
+
+    def __read(self):
+        """
+        Reads back the events recorded in the journal and cuts off its last
+        line if it is cut short, so the new events start on a line of their
+        own; raises 'ValueError' if the file is not a journal.
+        """
+        with open(self.__path, "rb") as journal_file:
+            if JOURNAL_HEADER.encode() != journal_file.readline():
+                raise ValueError("'{0}' is not a skaff journal".format(
+                    self.__path))
+            end = journal_file.tell()
+            for line in journal_file:
+                if not line.endswith(b"\n"):
+                    break
+                end += len(line)
+                event, _, directory = line[:-1].decode("utf-8").partition(
+                    "\t")
+                if "start" == event:
+                    directory, _, stage = directory.partition("\t")
+                    self.__started[job_directory_key(directory)] = (stage or
+                                                                   None)
+                elif "commit" == event:
+                    key = job_directory_key(directory)
+                    self.__started.pop(key, None)
+                    self.__committed.add(key)
+
+        if end < os.path.getsize(self.__path):
+            os.truncate(self.__path, end)
+
+    def __record(self, event, directories, stage=None):
+        """
+        Appends 'event' of each of 'directories' (followed by 'stage' if
+        given) to the journal.
+        """
+        directories = tuple(directories)
+        suffix = "\n" if stage is None else "\t" + stage + "\n"
+        lines = "".join("{0}\t{1}{2}".format(event, directory, suffix)
+                        for directory in directories)
+
+        with self.__lock:
+            self.__file.write(lines)
+            self.__file.flush()
+            if self.__sync and "commit" == event:
+                os.fsync(self.__file.fileno())
+            if "start" == event:
+                self.__started.update(dict.fromkeys(
+                    map(job_directory_key, directories), stage))
+            elif "commit" == event:
+                for key in map(job_directory_key, directories):
+                    self.__started.pop(key, None)
+                    self.__committed.add(key)
+# --------------------------------- CLASSES -----------------------------------
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+
+"""
+A suite of project-directory layout tools.
+
+The layout of a project-directory is the single list of every directory and
+file it is made of (each directory ahead of everything in it), which both
+the drivers (through 'layout_write') and the generation plans (see
+'plan_create') are built from; it only depends on a few fields of a job, so
+it is computed once for all the jobs sharing them.
+
+Each entry of the layout is written by one of the 'LAYOUT_OPS':
+
+'mkdir': the directory is created
+'copy': the file is copied from its source as is
+'render': the file is written from its source (if any) with the details of
+the project filled in
+
+and belongs to one of the 'LAYOUT_STEPS', which are written one at a time
+('tree' first, as it creates the directories of all the others):
+
+'tree': the subdirectories
+'license': 'LICENSE.txt'
+'conf': 'CMakeLists.txt' and the other configuration files
+'doc': 'README.md' and 'CHANGELOG.md'
+'doxyfile': 'Doxyfile', rendered by 'doxygen' if it is found, or copied from
+its template otherwise
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = [
+    "CHANGELOG_FILE",
+    "CMAKE_FILE",
+    "CONF_FILES",
+    "DOXYFILE",
+    "INCLUDE_DIR",
+    "LAYOUT_OPS",
+    "LAYOUT_STEPS",
+    "LICENSE_FILE",
+    "README_FILE",
+    "SIGNED_LICENSES",
+    "TRAVIS_FILE",
+    "LayoutEntry",
+    "doxyfile_rewrite",
+    "doxygen_found",
+    "layout_get",
+    "layout_paths_get",
+    "layout_write",
+    "template_path_get",
+    "tree_plan_get"
+]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import collections
+import functools
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+
+from datetime import datetime
+from distutils import spawn
+from skaff.jobtools import (
+    SkaffJob,
+    job_check,
+    job_root_get,
+    job_template_get
+)
+from typing import (
+    Optional,
+    Tuple
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+# Names of the files at the root of a project-directory
+CHANGELOG_FILE = "CHANGELOG.md"
+CMAKE_FILE = "CMakeLists.txt"
+DOXYFILE = "Doxyfile"
+LICENSE_FILE = "LICENSE.txt"
+README_FILE = "README.md"
+# Configuration files copied from the "<name>.txt" templates as ".<name>"
+CONF_FILES = ("editorconfig", "gdbinit", "gitattributes", "gitignore")
+# Configuration file rendered from the template of the same name as ".<name>"
+TRAVIS_FILE = "travis.yml"
+# Subdirectory holding the directory named after the project
+INCLUDE_DIR = "include"
+# Licenses signed by the authors (see 'layout_write')
+SIGNED_LICENSES = frozenset(("bsd2", "bsd3", "mit"))
+LAYOUT_OPS = ("mkdir", "copy", "render")
+LAYOUT_STEPS = ("tree", "license", "conf", "doc", "doxyfile")
+# Number of distinct layouts (and subdirectory creation orders) kept; a
+# batch usually shares a single one
+_LAYOUT_CACHE_SIZE = 32
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+# 'op': one of the 'LAYOUT_OPS'
+# 'parent': index of the 'mkdir' entry it is in, or -1 for the root
+# 'name': name of the entry, or None for the directory named after the
+# project
+# 'source': path of the file the entry is made from, or None
+# 'step': one of the 'LAYOUT_STEPS'
+LayoutEntry = collections.namedtuple("LayoutEntry",
+                                     ("op", "parent", "name", "source",
+                                      "step"))
+# --------------------------------- CLASSES -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+def doxyfile_rewrite(job: SkaffJob) -> None:
+    """
+    Rewrites the options of the 'Doxyfile' generated by 'doxygen -g' within
+    the root of 'job' (see 'job_root_get').
+    """
+    directory = job_root_get(job)
+
+    with tempfile.TemporaryFile("w+") as tmp_file:
+        with open(directory + DOXYFILE, "r+") as output_file:
+            for line in output_file:
+                match = _doxyfile_attr_match(job.directory, line)
+                tmp_file.write(line if not match else match)
+            tmp_file.seek(0)
+            output_file.seek(0)
+            output_file.truncate()
+            shutil.copyfileobj(tmp_file, output_file)
+
+
+def doxygen_found() -> bool:
+    """
+    Determines whether 'Doxyfile' is rendered by 'doxygen' rather than copied
+    from its template; looks through 'PATH' on each call, so callers look it
+    up once per batch.
+    """
+    return bool(spawn.find_executable("doxygen"))
+
+
+def layout_get(job: SkaffJob, doxygen: bool) -> Tuple[LayoutEntry, ...]:
+    """
+    Returns the entries (see 'LayoutEntry') of the project-directory of 'job'
+    other than its root given whether 'doxygen' is found: the directories
+    first, each after its parent, then the files.
+
+    Raises 'ValueError' if the 'subdirectories' of 'job' lead out of the
+    project-directory.
+    """
+    job_check(job)
+
+    # Only the fields the layout depends on are part of the cache key
+    return _layout_get(job._replace(directory=None, authors=None,
+                                    quiet=None, hooks=None, stage=None),
+                       bool(doxygen))
+
+
+def layout_paths_get(job: SkaffJob,
+                     layout: Tuple[LayoutEntry, ...]) -> Tuple[str, ...]:
+    """
+    Returns the path of each entry of 'layout' (see 'layout_get') relative to
+    the project-directory of 'job', with a trailing path separator for the
+    directories.
+    """
+    job_check(job)
+    project_name = os.path.basename(job.directory[:-1])
+    paths = list()
+
+    for entry in layout:
+        path = project_name if entry.name is None else entry.name
+        if -1 != entry.parent:
+            path = paths[entry.parent] + path
+        if "mkdir" == entry.op:
+            path += os.sep
+        paths.append(path)
+
+    return tuple(paths)
+
+
+def layout_write(job: SkaffJob, step: str,
+                 doxygen: Optional[bool]=None) -> None:
+    """
+    Writes the entries of 'step' (one of the 'LAYOUT_STEPS') of the layout of
+    'job' given whether 'doxygen' is found (looked up if not given) into the
+    root of 'job' (see 'job_root_get').
+
+    The 'tree' step creates the root as well and fails if it already exists;
+    the files of the other steps within a subdirectory are only written if
+    it exists. Raises 'FileNotFoundError' if the template of a file is not
+    enabled in 'job'.
+    """
+    if step not in LAYOUT_STEPS:
+        raise ValueError(("'step' argument must be one of the following: " +
+                          ", ".join(LAYOUT_STEPS)))
+
+    if doxygen is None:
+        # Only the 'doxyfile' step depends on it
+        doxygen = "doxyfile" == step and doxygen_found()
+
+    base_dir = job_root_get(job)
+    layout = layout_get(job, doxygen)
+    paths = layout_paths_get(job, layout)
+
+    if "tree" == step:
+        os.makedirs(base_dir)
+        sub_dirs = [path[:-1] for path, entry in zip(paths, layout)
+                    if step == entry.step]
+        if os.mkdir in os.supports_dir_fd:
+            # Each subdirectory is created by a single 'mkdir' relative to
+            # the project-directory instead of resolving (and checking) every
+            # parent of it again from the root, which costs a round trip each
+            # on NFS
+            base_fd = os.open(base_dir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                for sub_dir in sub_dirs:
+                    os.mkdir(sub_dir, dir_fd=base_fd)
+            finally:
+                os.close(base_fd)
+        else:
+            for sub_dir in sub_dirs:
+                os.mkdir(base_dir + sub_dir)
+        return
+
+    for path, entry in zip(paths, layout):
+        if step != entry.step:
+            continue
+        if -1 != entry.parent and\
+                not os.path.isdir(base_dir + paths[entry.parent]):
+            continue
+        if entry.source is None and\
+                ("copy" == entry.op or "." + TRAVIS_FILE == entry.name):
+            raise FileNotFoundError(("Template file of '{}' "
+                                     "not found").format(path))
+        if "copy" == entry.op:
+            shutil.copy(entry.source, base_dir + path)
+        else:
+            _entry_render(job, entry, base_dir + path)
+
+
+def template_path_get(job: SkaffJob, template: str) -> Optional[str]:
+    """
+    Returns the fully qualified source of 'template' in 'job', or None if it
+    is not enabled (see 'job_template_get').
+    """
+    try:
+        return job_template_get(job, template)
+    except FileNotFoundError:
+        return None
+
+
+@functools.lru_cache(maxsize=_LAYOUT_CACHE_SIZE)
+def tree_plan_get(subdirectories: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Returns the relative paths of all the directories needed to create
+    'subdirectories' (including parents not listed on their own, like "a"
+    of "a/b") in an order where each parent comes before its children, with
+    duplicates (like "a" and "a/") removed.
+
+    Raises 'ValueError' if any of 'subdirectories' leads out of the
+    project-directory.
+    """
+    plan = dict()
+
+    for sub_dir in subdirectories:
+        sub_dir = os.path.normpath(sub_dir)
+        if os.path.isabs(sub_dir) or os.pardir in sub_dir.split(os.sep):
+            raise ValueError(("'{0}' is not within the "
+                              "project-directory").format(sub_dir))
+        if os.curdir == sub_dir:
+            continue
+        parts = sub_dir.split(os.sep)
+        for index in range(1, len(parts) + 1):
+            plan.setdefault(os.sep.join(parts[:index]), index)
+
+    # Sorting by depth keeps every parent ahead of its children
+    return tuple(sorted(plan, key=lambda path: (plan[path], path)))
+
+
+def _doxyfile_attr_match(project_name, line):
+    """
+    Determines whether there is any 'Doxyfile' options available in 'line'.
+
+    Return the updated version if 'line' contains options that need to be
+    changed; otherwise return None.
+    """
+    arguments = (project_name, line)
+
+    if not all(argument for argument in arguments):
+        raise ValueError(("Both 'project_name' and 'line' "
+                         "have to be non-empty 'str' type"))
+
+    if not all(isinstance(argument, str) for argument in arguments):
+        raise ValueError(("Both 'project_name' and 'line' "
+                         "have to be of 'str' type"))
+
+    # Gets rid of the trailing separator character
+    if project_name.endswith(os.sep):
+        project_name = project_name[:-1]
+
+    # Tests whether the length of 'project_name' become 0 after truncation
+    if not project_name:
+        raise ValueError("'project_name' cannot be a single slash character")
+
+    attr_dict = {"PROJECT_NAME": "\"" + project_name.title() + "\"",
+                 "OUTPUT_DIRECTORY": "." + os.sep + "doc",
+                 "TAB_SIZE": 8,
+                 "EXTRACT_ALL": "YES",
+                 "EXTRACT_STATIC": "YES",
+                 "RECURSIVE": "YES",
+                 "EXCLUDE": "build",
+                 "HAVE_DOT": "YES",
+                 "UML_LOOK": "YES",
+                 "TEMPLATE_RELATIONS": "YES",
+                 "CALL_GRAPH": "YES",
+                 "DOT_IMAGE_FORMAT": "svg",
+                 "INTERACTIVE_SVG": "YES"}
+    line = line.lstrip()
+
+    # If the line is solely composed of whitespace or is a comment
+    if not line or line.startswith("#"):
+        return None
+
+    for attr in attr_dict:
+        # '\s' stands for whitespace characters
+        match = re.match(R"\s*" + attr + R"\s*=", line)
+        if match:
+            split_index = match.string.find("=") + 1
+            return match.string[:split_index] + " " +\
+                str(attr_dict[attr]) + "\n"
+
+    return None
+
+
+def _entry_render(job, entry, target):
+    """
+    Writes the 'render' 'entry' (see 'LayoutEntry') of 'job' to 'target'.
+    """
+    project_name = job.directory[:-1]
+
+    if DOXYFILE == entry.name:
+        # Redirects the terminal output of 'doxygen' to null device
+        with open(os.devnull, "w") as null_device:
+            subprocess.call(["doxygen", "-g", target], stdout=null_device)
+        doxyfile_rewrite(job)
+        return
+
+    if CHANGELOG_FILE == entry.name:
+        header = (
+            "# Change Log\n"
+            "This document records all notable changes to {0}.  \n"
+            "This project adheres to [Semantic Versioning]"
+            "(http://semver.org/).\n"
+            "\n## 0.1 (Upcoming)\n"
+            "* New feature here\n"
+        ).format(project_name.title())
+    elif LICENSE_FILE == entry.name:
+        header = "Copyright (c) {year}, {authors}\n".format(
+            year=datetime.now().year,
+            authors=", ".join(job.authors)
+        )
+    elif README_FILE == entry.name:
+        header = (
+            "![{0}](misc{1}img{1}banner.png)\n"
+            "\n## Overview\n"
+            "\n## License\n"
+            "Copyright © {year} {authors}\n"
+        ).format(project_name, os.sep, year=datetime.now().year,
+                 authors=", ".join(job.authors))
+    else:
+        # The configuration file of 'TRAVIS_FILE'
+        header = "language: {0}\n".format(job.language)
+
+    with open(target, "w", encoding="utf-8") as target_file:
+        target_file.write(header)
+        if entry.source is not None:
+            with open(entry.source, "r", encoding="utf-8") as source_file:
+                target_file.write(source_file.read())
+
+
+@functools.lru_cache(maxsize=_LAYOUT_CACHE_SIZE)
+def _layout_get(job, doxygen):
+    """
+    Returns the layout of 'job' (see 'layout_get'), the fields of which other
+    than the ones the layout depends on are None.
+    """
+    layout = list()
+    # Entries of the directories within the project, by relative path
+    directories = {str(): -1}
+    sub_dirs = tree_plan_get(job.subdirectories)
+
+    if INCLUDE_DIR not in sub_dirs:
+        sub_dirs += (INCLUDE_DIR,)
+
+    for sub_dir in sub_dirs:
+        parent, _, name = sub_dir.rpartition(os.sep)
+        layout.append(LayoutEntry("mkdir", directories[parent], name, None,
+                                  "tree"))
+        directories[sub_dir] = len(layout) - 1
+    layout.append(LayoutEntry("mkdir", directories[INCLUDE_DIR], None, None,
+                              "tree"))
+
+    layout.append(LayoutEntry("render" if job.license in SIGNED_LICENSES
+                              else "copy", -1, LICENSE_FILE,
+                              job.license_sources.text, "license"))
+
+    cmake_source_prefix = job.language + os.sep
+    layout.append(LayoutEntry("copy", -1, CMAKE_FILE,
+                              template_path_get(job, cmake_source_prefix +
+                                                CMAKE_FILE), "conf"))
+    if "src" in directories:
+        for source_file in (CMAKE_FILE, "main." + job.language):
+            layout.append(LayoutEntry(
+                "copy", directories["src"], source_file,
+                template_path_get(job, cmake_source_prefix + "src" +
+                                  os.sep + source_file), "conf"))
+    for configuration in CONF_FILES:
+        layout.append(LayoutEntry("copy", -1, "." + configuration,
+                                  template_path_get(job,
+                                                    configuration + ".txt"),
+                                  "conf"))
+    layout.append(LayoutEntry("render", -1, "." + TRAVIS_FILE,
+                              template_path_get(job, TRAVIS_FILE), "conf"))
+
+    layout.append(LayoutEntry("render", -1, README_FILE,
+                              job.license_sources.markdown, "doc"))
+    layout.append(LayoutEntry("render", -1, CHANGELOG_FILE, None, "doc"))
+
+    if doxygen:
+        layout.append(LayoutEntry("render", -1, DOXYFILE, None, "doxyfile"))
+    else:
+        layout.append(LayoutEntry("copy", -1, DOXYFILE,
+                                  template_path_get(job, DOXYFILE),
+                                  "doxyfile"))
+
+    return tuple(layout)
+# -------------------------------- FUNCTIONS ----------------------------------
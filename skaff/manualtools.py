@@ -7,28 +7,46 @@ A suite of manual-page processing tools.
 # ------------------------------- MODULE INFO ---------------------------------
 __all__ = [
     "manual_check",
+    "manual_compress",
+    "manuals_compress",
+    "manuals_index",
     "manuals_install",
     "manuals_probe",
+    "manpath_resolve",
     "manpath_select"
 ]
 # ------------------------------- MODULE INFO ---------------------------------
 
 # --------------------------------- MODULES -----------------------------------
+import collections
+import concurrent.futures
 import gzip
+import hashlib
+import io
 import os
 import shutil
 import subprocess
 import sys
 
-from filecmp import dircmp
-from tempfile import TemporaryDirectory
 from typing import (
     List,
+    Optional,
     Union
 )
 # --------------------------------- MODULES -----------------------------------
 
 
+# ------------------------------- CONSTANTS -----------------------------------
+# Time stamp recorded in the header of every gzipped manual page; a fixed one
+# makes the output depend on the content of the manual page only
+_GZIP_MTIME = 0
+# man-db configuration files, in the order they are tried
+_MANPATH_CONFIG_FILES = ("/etc/manpath.config", "/etc/man_db.conf")
+# Resolved manual page search paths keyed by the value of 'MANPATH'
+_manpath_cache = dict()
+# ------------------------------- CONSTANTS -----------------------------------
+
+
 # -------------------------------- FUNCTIONS ----------------------------------
 def manual_check(manual: str) -> bool:
     """
@@ -59,7 +77,89 @@ def manual_check(manual: str) -> bool:
         return False
 
 
-def manuals_install(directory: str, rebuild: bool=True, *manuals: str) -> None:
+def manual_compress(manual: str, target: Optional[str]=None) -> str:
+    """
+    Gzips 'manual' to 'target' (defaults to 'manual' with an extra '.gz'
+    suffix) and returns 'target'.
+
+    The output is reproducible: the time stamp in the gzip header is fixed and
+    the file name recorded in it is the basename of 'manual', so the same
+    manual page always yields the same bytes.
+    """
+    if target is None:
+        target = manual + ".gz"
+
+    with open(target, "wb") as output_file:
+        output_file.write(_manual_gzip(manual))
+
+    return target
+
+
+def manuals_compress(*manuals: str, workers: Optional[int]=None) -> List[str]:
+    """
+    Pre-compresses each manual page in 'manuals' to the same path with an
+    extra '.gz' suffix (for example, 'man/skaff.1' to 'man/skaff.1.gz') and
+    returns the list of gzipped manual pages.
+
+    This is meant to be done once at build time: 'manuals_install' copies an
+    up-to-date pre-compressed manual page as is instead of gzipping it again.
+    Manual pages whose pre-compressed counterpart is already up-to-date are
+    skipped; the rest are gzipped by at most 'workers' processes (defaults to
+    the number of processors).
+    """
+    for manual in manuals:
+        _manual_validate(manual)
+
+    _manuals_map(manual_compress,
+                 [(manual, manual + ".gz") for manual in manuals
+                  if not _manual_precompressed(manual)],
+                 workers)
+
+    return [manual + ".gz" for manual in manuals]
+
+
+def manuals_index(*manuals: str,
+                  background: bool=False) -> Optional[subprocess.Popen]:
+    """
+    Updates the entries of the installed (gzipped) manual page(s) in
+    'manuals' in the manual page index cache by invoking 'mandb -f' on each
+    of them, instead of rebuilding the index of every manual on the system.
+
+    If 'background' is set to True, returns the 'subprocess.Popen' of the
+    updates running in a new session without waiting for them (their
+    failures are not reported); otherwise raises 'RuntimeError' if any of
+    them fails and returns None.
+    """
+    if 0 == len(manuals):
+        return None
+
+    if background:
+        # A single shell runs the updates one after another so that they do
+        # not compete for the lock of the index database
+        with open(os.devnull, "w") as dump:
+            return subprocess.Popen(
+                ["sh", "-c", "for manual; do mandb -q -f \"$manual\"; done",
+                 "sh"] + list(manuals),
+                stdin=subprocess.DEVNULL, stdout=dump, stderr=dump,
+                start_new_session=True)
+
+    with open(os.devnull, "w") as dump:
+        for manual in manuals:
+            try:
+                return_code = subprocess.call(["mandb", "-q", "-f", manual],
+                                              stdout=dump, stderr=dump)
+            except OSError:
+                return_code = None
+
+            if 0 != return_code:
+                raise RuntimeError("'mandb' program does not exit properly")
+
+    return None
+
+
+def manuals_install(directory: str, rebuild: bool=True, *manuals: str,
+                    workers: Optional[int]=None,
+                    background: bool=False) -> List[str]:
     """
     Installs the gzipped manual page(s) in 'manuals' to the subdirectory of
     'directory' that ends with an extra manual section number if it exists;
@@ -67,8 +167,16 @@ def manuals_install(directory: str, rebuild: bool=True, *manuals: str) -> None:
     and a subdirectory '/usr/share/man/man1/' exists, it will be installed to
     that subdirectory instead; otherwise falls back to '/usr/share/man/'.
 
-    If 'rebuild' is set to True, also invokes the 'mandb' program to rebuild
-    the manual page index cache.
+    Manual pages pre-compressed by 'manuals_compress' are copied as is; the
+    others are gzipped by at most 'workers' processes (defaults to the number
+    of processors).
+    Installed manual pages identical (by content hash) to the ones about to
+    be installed are left untouched; returns the list of the gzipped manual
+    pages actually (re)written.
+
+    If 'rebuild' is set to True, also updates the manual page index cache for
+    the (re)written manual pages only (see 'manuals_index'); the update runs
+    in the background if 'background' is set to True.
 
     If '--record' flag exists in sys.argv, writes the list of installed manual
     pages to the file following the '--record' flag (setuptools compatibility).
@@ -80,7 +188,7 @@ def manuals_install(directory: str, rebuild: bool=True, *manuals: str) -> None:
     'manuals' must already exist.
     """
     if 0 == len(manuals):
-        return
+        return list()
 
     if not directory.endswith(os.sep):
         directory += os.sep
@@ -95,20 +203,88 @@ def manuals_install(directory: str, rebuild: bool=True, *manuals: str) -> None:
 
     if "--record" in sys.argv:
         with open(sys.argv[sys.argv.index("--record") + 1], "a") as log_output:
-            _manuals_copy(directory, log_output, *manuals)
+            changed = _manuals_copy(directory, log_output, *manuals,
+                                    workers=workers)
     else:
-        _manuals_copy(directory, None, *manuals)
+        changed = _manuals_copy(directory, None, *manuals, workers=workers)
 
     if rebuild:
-        # Finally rebuild the manual page index cache
-        with open(os.devnull, "w") as dump:
-            return_code = subprocess.call(["mandb"], stdout=dump, stderr=dump)
+        # Finally update the manual page index cache
+        manuals_index(*changed, background=background)
+
+    return changed
+
+
+def _manual_gzip(manual):
+    """
+    Returns the content of 'manual' gzipped with a fixed time stamp and its
+    basename as the recorded file name (see 'manual_compress').
+    """
+    buffer = io.BytesIO()
+
+    with open(manual, "rb") as input_manpage:
+        with gzip.GzipFile(filename=os.path.basename(manual),
+                           mode="wb",
+                           fileobj=buffer,
+                           mtime=_GZIP_MTIME) as output_manpage:
+            shutil.copyfileobj(input_manpage, output_manpage)
+
+    return buffer.getvalue()
+
+
+def _manual_install(manual, target):
+    """
+    Writes the gzipped 'manual' (the pre-compressed one if it is up-to-date)
+    to 'target' unless 'target' already has the same content; returns True if
+    'target' is (re)written, False otherwise.
+    """
+    if _manual_precompressed(manual):
+        with open(manual + ".gz", "rb") as gzip_file:
+            content = gzip_file.read()
+    else:
+        content = _manual_gzip(manual)
+
+    try:
+        if os.stat(target).st_size == len(content):
+            with open(target, "rb") as target_file:
+                if hashlib.sha256(target_file.read()).digest() ==\
+                        hashlib.sha256(content).digest():
+                    return False
+    except FileNotFoundError:
+        pass
+
+    with open(target, "wb") as target_file:
+        target_file.write(content)
 
-        if 0 != return_code:
-            raise RuntimeError("'mandb' program does not exit properly")
+    return True
 
 
-def _manuals_copy(directory, log=None, *manuals):
+def _manual_precompressed(manual):
+    """
+    Checks whether 'manual' has a pre-compressed counterpart (with an extra
+    '.gz' suffix) that is not older than 'manual' itself.
+    """
+    try:
+        return (os.stat(manual + ".gz").st_mtime_ns >=
+                os.stat(manual).st_mtime_ns)
+    except FileNotFoundError:
+        return False
+
+
+def _manual_validate(manual):
+    """
+    Raises 'TypeError' if 'manual' is not in unix 'manpage' format, or
+    'FileNotFoundError' if it does not exist.
+    """
+    if not manual_check(manual):
+        raise TypeError(("The manual page {0} ".format(manual) +
+                         "is not in unix 'manpage' format"))
+    if not os.path.isfile(manual):
+        raise FileNotFoundError(("The manual page {0} ".format(manual) +
+                                 "does not exist"))
+
+
+def _manuals_copy(directory, log=None, *manuals, workers=None):
     """
     Copies the gzipped manual page(s) in 'manuals' to the subdirectory of
     'directory' that ends with an extra manual section number if it exists;
@@ -118,16 +294,14 @@ def _manuals_copy(directory, log=None, *manuals):
 
     Also invokes the 'write' method of 'log' to append the file names of
     gzipped manual page(s) copied if 'log' is not None.
+
+    Returns the list of the gzipped manual page(s) actually (re)written.
     """
-    # Based on example from
-    # https://docs.python.org/3/library/gzip.html
+    # Pairs of (manual, target) to be installed
+    pending = list()
+
     for manual in manuals:
-        if not manual_check(manual):
-            raise TypeError(("The manual page {0} ".format(manual) +
-                             "is not in unix 'manpage' format"))
-        if not os.path.isfile(manual):
-            raise FileNotFoundError(("The manual page {0} ".format(manual) +
-                                     "does not exist"))
+        _manual_validate(manual)
 
         # Test whether there exists extra manual subdirectory ends with
         # manual section number; for example,
@@ -142,12 +316,34 @@ def _manuals_copy(directory, log=None, *manuals):
         else:
             target_manpage = directory + os.path.basename(manual) + ".gz"
 
-        with open(manual, "rb") as input_manpage:
-            with gzip.open(target_manpage, "wb") as output_manpage:
-                shutil.copyfileobj(input_manpage, output_manpage)
-        if log:
+        pending.append((manual, target_manpage))
+
+    changed = _manuals_map(_manual_install, pending, workers)
+
+    if log:
+        for manual, target_manpage in pending:
             log.write(target_manpage)
 
+    return [target_manpage for (manual, target_manpage), written
+            in zip(pending, changed) if written]
+
+
+def _manuals_map(function, pending, workers=None):
+    """
+    Calls 'function' with each (manual, target) pair in 'pending' and returns
+    the list of results; more than one of them are spread over at most
+    'workers' processes (defaults to the number of processors).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if 1 >= min(len(pending), workers):
+        return [function(manual, target) for manual, target in pending]
+
+    with concurrent.futures.ProcessPoolExecutor(
+            min(len(pending), workers)) as executor:
+        return list(executor.map(function, *zip(*pending)))
+
 
 def manuals_probe(*directories: str) -> List[str]:
     """
@@ -182,37 +378,109 @@ def manuals_probe(*directories: str) -> List[str]:
     return sorted(result_manuals)
 
 
+def manpath_resolve() -> List[str]:
+    """
+    Returns the list of manual page search paths, each with a
+    platform-dependent path separator appended; the result is cached for the
+    lifetime of the process (per value of the 'MANPATH' environment variable).
+
+    The paths come from the 'MANPATH' environment variable if it is set; an
+    empty component in it (e.g. a leading or trailing colon) stands for the
+    system paths, which are read from the 'MANDATORY_MANPATH' and
+    'MANPATH_MAP' entries of '/etc/manpath.config' (or '/etc/man_db.conf').
+    The 'manpath' program is only run if none of them is available.
+    """
+    environ_manpath = os.environ.get("MANPATH")
+
+    if environ_manpath not in _manpath_cache:
+        if environ_manpath:
+            paths = list()
+            for path in environ_manpath.split(os.pathsep):
+                paths.extend([path] if path else _manpath_system_get())
+        else:
+            paths = _manpath_system_get()
+
+        # Keep the first occurrence of each path only
+        paths = (path if path.endswith(os.sep) else path + os.sep
+                 for path in paths)
+        _manpath_cache[environ_manpath] = tuple(
+            collections.OrderedDict.fromkeys(paths))
+
+    return list(_manpath_cache[environ_manpath])
+
+
 def manpath_select(select: bool=True) -> Union[str, List[str]]:
     """
-    Parses the output of the 'manpath' program and returns one of its non-empty
-    results (non-empty directory) if 'select' is set to True; otherwise returns
-    all the results un-altered.
+    Returns the first non-empty directory of the manual page search paths
+    given by 'manpath_resolve' if 'select' is set to True; otherwise returns
+    all of them un-altered.
 
     NOTE: A platform-dependent path separator will be appended to the result.
     """
-    paths = None
-    result_manpath = None
-
-    with os.popen("manpath") as proc, TemporaryDirectory() as tmpdir:
-        paths = proc.read().strip().split(os.pathsep)
-        if select:
-            for candidate in paths:
-                # "Elect" the candidate directory with "rich" non-empty status
-                if dircmp(candidate, tmpdir).left_only:
-                    result_manpath = candidate
-                    break
+    paths = manpath_resolve()
 
     if not paths:
-        raise RuntimeError("Output of the 'manpath' program cannot be parsed")
+        raise RuntimeError("Manual page search paths cannot be determined")
 
-    if select and not result_manpath:
-        raise RuntimeError("All the directories in 'manpath' is empty")
+    if not select:
+        return paths
 
-    if select:
-        if result_manpath.endswith(os.sep):
-            return result_manpath
-        else:
-            return result_manpath + os.sep
-    else:
-        return [path + os.sep for path in paths if not path.endswith(os.sep)]
+    for candidate in paths:
+        # "Elect" the candidate directory with "rich" non-empty status; the
+        # first entry found is enough to tell, so nothing else is listed
+        try:
+            with os.scandir(candidate) as entries:
+                if next(entries, None) is not None:
+                    return candidate
+        except OSError:
+            continue
+
+    raise RuntimeError("All the directories in 'manpath' is empty")
+
+
+def _manpath_config_parse(config_file):
+    """
+    Returns the list of directories named by the 'MANDATORY_MANPATH' and
+    'MANPATH_MAP' entries of the man-db configuration file 'config_file', in
+    the order they appear.
+    """
+    paths = list()
+
+    with open(config_file, "r") as config:
+        for line in config:
+            fields = line.split("#", 1)[0].split()
+            if 2 == len(fields) and "MANDATORY_MANPATH" == fields[0]:
+                paths.append(fields[1])
+            elif 3 == len(fields) and "MANPATH_MAP" == fields[0]:
+                paths.append(fields[2])
+
+    return paths
+
+
+def _manpath_system_get():
+    """
+    Returns the list of existing system manual page search paths, read from
+    the man-db configuration file or, failing that, from the output of the
+    'manpath' program.
+    """
+    for config_file in _MANPATH_CONFIG_FILES:
+        try:
+            paths = [path for path in _manpath_config_parse(config_file)
+                     if os.path.isdir(path)]
+        except OSError:
+            continue
+        if paths:
+            return paths
+
+    try:
+        process = subprocess.run(["manpath"],
+                                 stdin=subprocess.DEVNULL,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.DEVNULL)
+    except OSError:
+        return list()
+
+    return [path for path in
+            process.stdout.decode(errors="replace").strip().split(os.pathsep)
+            if path]
 # -------------------------------- FUNCTIONS ----------------------------------
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+"""
+A suite of generation plan tools.
+
+A 'Plan' lists every directory and file a batch of project-directories is
+made of (the layout of each of them, see 'layout_get') without building a
+path string for each of them: the name of each entry (like "src" or
+"CMakeLists.txt") and its source are interned once for the whole plan, and
+each entry is a row of four array-backed columns (operation, parent entry,
+name, source), which takes 13 bytes no matter how many projects share it.
+
+The full paths are only joined as the plan is iterated, one project at a
+time.
+
+'mkdir': the directory is created
+'copy': the file is copied from its source as is
+'render': the file is written from its source (if any) with the details of
+the project filled in
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = [
+    "PLAN_OPS",
+    "Plan",
+    "PlanOp",
+    "plan_create"
+]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import array
+import collections
+import os
+import sys
+
+from skaff.jobtools import SkaffJob
+from skaff.layouttools import (
+    LAYOUT_OPS,
+    doxygen_found,
+    layout_get
+)
+from typing import (
+    Iterable,
+    Iterator,
+    Optional
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+PLAN_OPS = LAYOUT_OPS
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+# 'op': one of the 'PLAN_OPS'
+# 'path': path of the entry, with a trailing path separator for directories
+# 'source': path of the file the entry is made from, or None
+PlanOp = collections.namedtuple("PlanOp", ("op", "path", "source"))
+
+
+class Plan:
+    """
+    Compact, append-only list of the entries of a batch of generations (see
+    the module description); iterating over it yields a 'PlanOp' for each
+    entry.
+    """
+    __slots__ = ("__names", "__names_index", "__ops", "__parents",
+                 "__sources", "__strings")
+
+    def __init__(self):
+        # Interned names and sources, indexed by their position
+        self.__strings = list()
+        self.__names_index = dict()
+        self.__ops = array.array("B")
+        self.__parents = array.array("i")
+        self.__names = array.array("I")
+        self.__sources = array.array("i")
+
+    def __iter__(self) -> Iterator[PlanOp]:
+        strings = self.__strings
+        # Paths of the directories of the project being iterated, keyed by
+        # their entries; started over at the root of each project
+        directories = dict()
+
+        for index, op in enumerate(self.__ops):
+            parent = self.__parents[index]
+            path = strings[self.__names[index]]
+            if -1 == parent:
+                directories.clear()
+            else:
+                path = directories[parent] + path
+            if 0 == op:
+                path += os.sep
+                directories[index] = path
+            source = self.__sources[index]
+            yield PlanOp(PLAN_OPS[op], path,
+                         None if -1 == source else strings[source])
+
+    def __len__(self):
+        return len(self.__ops)
+
+    def add(self, op: str, parent: int, name: str,
+            source: Optional[str]=None) -> int:
+        """
+        Appends an entry named 'name' under the 'mkdir' entry 'parent' (an
+        index returned by 'add' for the same project, or -1 for the root of a
+        project, in which case 'name' is its path) and returns its index.
+        """
+        if op not in PLAN_OPS:
+            raise ValueError(("'op' argument must be one of the following: " +
+                              ", ".join(PLAN_OPS)))
+
+        if -1 != parent and\
+                (not 0 <= parent < len(self.__ops) or self.__ops[parent]):
+            raise ValueError("'parent' argument must be a 'mkdir' entry")
+
+        self.__ops.append(PLAN_OPS.index(op))
+        self.__parents.append(parent)
+        self.__names.append(self.__intern(name))
+        self.__sources.append(-1 if source is None
+                              else self.__intern(source))
+
+        return len(self.__ops) - 1
+
+    def nbytes_get(self) -> int:
+        """
+        Returns the number of bytes taken by the plan, including the interned
+        strings.
+        """
+        columns = (self.__ops, self.__parents, self.__names, self.__sources)
+
+        return (sys.getsizeof(self.__strings) +
+                sys.getsizeof(self.__names_index) +
+                sum(sys.getsizeof(string) for string in self.__strings) +
+                sum(sys.getsizeof(column) for column in columns))
+
+    def path_get(self, index: int) -> str:
+        """
+        Returns the path of the entry 'index' (with a trailing path separator
+        for directories).
+        """
+        parts = list()
+        entry = index
+
+        while -1 != entry:
+            parts.append(self.__strings[self.__names[entry]])
+            entry = self.__parents[entry]
+
+        path = os.sep.join(reversed(parts))
+
+        return path + os.sep if 0 == self.__ops[index] else path
+
+    def __intern(self, string):
+        """
+        Returns the index of 'string' among the interned strings, which it is
+        added to if missing.
+        """
+        index = self.__names_index.get(string)
+
+        if index is None:
+            index = len(self.__strings)
+            self.__strings.append(string)
+            self.__names_index[string] = index
+
+        return index
+# --------------------------------- CLASSES -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+def plan_create(jobs: Iterable[SkaffJob], plan: Optional[Plan]=None) -> Plan:
+    """
+    Appends the entries (see 'Plan') generated for each of 'jobs' by
+    'skaff_drive' (see 'layout_get') to 'plan' (a new one if not given) and
+    returns it; nothing is read or written.
+
+    The sources of templates that are not enabled are None, and so is the
+    source of 'Doxyfile' if 'doxygen' is going to generate it instead.
+
+    Raises 'ValueError' if the 'subdirectories' of any of 'jobs' lead out of
+    the project-directory.
+    """
+    if plan is None:
+        plan = Plan()
+
+    # Looked up once per call rather than once per job
+    doxygen = doxygen_found()
+    for job in jobs:
+        layout = layout_get(job, doxygen)
+        base = plan.add("mkdir", -1, job.directory[:-1])
+        for entry in layout:
+            name = entry.name
+            if name is None:
+                # The directory named after the project
+                name = os.path.basename(job.directory[:-1])
+            plan.add(entry.op,
+                     base if -1 == entry.parent else base + 1 + entry.parent,
+                     name, entry.source)
+
+    return plan
+# -------------------------------- FUNCTIONS ----------------------------------
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+
+"""
+Registries of the license and template files shared by all the 'SkaffConfig'
+instances; each of them overlays a 'user' path on top of a 'system' path.
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = [
+    "LicenseEntry",
+    "LicenseRegistry",
+    "TemplateEntry",
+    "TemplateRegistry",
+    "license_registry_get",
+    "template_registry_get"
+]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import collections
+import os
+import threading
+import time
+import types
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+# Directories modified within this many seconds of being scanned are scanned
+# again on the next refresh, since a later modification within the time stamp
+# granularity of the file system may not change their time stamps
+_RACY_SECONDS = 2
+# Registries shared by all the callers, keyed by (user_path, system_path)
+_license_registries = dict()
+_template_registries = dict()
+_registries_lock = threading.Lock()
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+# Fully qualified text (".txt") and markdown (".md") files of a license
+LicenseEntry = collections.namedtuple("LicenseEntry", ("text", "markdown"))
+# Winning source of a template: fully qualified path and size in bytes at the
+# time of the scan
+TemplateEntry = collections.namedtuple("TemplateEntry", ("path", "size"))
+
+
+class LicenseRegistry:
+    """
+    Mapping from license names to their resolved 'LicenseEntry', built from a
+    single 'os.scandir' pass over each of the 'user' and 'system' license
+    paths; licenses in the 'user' path override the 'system' ones with the
+    same name.
+    """
+    __slots__ = ("__entries", "__stamps", "__system_names", "__system_path",
+                 "__user_path")
+    __FORMATS = (".txt", ".md")
+
+    def __init__(self, user_path, system_path):
+        """
+        Constructs a new 'LicenseRegistry' for 'user_path' and 'system_path';
+        both of them must end with a path separator.
+        Nothing is scanned until the first 'refresh'.
+        """
+        self.__user_path = user_path
+        self.__system_path = system_path
+        self.__entries = types.MappingProxyType(dict())
+        self.__system_names = frozenset()
+        self.__stamps = None
+
+    def entries_get(self):
+        """
+        Gets a read-only mapping from license names to 'LicenseEntry' as of
+        the last 'refresh'.
+        """
+        return self.__entries
+
+    def refresh(self):
+        """
+        Re-scans the license paths if the modification time of any of them
+        has changed since the last scan; returns the (possibly new) mapping
+        given by 'entries_get'.
+
+        Raises 'FileNotFoundError' if a license in the 'user' path does not
+        come with both the ".txt" and ".md" files.
+        """
+        stamps = (LicenseRegistry.__stamp(self.__user_path),
+                  LicenseRegistry.__stamp(self.__system_path))
+
+        if stamps == self.__stamps:
+            return self.__entries
+
+        system_files = LicenseRegistry.__scan(self.__system_path)
+        user_files = LicenseRegistry.__scan(self.__user_path)
+        text_names = user_files[".txt"].keys()
+        markdown_names = user_files[".md"].keys()
+
+        if text_names != markdown_names:
+            raise FileNotFoundError(("The number of license files end with "
+                                     "those file extensions must equal; "
+                                     "there must be a file with same name for "
+                                     "each of the following file extension: " +
+                                     ", ".join(LicenseRegistry.__FORMATS)))
+
+        entries = dict()
+        for files in (system_files, user_files):
+            for name in files[".txt"].keys() & files[".md"].keys():
+                entries[name] = LicenseEntry(files[".txt"][name],
+                                             files[".md"][name])
+
+        self.__entries = types.MappingProxyType(entries)
+        self.__system_names = frozenset(system_files[".txt"].keys() &
+                                        system_files[".md"].keys())
+        # Racily modified directories are always scanned again
+        now = time.time()
+        if any(stamp[1] is not None and now - stamp[1] / 1e9 < _RACY_SECONDS
+               for stamp in stamps):
+            self.__stamps = None
+        else:
+            self.__stamps = stamps
+
+        return self.__entries
+
+    def system_names_get(self):
+        """
+        Gets a 'frozenset' of the license names found in the 'system' path
+        (with both file formats present) as of the last 'refresh'.
+        """
+        return self.__system_names
+
+    @staticmethod
+    def __scan(path):
+        """
+        Returns a dictionary mapping each supported file extension to another
+        dictionary from license names to the files found directly under
+        'path'; hidden files are ignored.
+        """
+        result = {extension: dict() for extension in LicenseRegistry.__FORMATS}
+
+        try:
+            entries = os.scandir(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return result
+
+        with entries:
+            for entry in entries:
+                name, extension = os.path.splitext(entry.name)
+                if extension in result and name and\
+                        not name.startswith(".") and entry.is_file():
+                    result[extension][name] = path + entry.name
+
+        return result
+
+    @staticmethod
+    def __stamp(path):
+        """
+        Returns the inode number and modification time (in nanoseconds) of
+        'path'; both of them are None if it does not exist.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return (None, None)
+        return (stat.st_ino, stat.st_mtime_ns)
+
+
+class TemplateRegistry:
+    """
+    Overlay index from template paths (relative to the template path, using
+    the platform-dependent path separator) to their winning 'TemplateEntry',
+    built from a single recursive 'os.scandir' walk over each of the 'user'
+    and 'system' template trees; templates in the 'user' tree override the
+    'system' ones with the same relative path.
+    """
+    __slots__ = ("__entries", "__stamps", "__system_path", "__user_path")
+
+    def __init__(self, user_path, system_path):
+        """
+        Constructs a new 'TemplateRegistry' for 'user_path' and 'system_path';
+        both of them must end with a path separator.
+        Nothing is scanned until the first 'refresh'.
+        """
+        self.__user_path = user_path
+        self.__system_path = system_path
+        self.__entries = types.MappingProxyType(dict())
+        self.__stamps = None
+
+    def entries_get(self):
+        """
+        Gets a read-only mapping from relative template paths to
+        'TemplateEntry' as of the last 'refresh'.
+        """
+        return self.__entries
+
+    def refresh(self):
+        """
+        Re-walks both template trees if the modification time of any
+        directory within them has changed since the last walk; returns the
+        (possibly new) mapping given by 'entries_get'.
+
+        NOTE: editing a template in place does not change the modification
+        time of its directory, so the 'size' of such a template is only
+        updated by the next walk.
+        """
+        if self.__stamps is not None and\
+                all(TemplateRegistry.__stamp(directory) == stamp
+                    for directory, stamp in self.__stamps):
+            return self.__entries
+
+        stamps = list()
+        entries = dict()
+        for root in (self.__system_path, self.__user_path):
+            TemplateRegistry.__walk(root, str(), entries, stamps)
+
+        self.__entries = types.MappingProxyType(entries)
+        # Racily modified directories are always walked again
+        now = time.time()
+        if any(stamp[1] is not None and now - stamp[1] / 1e9 < _RACY_SECONDS
+               for directory, stamp in stamps):
+            self.__stamps = None
+        else:
+            self.__stamps = tuple(stamps)
+
+        return self.__entries
+
+    @staticmethod
+    def __stamp(path):
+        """
+        Returns the inode number and modification time (in nanoseconds) of
+        'path'; both of them are None if it does not exist.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return (None, None)
+        return (stat.st_ino, stat.st_mtime_ns)
+
+    @staticmethod
+    def __walk(root, relative, entries, stamps):
+        """
+        Adds every regular file under 'root' + 'relative' to 'entries' keyed
+        by its path relative to 'root', and records the time stamp of every
+        directory visited (including the ones that do not exist) in 'stamps'.
+        """
+        directory = root + relative
+        stamps.append((directory, TemplateRegistry.__stamp(directory)))
+
+        try:
+            iterator = os.scandir(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+        with iterator:
+            for entry in iterator:
+                if entry.is_dir():
+                    TemplateRegistry.__walk(root,
+                                            relative + entry.name + os.sep,
+                                            entries,
+                                            stamps)
+                elif entry.is_file():
+                    entries[relative + entry.name] = TemplateEntry(
+                        entry.path,
+                        entry.stat().st_size)
+# --------------------------------- CLASSES -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+def license_registry_get(user_path: str, system_path: str) -> LicenseRegistry:
+    """
+    Returns the 'LicenseRegistry' shared by all the callers for the given
+    'user_path' and 'system_path'; a path separator is appended to each of
+    them if missing.
+    """
+    if not all(isinstance(path, str) for path in (user_path, system_path)):
+        raise TypeError("both 'user_path' and 'system_path' must be 'str'")
+
+    if not user_path.endswith(os.sep):
+        user_path += os.sep
+
+    if not system_path.endswith(os.sep):
+        system_path += os.sep
+
+    key = (user_path, system_path)
+
+    with _registries_lock:
+        if key not in _license_registries:
+            _license_registries[key] = LicenseRegistry(user_path, system_path)
+        return _license_registries[key]
+
+
+def template_registry_get(user_path: str,
+                          system_path: str) -> TemplateRegistry:
+    """
+    Returns the 'TemplateRegistry' shared by all the callers for the given
+    'user_path' and 'system_path'; a path separator is appended to each of
+    them if missing.
+    """
+    if not all(isinstance(path, str) for path in (user_path, system_path)):
+        raise TypeError("both 'user_path' and 'system_path' must be 'str'")
+
+    if not user_path.endswith(os.sep):
+        user_path += os.sep
+
+    if not system_path.endswith(os.sep):
+        system_path += os.sep
+
+    key = (user_path, system_path)
+
+    with _registries_lock:
+        if key not in _template_registries:
+            _template_registries[key] = TemplateRegistry(user_path,
+                                                         system_path)
+        return _template_registries[key]
+# -------------------------------- FUNCTIONS ----------------------------------
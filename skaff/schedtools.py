@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+"""
+A suite of adaptive I/O scheduling tools.
+
+The number of file operations in flight is adjusted while they run, in the
+manner of the congestion control of TCP (additive increase, multiplicative
+decrease): it grows by one after each window of operations whose mean
+latency stays close to the lowest seen so far, and is halved once the
+latency rises, meaning the storage is saturated (queueing instead of working
+in parallel). Fast local storage thus ends up with many operations in
+flight, while spinning disks and network file systems end up with a few.
+
+Queued operations are started largest first, so the longest ones do not
+finish last and stretch the whole batch.
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = [
+    "IOMetrics",
+    "IOScheduler"
+]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import collections
+import concurrent.futures
+import heapq
+import itertools
+import threading
+import time
+
+from typing import (
+    Callable,
+    Optional
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+# Default upper bound of the operations in flight
+_LIMIT_MAX = 32
+# Default number of operations in flight at the start
+_LIMIT_START = 4
+# Mean latency of a window (relative to the lowest one seen) above which the
+# storage is considered saturated
+_LATENCY_TOLERANCE = 2.0
+# Factor the lowest latency seen grows by after each window, so it follows
+# the storage (and the mix of operations) instead of a single lucky window
+_LATENCY_DRIFT = 1.05
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+# 'operations': number of operations completed
+# 'seconds': wall-clock seconds from the first submission to the last
+# completion
+# 'latency': mean seconds per operation
+# 'throughput': operations completed per second
+# 'concurrency': number of operations allowed in flight at the end
+# 'peak': largest number of operations ever in flight
+IOMetrics = collections.namedtuple("IOMetrics",
+                                   ("operations", "seconds", "latency",
+                                    "throughput", "concurrency", "peak"))
+
+
+class IOScheduler:
+    """
+    Runs file operations on a pool of at most 'limit_max' threads, with the
+    number of them in flight adjusted between 'limit_min' and 'limit_max'
+    according to their latency (see the module description); the pool is
+    only started by the first 'submit'.
+
+    Use it as a context manager: leaving the 'with' statement waits for all
+    the submitted operations.
+    """
+    __slots__ = ("__counter", "__executor", "__first", "__flight", "__idle",
+                 "__last", "__latency_min", "__latency_total", "__limit",
+                 "__limit_max", "__limit_min", "__lock", "__operations",
+                 "__peak", "__queue", "__window", "__window_latency")
+
+    def __init__(self, limit_max: Optional[int]=None,
+                 limit: Optional[int]=None, limit_min: int=1):
+        """
+        Constructs a new 'IOScheduler'; 'limit' is the number of operations
+        allowed in flight at the start.
+        """
+        if limit_max is None:
+            limit_max = _LIMIT_MAX
+
+        if limit is None:
+            limit = min(_LIMIT_START, limit_max)
+
+        for argument in (limit_max, limit, limit_min):
+            if not isinstance(argument, int) or argument < 1:
+                raise ValueError("limit arguments must be positive 'int'(s)")
+
+        if not limit_min <= limit <= limit_max:
+            raise ValueError(("'limit' argument must be between 'limit_min' "
+                              "and 'limit_max'"))
+
+        # Breaks ties between operations of the same size in the order they
+        # are submitted
+        self.__counter = itertools.count()
+        self.__executor = None
+        self.__first = None
+        self.__flight = 0
+        self.__lock = threading.Lock()
+        # Notified once nothing is queued or in flight
+        self.__idle = threading.Condition(self.__lock)
+        self.__last = None
+        self.__latency_min = None
+        self.__latency_total = 0.0
+        self.__limit = limit
+        self.__limit_max = limit_max
+        self.__limit_min = limit_min
+        self.__operations = 0
+        self.__peak = 0
+        self.__queue = list()
+        self.__window = 0
+        self.__window_latency = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """
+        Waits for all the submitted operations and stops the worker threads.
+        """
+        with self.__idle:
+            # Operations still queued are started by the ones finishing
+            while self.__queue or self.__flight:
+                self.__idle.wait()
+            executor = self.__executor
+            self.__executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def limit_max_get(self) -> int:
+        """
+        Returns the largest number of operations allowed in flight.
+        """
+        return self.__limit_max
+
+    def metrics_get(self) -> IOMetrics:
+        """
+        Returns the 'IOMetrics' of the operations completed so far.
+        """
+        with self.__lock:
+            seconds = 0.0
+            if self.__first is not None and self.__last is not None:
+                seconds = self.__last - self.__first
+            operations = self.__operations
+            return IOMetrics(operations=operations,
+                             seconds=seconds,
+                             latency=(self.__latency_total / operations
+                                      if operations else 0.0),
+                             throughput=(operations / seconds
+                                         if seconds else 0.0),
+                             concurrency=self.__limit,
+                             peak=self.__peak)
+
+    def submit(self, function: Callable, *args,
+               size: int=0) -> concurrent.futures.Future:
+        """
+        Schedules 'function' to be called with 'args' and returns a 'Future'
+        of its result; 'size' (such as the number of bytes written) decides
+        the order queued operations are started in, the largest first.
+        """
+        future = concurrent.futures.Future()
+
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = concurrent.futures.ThreadPoolExecutor(
+                    self.__limit_max)
+            if self.__first is None:
+                self.__first = time.monotonic()
+            heapq.heappush(self.__queue, (-size, next(self.__counter),
+                                          future, function, args))
+            self.__dispatch()
+
+        return future
+
+    def __complete(self, latency):
+        """
+        Records an operation that took 'latency' seconds, adjusts the number
+        of operations allowed in flight at the end of each window, and starts
+        the queued ones that are now allowed.
+        """
+        with self.__lock:
+            self.__flight -= 1
+            self.__last = time.monotonic()
+            self.__operations += 1
+            self.__latency_total += latency
+            self.__window += 1
+            self.__window_latency += latency
+
+            # A window spans as many operations as are allowed in flight
+            if self.__window >= self.__limit:
+                mean = self.__window_latency / self.__window
+                if self.__latency_min is None:
+                    self.__latency_min = mean
+                else:
+                    self.__latency_min = min(
+                        mean, self.__latency_min * _LATENCY_DRIFT)
+                if mean > _LATENCY_TOLERANCE * self.__latency_min:
+                    self.__limit = max(self.__limit_min, self.__limit // 2)
+                else:
+                    self.__limit = min(self.__limit_max, self.__limit + 1)
+                self.__window = 0
+                self.__window_latency = 0.0
+
+            self.__dispatch()
+            if not self.__queue and not self.__flight:
+                self.__idle.notify_all()
+
+    def __dispatch(self):
+        """
+        Starts queued operations while fewer than the allowed number are in
+        flight; must be called with the lock held.
+        """
+        while self.__queue and self.__flight < self.__limit:
+            _, _, future, function, args = heapq.heappop(self.__queue)
+            if not future.set_running_or_notify_cancel():
+                continue
+            self.__flight += 1
+            self.__peak = max(self.__peak, self.__flight)
+            self.__executor.submit(self.__run, future, function, args)
+
+    def __run(self, future, function, args):
+        """
+        Calls 'function' with 'args' on a worker thread and sets the result
+        (or the exception) of 'future'.
+        """
+        start = time.monotonic()
+        try:
+            result = function(*args)
+        except BaseException as exception:
+            self.__complete(time.monotonic() - start)
+            future.set_exception(exception)
+        else:
+            self.__complete(time.monotonic() - start)
+            future.set_result(result)
+# --------------------------------- CLASSES -----------------------------------
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+
+"""
+A suite of staged generation tools.
+
+A project-directory is generated in a hidden staging directory next to it
+(named after 'STAGE_PREFIX', the host and the process generating it, so
+several hosts may generate into the same network mount), and published
+under its final name by a single rename once it is complete, so a failed
+generation never leaves a partially generated project-directory behind.
+
+The staging directory may be placed on another file system (like a 'tmpfs'
+in front of a slow network mount); the finished project is then copied in
+one go next to its final name before being renamed into place.
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = [
+    "STAGE_PREFIX",
+    "rename_noreplace",
+    "stage_create",
+    "stage_discard",
+    "stage_publish",
+    "stages_clean",
+    "stages_parents_clean"
+]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import ctypes
+import ctypes.util
+import errno
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+from skaff.synctools import (
+    durability_check,
+    tree_sync,
+    _fsync
+)
+from typing import (
+    Iterable,
+    List,
+    Optional,
+    Set
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+STAGE_PREFIX = ".skaff-stage-"
+# Age (in seconds) after which a staging directory is considered stale where
+# the process owning it cannot be probed (on another host, or not on POSIX)
+_STAGE_STALE_SECONDS = 24 * 60 * 60
+# Absolute paths of the staging directories created by this process and not
+# published or discarded yet; the only ones of this process in use
+_stages_open = set()
+_stages_lock = threading.Lock()
+# 'renameat2' of the C library; resolved on first use, False if unavailable
+_renameat2 = None
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+def rename_noreplace(source: str, target: str) -> None:
+    """
+    Renames 'source' to 'target'; raises 'FileExistsError' instead of
+    replacing 'target' if it exists.
+
+    The check is atomic where 'renameat2' with 'RENAME_NOREPLACE' is
+    available (Linux); elsewhere 'target' is checked right before the rename.
+    """
+    source = source.rstrip(os.sep) or source
+    target = target.rstrip(os.sep) or target
+
+    if _renameat2_call(source, target):
+        return
+
+    # Note an empty directory would be silently replaced by 'os.rename'
+    if os.path.lexists(target):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST),
+                              target)
+    os.rename(source, target)
+
+
+def stage_create(directory: str,
+                 stage_directory: Optional[str]=None) -> str:
+    """
+    Creates a hidden staging directory for the project-directory 'directory'
+    under 'stage_directory' (defaults to the parent of 'directory', which is
+    created if missing) and returns the path (with a trailing path separator)
+    the project should be generated at; that path itself does not exist yet.
+
+    Raises 'FileExistsError' if 'directory' already exists.
+    """
+    directory = directory.rstrip(os.sep)
+
+    if not directory:
+        raise ValueError("'directory' argument must not be the root")
+
+    if os.path.lexists(directory):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST),
+                              directory)
+
+    if stage_directory is None:
+        stage_directory = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(stage_directory, exist_ok=True)
+
+    container = tempfile.mkdtemp(
+        prefix="{0}{1}-{2}-".format(STAGE_PREFIX, _stage_host_get(),
+                                    os.getpid()),
+        dir=stage_directory)
+    with _stages_lock:
+        _stages_open.add(os.path.abspath(container))
+
+    return container + os.sep + os.path.basename(directory) + os.sep
+
+
+def stage_discard(stage: str) -> None:
+    """
+    Removes the staging directory holding 'stage' (as returned by
+    'stage_create') along with everything in it.
+    """
+    container = _stage_container_get(stage)
+
+    shutil.rmtree(container, ignore_errors=True)
+    with _stages_lock:
+        _stages_open.discard(os.path.abspath(container))
+
+
+def stage_publish(stage: str, directory: str,
+                  durability: str="none") -> None:
+    """
+    Publishes the project generated at 'stage' (as returned by
+    'stage_create') as 'directory' with a single rename and removes its
+    staging directory; the project is flushed to the disk according to
+    'durability' (see 'tree_sync') before it is published, and the new entry
+    of 'directory' afterwards.
+
+    If 'stage' is on another file system, it is first copied as a whole into
+    a staging directory next to 'directory'.
+
+    Raises 'FileExistsError' (leaving 'stage' untouched) if 'directory' has
+    been created in the meantime.
+    """
+    durability_check(durability)
+    directory = directory.rstrip(os.sep)
+    parent = os.path.dirname(os.path.abspath(directory))
+    container = _stage_container_get(stage)
+    copy = None
+
+    try:
+        if os.stat(container).st_dev != os.stat(parent).st_dev:
+            copy = stage_create(directory)
+            shutil.copytree(stage, copy, symlinks=True)
+            source = copy
+        else:
+            source = stage
+
+        tree_sync(source, durability)
+        rename_noreplace(source, directory)
+    finally:
+        if copy is not None:
+            stage_discard(copy)
+
+    if copy is None:
+        os.rmdir(container)
+        with _stages_lock:
+            _stages_open.discard(os.path.abspath(container))
+    else:
+        stage_discard(stage)
+    if "none" != durability:
+        _fsync(parent, directory=True)
+
+
+def stages_clean(directory: str) -> List[str]:
+    """
+    Removes the staging directories left in 'directory' by generations that
+    are no longer running (because they crashed or got killed) and returns
+    their paths; nothing is done if 'directory' does not exist.
+
+    The owner of a staging directory created on this host is probed by its
+    process ID on POSIX; staging directories created on other hosts (which
+    may still be generating into the same network mount) or elsewhere than
+    POSIX are only removed once they are older than a day. So are the ones
+    named after the calling process but not in use by it (neither published
+    nor discarded yet), such as the ones leaked by a failed generation.
+    """
+    removed = list()
+
+    try:
+        dir_entries = os.scandir(directory)
+    except (FileNotFoundError, NotADirectoryError):
+        return removed
+
+    with dir_entries:
+        dir_entries = list(dir_entries)
+
+    host = _stage_host_get()
+    for dir_entry in dir_entries:
+        if not dir_entry.name.startswith(STAGE_PREFIX) or\
+                not dir_entry.is_dir(follow_symlinks=False):
+            continue
+        # The random suffix of 'tempfile.mkdtemp' never holds a "-", unlike
+        # the name of the host
+        fields = dir_entry.name[len(STAGE_PREFIX):].rsplit("-", 2)
+        if 3 != len(fields) or host != fields[0]:
+            pid = None
+        else:
+            pid = int(fields[1]) if fields[1].isdigit() else 0
+        if _stage_owner_alive(dir_entry, pid):
+            continue
+        shutil.rmtree(dir_entry.path, ignore_errors=True)
+        removed.append(dir_entry.path)
+
+    return removed
+
+
+def stages_parents_clean(directories: Iterable[str],
+                         stage_directory: Optional[str]=None,
+                         cleaned: Optional[Set[str]]=None) -> None:
+    """
+    Removes the stale staging directories (see 'stages_clean') next to the
+    project-directories 'directories' and under 'stage_directory' if given,
+    skipping the directories in 'cleaned' (a 'set', which the ones cleaned
+    are added to) if given.
+    """
+    parents = {os.path.dirname(os.path.abspath(directory.rstrip(os.sep)))
+               for directory in directories}
+
+    if stage_directory is not None:
+        parents.add(stage_directory)
+
+    if cleaned is not None:
+        parents -= cleaned
+        cleaned |= parents
+
+    for parent in sorted(parents):
+        stages_clean(parent)
+
+
+def _renameat2_call(source, target):
+    """
+    Renames 'source' to 'target' by 'renameat2' with 'RENAME_NOREPLACE';
+    returns False (having renamed nothing) if it is not available on this
+    platform or not supported by the file system.
+    """
+    global _renameat2
+
+    if _renameat2 is None:
+        _renameat2 = False
+        if sys.platform.startswith("linux"):
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c"),
+                                   use_errno=True)
+                _renameat2 = libc.renameat2
+            except (AttributeError, OSError):
+                pass
+
+    if not _renameat2:
+        return False
+
+    if 0 == _renameat2(_AT_FDCWD, os.fsencode(source),
+                       _AT_FDCWD, os.fsencode(target), _RENAME_NOREPLACE):
+        return True
+
+    error = ctypes.get_errno()
+    if error in (errno.EINVAL, errno.ENOSYS):
+        return False
+    if errno.EEXIST == error:
+        raise FileExistsError(error, os.strerror(error), target)
+    raise OSError(error, os.strerror(error), source)
+
+
+def _stage_container_get(stage):
+    """
+    Returns the staging directory holding 'stage'.
+    """
+    return os.path.dirname(stage.rstrip(os.sep))
+
+
+def _stage_host_get():
+    """
+    Returns the name of this host as used in the names of the staging
+    directories: anything but letters, digits, "." and "-" is replaced by
+    "_".
+    """
+    return "".join(character if character.isalnum() or character in ".-"
+                   else "_" for character in socket.gethostname()) or "_"
+
+
+def _stage_owner_alive(dir_entry, pid):
+    """
+    Determines whether the staging directory of 'dir_entry' created by the
+    process 'pid' of this host (None if it was created on another host) may
+    still be in use.
+    """
+    if pid == os.getpid():
+        with _stages_lock:
+            if os.path.abspath(dir_entry.path) in _stages_open:
+                return True
+        # Leaked by a failed generation of this process, or left by an
+        # earlier process with the same ID
+        return time.time() - dir_entry.stat().st_mtime < _STAGE_STALE_SECONDS
+
+    if pid is None or "posix" != os.name:
+        return time.time() - dir_entry.stat().st_mtime < _STAGE_STALE_SECONDS
+
+    if 0 >= pid:
+        return False
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
+# -------------------------------- FUNCTIONS ----------------------------------
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+"""
+A suite of durability (flushing generated files to the disk) tools.
+
+Three durability modes are supported:
+
+'none': nothing is flushed; the operating system writes the files back
+whenever it sees fit, so a crash may leave empty or truncated files behind
+
+'batch': all the files of a tree are flushed at once by several threads,
+followed by the directories; a whole file system can be flushed by a single
+'syncfs' call on Linux instead (which covers the directory entries as well)
+
+'strict': each file is flushed one after another, and each directory after
+the files in it
+"""
+
+# ------------------------------- MODULE INFO ---------------------------------
+__all__ = [
+    "DURABILITY_MODES",
+    "durability_check",
+    "tree_sync"
+]
+# ------------------------------- MODULE INFO ---------------------------------
+
+# --------------------------------- MODULES -----------------------------------
+import concurrent.futures
+import ctypes
+import ctypes.util
+import os
+import sys
+
+from typing import Optional
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+DURABILITY_MODES = ("none", "batch", "strict")
+# Number of threads flushing the files of a tree in the 'batch' mode if not
+# given; flushing mostly waits for the device, so this is independent of the
+# number of processors
+_SYNC_WORKERS = 16
+# 'syncfs' of the C library; resolved on first use, False if unavailable
+_syncfs = None
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# -------------------------------- FUNCTIONS ----------------------------------
+def durability_check(mode: str) -> None:
+    """
+    Checks whether 'mode' is one of the 'DURABILITY_MODES'; raises
+    'ValueError' otherwise.
+    """
+    if mode not in DURABILITY_MODES:
+        raise ValueError(("'mode' argument must be one of the following: " +
+                          ", ".join(DURABILITY_MODES)))
+
+
+def tree_sync(directory: str, mode: str="batch",
+              workers: Optional[int]=None, filesystem: bool=False) -> int:
+    """
+    Flushes every file and directory under 'directory' (as well as the entry
+    of 'directory' itself in its parent) to the disk according to 'mode' (see
+    'DURABILITY_MODES') and returns the number of files flushed one by one.
+
+    In the 'batch' mode the files are flushed by at most 'workers' threads.
+    If 'filesystem' is True, the file system holding 'directory' is flushed
+    as a whole by 'syncfs' instead where available, without listing the tree
+    (so 0 is returned); this takes a single call however large the tree is,
+    but flushes whatever any other process wrote to that file system as
+    well, so it is meant to be done once for a whole batch.
+    """
+    durability_check(mode)
+
+    if "none" == mode:
+        return 0
+
+    if directory.endswith(os.sep):
+        directory = directory[:-1]
+
+    if "batch" == mode and filesystem and _syncfs_call(directory):
+        return 0
+
+    # Bottom-up, so that a directory is flushed after everything in it
+    tree = [(root, [root + os.sep + name for name in files])
+            for root, _, files in os.walk(directory, topdown=False)]
+    count = sum(len(files) for _, files in tree)
+
+    if "strict" == mode:
+        for root, files in tree:
+            for path in files:
+                _fsync(path)
+            _fsync(root, directory=True)
+    else:
+        files = [path for _, paths in tree for path in paths]
+        if workers is None:
+            workers = _SYNC_WORKERS
+        if files:
+            with concurrent.futures.ThreadPoolExecutor(
+                    min(workers, len(files))) as executor:
+                # Consume the results so that the first exception is raised
+                for _ in executor.map(_fsync, files):
+                    pass
+        for root, _ in tree:
+            _fsync(root, directory=True)
+
+    _fsync(os.path.dirname(os.path.abspath(directory)), directory=True)
+
+    return count
+
+
+def _fsync(path, directory=False):
+    """
+    Flushes the file (or the directory if 'directory' is set to True) at
+    'path' to the disk.
+
+    Directories cannot be opened (thus flushed) on Windows; they are skipped
+    there.
+    """
+    if directory and "posix" != os.name:
+        return
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _syncfs_call(directory):
+    """
+    Flushes the whole file system holding 'directory' with the 'syncfs'
+    system call; returns False (having flushed nothing) if it is not
+    available on this platform.
+    """
+    global _syncfs
+
+    if _syncfs is None:
+        _syncfs = False
+        if sys.platform.startswith("linux"):
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c"),
+                                   use_errno=True)
+                _syncfs = libc.syncfs
+            except (AttributeError, OSError):
+                pass
+
+    if not _syncfs:
+        return False
+
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        if 0 != _syncfs(fd):
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), directory)
+    finally:
+        os.close(fd)
+
+    return True
+# -------------------------------- FUNCTIONS ----------------------------------
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for asyncdriver module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import asyncio
+import concurrent.futures
+import os
+import sys
+import threading
+import unittest
+
+from tempfile import TemporaryDirectory
+from unittest import mock
+from skaff.asyncdriver import skaff_async_drive
+from skaff.config import SkaffConfig
+from skaff.stagetools import (
+    STAGE_PREFIX,
+    stage_create
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class TestAsyncDriver(unittest.TestCase):
+    """
+    Unit testing suite for 'asyncdriver' module.
+    """
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        if not self.tmp_dir.name.endswith(os.sep):
+            self.tmp_dir.name += os.sep
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        self.tmp_dir.cleanup()
+
+    def test_skaff_async_drive(self):
+        directories = [self.tmp_dir.name + name for name in ("alpha", "beta")]
+        config = SkaffConfig(directories, quiet=False)
+        config.hook_add("post_project",
+                        [sys.executable, "-c", "print('generated')"])
+
+        # Fail due to wrong type for the 'config' argument
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(skaff_async_drive(None))
+
+        results = self.loop.run_until_complete(skaff_async_drive(config))
+
+        # Success if every project is generated without any prompt
+        self.assertEqual(2, len(results))
+        self.assertTrue(all(0 == result.returncode for result in results))
+        for directory in directories:
+            for generated in ("CMakeLists.txt", "Doxyfile", "LICENSE.txt",
+                              "README.md"):
+                self.assertTrue(os.path.isfile(directory + os.sep +
+                                               generated))
+
+    def test_skaff_async_drive_concurrent(self):
+        configs = [SkaffConfig((self.tmp_dir.name + name,), quiet=True)
+                   for name in ("alpha", "beta", "gamma")]
+
+        async def _drive_all():
+            return await asyncio.gather(*(skaff_async_drive(config)
+                                          for config in configs))
+
+        # Success if several generations can be awaited at the same time
+        self.assertEqual([[], [], []], self.loop.run_until_complete(
+            _drive_all()))
+        for config in configs:
+            for directory in config.directories_get():
+                self.assertTrue(os.path.isfile(directory + "README.md"))
+
+    def test_skaff_async_drive_cancel(self):
+        directory = self.tmp_dir.name + "alpha"
+        marker = self.tmp_dir.name + "marker"
+        config = SkaffConfig((directory,), quiet=True)
+        config.hook_add("post_project",
+                        [sys.executable, "-c",
+                         "import time; time.sleep(30); open({0!r}, 'w')"
+                         .format(marker)])
+
+        async def _drive_cancelled():
+            task = asyncio.ensure_future(skaff_async_drive(config))
+            while not os.path.isfile(directory + os.sep + "README.md"):
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.2)
+            task.cancel()
+            await asyncio.wait((task,))
+            return task
+
+        # Success if the cancellation stops the running hook right away
+        task = self.loop.run_until_complete(
+            asyncio.wait_for(_drive_cancelled(), 10))
+        self.assertTrue(task.cancelled())
+        self.assertFalse(os.path.isfile(marker))
+
+    def test_skaff_async_drive_cancel_stage(self):
+        config = SkaffConfig((self.tmp_dir.name + "alpha",), quiet=True)
+        executor = concurrent.futures.ThreadPoolExecutor(2)
+        creating = threading.Event()
+        cancelled = threading.Event()
+
+        def _stage_create(*args):
+            creating.set()
+            cancelled.wait(10)
+            return stage_create(*args)
+
+        async def _drive_cancelled():
+            task = asyncio.ensure_future(skaff_async_drive(config,
+                                                           executor=executor))
+            while not creating.is_set():
+                await asyncio.sleep(0.01)
+            task.cancel()
+            await asyncio.wait((task,))
+            cancelled.set()
+            return task
+
+        # Success if the stage created after the cancellation is removed
+        with mock.patch("skaff.asyncdriver.stage_create", _stage_create):
+            task = self.loop.run_until_complete(
+                asyncio.wait_for(_drive_cancelled(), 10))
+        executor.shutdown(wait=True)
+        self.assertTrue(task.cancelled())
+        self.assertEqual([], [name for name in os.listdir(self.tmp_dir.name)
+                              if name.startswith(STAGE_PREFIX)])
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for clitools module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import asyncio
+import io
+import os
+import threading
+import time
+import unittest
+
+from skaff.clitools import (
+    names_read,
+    timed_key_async_get,
+    RawSession
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+@unittest.skipUnless("posix" == os.name, "requires selectable descriptors")
+class TestCliTools(unittest.TestCase):
+    """
+    Unit testing suite for 'clitools' module.
+    """
+    def setUp(self):
+        # A pipe stands in for the terminal; 'RawSession' leaves non-terminal
+        # file descriptors as they are
+        self.read_fd, self.write_fd = os.pipe()
+        self.session = RawSession(self.read_fd)
+
+    def tearDown(self):
+        os.close(self.read_fd)
+        if self.write_fd is not None:
+            os.close(self.write_fd)
+
+    def test_names_read(self):
+        # Names spanning the chunks read
+        names = ["project{0}".format(index) for index in range(20000)]
+        stream = io.BytesIO("\n".join(names).encode())
+        self.assertEqual(names, list(names_read(stream)))
+
+        # Success if empty names and carriage returns are dropped
+        stream = io.BytesIO(b"alpha\r\n\nbeta\n")
+        self.assertEqual(["alpha", "beta"], list(names_read(stream)))
+        stream = io.BytesIO(b"al pha\n\0beta\0\0")
+        self.assertEqual(["al pha\n", "beta"],
+                         list(names_read(stream, b"\0")))
+
+        # Fail due to an invalid delimiter
+        with self.assertRaises(ValueError):
+            list(names_read(io.BytesIO(), "\n"))
+
+    def test_raw_session(self):
+        os.write(self.write_fd, "cé".encode())
+
+        with self.session as session:
+            # Success if the same session can be entered again
+            with session:
+                self.assertEqual("c", session.key_get(0.1))
+            # Success if a multibyte character is read as a single key
+            self.assertEqual("é", session.key_get(0.1))
+
+            # Fail because no key is pressed within a fraction of a second
+            start = time.monotonic()
+            with self.assertRaises(TimeoutError):
+                session.key_get(0.05)
+            self.assertLess(time.monotonic() - start, 1)
+
+        # Success if an empty string is returned at the end of the input
+        os.close(self.write_fd)
+        self.write_fd = None
+        with self.session as session:
+            self.assertEqual(str(), session.key_get(0.1))
+
+    def test_raw_session_thread(self):
+        result = list()
+
+        def _key_wait():
+            with self.session as session:
+                result.append(session.key_get(5))
+
+        # Success if a key can be waited for off the main thread
+        thread = threading.Thread(target=_key_wait)
+        thread.start()
+        os.write(self.write_fd, b"k")
+        thread.join()
+        self.assertEqual(["k"], result)
+
+    def test_timed_key_async_get(self):
+        loop = asyncio.new_event_loop()
+        ticks = list()
+
+        async def _tick():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.01)
+
+        async def _prompt():
+            ticker = asyncio.ensure_future(_tick())
+            loop.call_later(0.1, os.write, self.write_fd, b"a")
+            try:
+                return await timed_key_async_get(5, self.session, loop)
+            finally:
+                ticker.cancel()
+
+        try:
+            # Success if the event loop keeps running other tasks while the
+            # key is being waited for
+            self.assertEqual("a", loop.run_until_complete(_prompt()))
+            self.assertGreater(len(ticks), 1)
+
+            # Fail because no key is pressed in time
+            with self.assertRaises(TimeoutError):
+                loop.run_until_complete(
+                    timed_key_async_get(0.05, self.session, loop))
+        finally:
+            loop.close()
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -65,6 +65,37 @@ class TestConfig(unittest.TestCase):
         self.config.authors_set(authors)
         self.assertCountEqual(authors, self.config.authors_get())
 
+    def test_authors_update(self):
+        authors = ["Ada Lovelace", "Charles Babbage"]
+        invalid = [str(), "\t", None, "Alan Turing"]
+
+        # Fail due to non-iterable type
+        with self.assertRaises(TypeError):
+            self.config.authors_update(None)
+
+        # Fail due to non-containerized string type
+        with self.assertRaises(TypeError):
+            self.config.authors_update(authors[0])
+
+        # Fail due to the existence of non-string type; every invalid entry
+        # is reported and nothing is added
+        with self.assertRaises(TypeError) as context:
+            self.config.authors_update(invalid)
+        self.assertIn("3 invalid", str(context.exception))
+        self.assertNotIn("Alan Turing", self.config.authors_get())
+
+        # Fail due to the existence of empty and non-printable strings
+        del invalid[2]
+        with self.assertRaises(ValueError) as context:
+            self.config.authors_update(invalid)
+        self.assertIn("2 invalid", str(context.exception))
+
+        # Success; generators are accepted and existing names are kept
+        self.config.authors_set(authors[:1])
+        self.config.authors_update(author for author in authors)
+        self.config.authors_update(list())
+        self.assertCountEqual(authors, self.config.authors_get())
+
     def test_author_add(self):
         # This "magic number" is questionable;
         # but to maintain "test reproducibility" it is kept this way
@@ -155,12 +186,90 @@ class TestConfig(unittest.TestCase):
                 with self.assertRaises(RuntimeError):
                     SkaffConfig.author_fetch()
 
+    def test_attributes(self):
+        # Fail because all the attributes are declared in '__slots__'
+        with self.assertRaises(AttributeError):
+            self.config.directories = None
+
+    def test_lazy_evaluation(self):
+        conf_file = self.tmp_dir.name + "skaff.conf"
+        license_files = [self.tmp_dir.name + "isc" + extension
+                         for extension in (".txt", ".md")]
+
+        # Success if arguments needing I/O to validate are only checked
+        # on their first use
+        config = SkaffConfig((self.tmp_dir.name,), license="unknown")
+        with self.assertRaises(ValueError):
+            config.license_get()
+        # The attribute is still pending after the failed evaluation
+        with self.assertRaises(ValueError):
+            config.license_get()
+
+        # Success if the layers found through a new 'config' path are used
+        # by the attributes that have not been evaluated yet
+        with open(conf_file, "w", encoding="utf-8") as conf:
+            conf.write("[skaff]\nlanguage = cpp\nquiet = no\n")
+        config = SkaffConfig((self.tmp_dir.name,))
+        self.assertEqual("c", config.language_get())
+        config.paths_set(config=self.tmp_dir.name)
+        self.assertEqual("c", config.language_get())
+        self.assertFalse(config.quiet_get())
+
+        # Success if 'paths_set' invalidates the cached license listing
+        # without an explicit 'licenses_probe'
+        self.assertNotIn("isc", config.licenses_list())
+        for license_file in license_files:
+            with open(license_file, "w", encoding="utf-8"):
+                pass
+        config.paths_set(config=self.tmp_dir.name, license=self.tmp_dir.name)
+        self.assertIn("isc", config.licenses_list())
+        self.assertEqual("c", config.language_get())
+
+        for file_name in license_files + [conf_file]:
+            os.remove(file_name)
+
     def test_basepath_fetch(self):
         basepath = SkaffConfig.basepath_fetch()
 
         self.assertTrue(os.path.isdir(basepath))
         self.assertTrue(os.path.isabs(basepath))
 
+    def test_derive(self):
+        directory = self.tmp_dir.name + "derived" + os.sep
+        self.config.authors_set(["Edsger Dijkstra"])
+        self.config.license_set("bsd3")
+
+        derived = self.config.derive(license="mit", directories=[directory])
+        self.assertEqual("mit", derived.license_get())
+        self.assertEqual((directory,), derived.directories_get())
+        # Success if the attributes not given are inherited
+        self.assertEqual(self.config.authors_get(), derived.authors_get())
+        self.assertEqual(self.config.subdirectories_get(),
+                         derived.subdirectories_get())
+        self.assertEqual("bsd3", self.config.license_get())
+        self.assertEqual((self.tmp_dir.name,), self.config.directories_get())
+
+        # Success if the shared containers are copied on write by either side
+        derived.author_add("Tony Hoare")
+        self.config.subdirectory_add("benchmarks")
+        self.assertNotIn("Tony Hoare", self.config.authors_get())
+        self.assertNotIn("benchmarks" + os.sep, derived.subdirectories_get())
+        self.config.directory_add(directory + "other")
+        self.assertEqual((directory,), derived.directories_get())
+
+        # Success if a derived instance can be derived again
+        self.assertEqual("gpl3", derived.derive(license="gpl3").license_get())
+        self.assertEqual("mit", derived.license_get())
+
+        # Fail due to unknown keyword argument
+        with self.assertRaises(TypeError):
+            self.config.derive(licence="mit")
+
+        # Fail due to invalid value (reported on first use, like the
+        # constructor)
+        with self.assertRaises(ValueError):
+            self.config.derive(license="unknown").license_get()
+
     def test_directories_set(self):
         # Identical to 'test_authors_set' because the similarity between
         # the 2 mutator member functions; may be expanded later on if new
@@ -193,6 +302,38 @@ class TestConfig(unittest.TestCase):
         self.config.directories_set(directories)
         self.assertCountEqual(directories, self.config.directories_get())
 
+    def test_directories_update(self):
+        directories = ["Gemini", "Mercury" + os.sep]
+        invalid = ["Vostok", str(), "\n", 0]
+
+        # Fail due to non-iterable type
+        with self.assertRaises(TypeError):
+            self.config.directories_update(None)
+
+        # Fail due to non-containerized string type
+        with self.assertRaises(TypeError):
+            self.config.directories_update(directories[0])
+
+        # Fail due to the existence of non-string type
+        with self.assertRaises(TypeError) as context:
+            self.config.directories_update(invalid)
+        self.assertIn("3 invalid", str(context.exception))
+        self.assertFalse(self.config.directory_contains(invalid[0]))
+
+        # Fail due to the existence of empty and non-printable strings
+        del invalid[-1]
+        with self.assertRaises(ValueError) as context:
+            self.config.directories_update(invalid)
+        self.assertIn("2 invalid", str(context.exception))
+
+        # Success; separators are appended and duplicates are ignored
+        self.config.directories_update(iter(directories * 2))
+        for directory in directories:
+            self.assertTrue(self.config.directory_contains(directory))
+        counter = collections.Counter(self.config.directories_get())
+        self.assertEqual(1, counter["Gemini" + os.sep])
+        self.assertIn(self.tmp_dir.name, self.config.directories_get())
+
     def test_directory_add(self):
         # Again, identical to 'test_author_add'.
         # This "magic number" is questionable;
@@ -253,6 +394,31 @@ class TestConfig(unittest.TestCase):
         self.assertNotIn(directory_discarded + os.sep,
                          self.config.directories_get())
 
+    def test_directory_contains(self):
+        directory = "Voyager"
+
+        # Fail due to wrong type for the 'directory' argument
+        with self.assertRaises(TypeError):
+            self.config.directory_contains(None)
+
+        self.assertFalse(self.config.directory_contains(str()))
+        self.assertFalse(self.config.directory_contains(directory))
+
+        self.config.directory_add(directory)
+        # Success regardless of the trailing separator or redundant components
+        self.assertTrue(self.config.directory_contains(directory))
+        self.assertTrue(self.config.directory_contains(directory + os.sep))
+        self.assertTrue(self.config.directory_contains(
+            "." + os.sep + directory + os.sep + "." + os.sep))
+
+        # Success if normalized duplicates are not added twice
+        self.config.directory_add("." + os.sep + directory)
+        counter = collections.Counter(self.config.directories_get())
+        self.assertEqual(1, counter[directory + os.sep])
+
+        self.config.directory_discard(directory + os.sep + ".")
+        self.assertFalse(self.config.directory_contains(directory))
+
     def test_directories_get(self):
         # Test directory names with non-ascii characters
         directories = ["Αντικύθηρα" + os.sep, "Ουροβόρος όφις" + os.sep]
@@ -262,6 +428,61 @@ class TestConfig(unittest.TestCase):
         get_result = self.config.directories_get()
         self.assertCountEqual(directories, get_result)
 
+        # Success if the sorted view is cached until the next mutation
+        self.assertIs(get_result, self.config.directories_get())
+        self.config.directory_add("Μηχανισμός")
+        self.assertIsNot(get_result, self.config.directories_get())
+        self.assertIn("Μηχανισμός" + os.sep, self.config.directories_get())
+
+    def test_hooks_set(self):
+        hooks = {"post_project": ["git init", ("cmake", "-S", ".")]}
+
+        # Success if there is no hook by default
+        self.assertFalse(any(self.config.hooks_get().values()))
+
+        self.config.hooks_set(hooks)
+        self.assertEqual([("git", "init"), ("cmake", "-S", ".")],
+                         [hook.command
+                          for hook in self.config.hooks_get("post_project")])
+        self.assertEqual(tuple(), self.config.hooks_get("pre_tree"))
+
+        # Fail due to unknown phase
+        with self.assertRaises(ValueError):
+            self.config.hooks_set({"post_lunch": ["git init"]})
+
+        # Fail due to a single command instead of an iterable of commands
+        with self.assertRaises(TypeError):
+            self.config.hooks_set({"post_project": "git init"})
+
+    def test_hook_add(self):
+        self.config.hook_add("post_batch", "make -C build", timeout=60)
+        self.config.hook_add("post_batch", ["ctest"])
+
+        hooks = self.config.hooks_get("post_batch")
+        self.assertEqual(("make", "-C", "build"), hooks[0].command)
+        self.assertEqual(60, hooks[0].timeout)
+        self.assertEqual(("ctest",), hooks[1].command)
+
+        # Success if the derived instance does not share later additions
+        derived = self.config.derive()
+        derived.hook_add("post_batch", "true")
+        self.assertEqual(2, len(self.config.hooks_get("post_batch")))
+
+        # Fail due to unknown phase
+        with self.assertRaises(ValueError):
+            self.config.hook_add("post_lunch", "git init")
+
+    def test_hook_discard(self):
+        self.config.hooks_set({"pre_tree": ["true", "false", "true"]})
+        self.config.hook_discard("pre_tree", "true")
+        self.assertEqual([("false",)],
+                         [hook.command
+                          for hook in self.config.hooks_get("pre_tree")])
+
+        # Success if discarding a hook that does not exist does nothing
+        self.config.hook_discard("pre_tree", "git init")
+        self.assertEqual(1, len(self.config.hooks_get("pre_tree")))
+
     def test_language_set(self):
         language = "Svenska"
         languages = self.config.languages_list()
@@ -537,12 +758,13 @@ class TestConfig(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.config.paths_get(None)
 
-        # Success if the dictionary returned is a deep copy;
+        # Success if the mapping returned is read-only;
         # so the internal 'database' would not be accidentally altered
         self.config.paths_set()
         result_dict = self.config.paths_get()
         for key in keys:
-            result_dict[key] = None
+            with self.assertRaises(TypeError):
+                result_dict[key] = None
             self.assertIsInstance(self.config.paths_get(key), str)
 
         # Success if the list returned contains the corresponding paths
@@ -600,6 +822,24 @@ class TestConfig(unittest.TestCase):
         self.config.subdirectories_set(subdirectories)
         self.assertCountEqual(subdirectories, self.config.subdirectories_get())
 
+    def test_subdirectories_update(self):
+        subdirectories = ["docs", "scripts" + os.sep]
+
+        # Fail due to non-iterable type
+        with self.assertRaises(TypeError):
+            self.config.subdirectories_update(None)
+
+        # Fail due to the existence of empty and non-printable strings
+        with self.assertRaises(ValueError) as context:
+            self.config.subdirectories_update(["bin", str(), "\t"])
+        self.assertIn("2 invalid", str(context.exception))
+        self.assertNotIn("bin" + os.sep, self.config.subdirectories_get())
+
+        # Success
+        self.config.subdirectories_update(subdirectories)
+        self.assertIn("docs" + os.sep, self.config.subdirectories_get())
+        self.assertIn("scripts" + os.sep, self.config.subdirectories_get())
+
     def test_subdirectory_add(self):
         # Again, identical to 'test_directory_add'.
         # This "magic number" is questionable;
@@ -670,6 +910,94 @@ class TestConfig(unittest.TestCase):
         self.config.subdirectories_set(subdirectories)
         get_result = self.config.subdirectories_get()
         self.assertCountEqual(subdirectories, get_result)
+
+    def test_templates_set(self):
+        cmake_file = "c" + os.sep + "CMakeLists.txt"
+
+        # Success if all the templates are enabled by default
+        self.assertIn(cmake_file, self.config.templates_get())
+        self.assertIn("Doxyfile", self.config.templates_get())
+
+        self.config.templates_set([cmake_file])
+        self.assertEqual((cmake_file,), self.config.templates_get())
+        self.config.template_discard(cmake_file)
+        self.assertEqual(tuple(), self.config.templates_get())
+        self.config.template_add("Doxyfile")
+        self.assertEqual(("Doxyfile",), self.config.templates_get())
+
+        # Fail due to unknown template
+        with self.assertRaises(ValueError):
+            self.config.templates_set(["c" + os.sep + "Makefile"])
+
+        with self.assertRaises(ValueError):
+            self.config.template_add("Makefile")
+
+        # Fail due to wrong type of argument
+        with self.assertRaises(TypeError):
+            self.config.templates_set("Doxyfile")
+
+    def test_template_resolve(self):
+        system_entry = self.config.template_resolve("gitignore.txt")
+        user_template_path = self.tmp_dir.name + "template" + os.sep
+        user_gitignore = user_template_path + "gitignore.txt"
+
+        self.assertTrue(os.path.isfile(system_entry.path))
+        self.assertEqual(os.path.getsize(system_entry.path), system_entry.size)
+
+        # Success if the 'user' template overrides the 'system' one
+        os.mkdir(user_template_path)
+        with open(user_gitignore, "w", encoding="utf-8") as gitignore:
+            gitignore.write("*.o\n")
+        self.config.paths_set(template=user_template_path)
+        self.config.templates_probe()
+        user_entry = self.config.template_resolve("gitignore.txt")
+        self.assertEqual(user_gitignore, user_entry.path)
+        self.assertEqual(4, user_entry.size)
+        self.assertIn(user_gitignore, self.config.templates_get(fullname=True))
+
+        # Fail due to non-existent template
+        with self.assertRaises(FileNotFoundError):
+            self.config.template_resolve("Makefile")
+
+    def test__load(self):
+        conf_file = self.tmp_dir.name + "skaff.conf"
+
+        # Success if the 'system' layer provides the stock defaults
+        self.config.paths_set(config=self.tmp_dir.name)
+        self.assertEqual("c", self.config._load()["language"])
+
+        with open(conf_file, "w", encoding="utf-8") as conf:
+            conf.write("[skaff]\nlanguage = cpp\nlicense = gpl2\n")
+
+        # Success if the 'user' layer is picked up by the constructor while
+        # keyword arguments still take precedence
+        config = SkaffConfig((self.tmp_dir.name,),
+                             license="mit",
+                             paths={"config": self.tmp_dir.name})
+        self.assertEqual("cpp", config.language_get())
+        self.assertEqual("mit", config.license_get())
+        os.remove(conf_file)
+
+    def test__save(self):
+        conf_file = self.tmp_dir.name + "skaff.conf"
+        authors = ("Frances Allen", "John Backus")
+
+        self.config.authors_set(authors)
+        self.config.hook_add("post_project", "git init")
+        self.config.license_set("bsd3")
+        self.config.quiet_set(False)
+        self.config._save(conf_file)
+
+        config = SkaffConfig((self.tmp_dir.name,),
+                             paths={"config": self.tmp_dir.name})
+        self.assertCountEqual(authors, config.authors_get())
+        self.assertEqual("bsd3", config.license_get())
+        self.assertFalse(config.quiet_get())
+        self.assertEqual(self.config.hooks_get("post_project"),
+                         config.hooks_get("post_project"))
+        self.assertCountEqual(self.config.subdirectories_get(),
+                              config.subdirectories_get())
+        os.remove(conf_file)
 # --------------------------------- CLASSES -----------------------------------
 
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for conftools module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import marshal
+import os
+import tempfile
+import unittest
+
+from skaff.conftools import (
+    conf_environ_get,
+    conf_layers_get,
+    conf_load,
+    conf_parse,
+    conf_snapshot_get,
+    conf_write
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class TestConfTools(unittest.TestCase):
+    """
+    Unit testing suite for 'conftools' module.
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        if not self.tmp_dir.name.endswith(os.sep):
+            self.tmp_dir.name += os.sep
+        self.user_dir = self.tmp_dir.name + "user" + os.sep
+        self.project_dir = self.tmp_dir.name + "project" + os.sep
+        self.cache_file = self.tmp_dir.name + "cache" + os.sep + "conf"
+        os.mkdir(self.user_dir)
+        os.mkdir(self.project_dir)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _conf_create(self, conf_file, text, age=60):
+        # Makes the file old enough to be cached as a snapshot
+        with open(conf_file, "w", encoding="utf-8") as conf:
+            conf.write(text)
+        timestamp = os.stat(conf_file).st_mtime - age
+        os.utime(conf_file, (timestamp, timestamp))
+
+    def test_conf_environ_get(self):
+        environ = {"SKAFF_AUTHORS": os.pathsep.join(("Ken", "Dennis")),
+                   "SKAFF_LICENSE": "mit",
+                   "SKAFF_QUIET": "off",
+                   "SKAFF_LANGUAGE": str()}
+
+        result = conf_environ_get(environ)
+        self.assertEqual(["Ken", "Dennis"], result["authors"])
+        self.assertEqual("mit", result["license"])
+        self.assertIs(False, result["quiet"])
+        # Empty variables are not part of the result
+        self.assertNotIn("language", result)
+
+        # Fail due to non-boolean value
+        with self.assertRaises(ValueError):
+            conf_environ_get({"SKAFF_QUIET": "maybe"})
+
+    def test_conf_layers_get(self):
+        layers = conf_layers_get(self.user_dir, self.project_dir)
+
+        self.assertEqual(3, len(layers))
+        self.assertTrue(os.path.isfile(layers[0]))
+        self.assertEqual(self.user_dir + "skaff.conf", layers[1])
+        self.assertEqual(self.project_dir + ".skaff.conf", layers[2])
+
+        # Fail due to wrong type of path
+        with self.assertRaises(TypeError):
+            conf_layers_get(0)
+
+    def test_conf_load(self):
+        self._conf_create(self.user_dir + "skaff.conf",
+                          "[skaff]\nlicense = gpl3\nquiet = no\n"
+                          "[paths]\nlicense = /opt/license/\n")
+        self._conf_create(self.project_dir + ".skaff.conf",
+                          "[skaff]\nlicense = mit\n")
+        arguments = dict(user_path=self.user_dir,
+                         project_path=self.project_dir,
+                         environ={"SKAFF_QUIET": "yes"},
+                         cache_path=self.cache_file)
+
+        result = conf_load(**arguments)
+        # Defaults from the 'system' layer
+        self.assertEqual("c", result["language"])
+        self.assertIn("build", result["subdirectories"])
+        # The 'project-local' layer overrides the 'user' layer, which is in
+        # turn overridden by the environment
+        self.assertEqual("mit", result["license"])
+        self.assertIs(True, result["quiet"])
+        self.assertEqual("/opt/license/", result["paths"]["license"])
+
+        # Success if the result can be modified without affecting later calls
+        result["license"] = "bsd3"
+        self.assertEqual("mit", conf_load(**arguments)["license"])
+
+    def test_conf_parse(self):
+        conf_file = self.tmp_dir.name + "skaff.conf"
+        self._conf_create(conf_file,
+                          "[skaff]\n"
+                          "authors =\n    Grace Hopper\n    Hopper, Grace\n"
+                          "language = cpp\n"
+                          "quiet = true\n"
+                          "subdirectories = cmake/modules\n"
+                          "unknown = ignored\n"
+                          "[hooks]\n"
+                          "post_project =\n    git init\n    make\n"
+                          "post_lunch = ignored\n")
+
+        result = conf_parse(conf_file)
+        self.assertEqual(["Grace Hopper", "Hopper, Grace"], result["authors"])
+        self.assertEqual("cpp", result["language"])
+        self.assertIs(True, result["quiet"])
+        self.assertEqual(["cmake" + os.sep + "modules"],
+                         result["subdirectories"])
+        self.assertNotIn("unknown", result)
+        self.assertEqual({"post_project": ["git init", "make"]},
+                         result["hooks"])
+
+        # Fail due to non-boolean value
+        self._conf_create(conf_file, "[skaff]\nquiet = sometimes\n")
+        with self.assertRaises(ValueError):
+            conf_parse(conf_file)
+
+    def test_conf_snapshot_get(self):
+        conf_file = self.user_dir + "skaff.conf"
+        self._conf_create(conf_file, "[skaff]\nlicense = gpl2\n")
+        layers = [conf_file, self.project_dir + ".skaff.conf"]
+
+        result = conf_snapshot_get(layers, self.cache_file)
+        self.assertEqual({"license": "gpl2"}, result)
+        self.assertTrue(os.path.isfile(self.cache_file))
+
+        # Success if the snapshot is served from the cache file without
+        # parsing the layers again: break the source file, keep its stamp
+        with open(self.cache_file, "rb") as cache:
+            version, stamps, merged = marshal.load(cache)
+        merged["license"] = "bsd3"
+        with open(self.cache_file, "wb") as cache:
+            marshal.dump((version, stamps, merged), cache)
+        other_cache = self.cache_file + ".copy"
+        os.rename(self.cache_file, other_cache)
+        self.assertEqual("bsd3",
+                         conf_snapshot_get(layers, other_cache)["license"])
+
+        # Success if a modified layer invalidates the snapshot
+        self._conf_create(conf_file, "[skaff]\nlicense = mit\n", age=30)
+        self.assertEqual("mit",
+                         conf_snapshot_get(layers, other_cache)["license"])
+
+        # Racily modified files are parsed but not written to the cache
+        racy_cache = self.cache_file + ".racy"
+        self._conf_create(conf_file, "[skaff]\nlicense = bsd2\n", age=0)
+        self.assertEqual("bsd2",
+                         conf_snapshot_get(layers, racy_cache)["license"])
+        self.assertFalse(os.path.exists(racy_cache))
+
+    def test_conf_write(self):
+        conf_file = self.user_dir + "nested" + os.sep + "skaff.conf"
+        settings = {"authors": ["Barbara Liskov"],
+                    "language": "cpp",
+                    "license": "bsd3",
+                    "hooks": {"post_batch": ["make -C 'build dir'"]},
+                    "paths": {"template": "/opt/template/"},
+                    "quiet": False,
+                    "subdirectories": ["src", "cmake" + os.sep + "modules"]}
+
+        conf_write(conf_file, settings)
+        self.assertEqual(settings, conf_parse(conf_file))
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,13 +4,20 @@
 Unit testing suite for driver module.
 """
 # --------------------------------- MODULES -----------------------------------
+import json
 import os
+import shutil
+import subprocess
+import sys
 import unittest
 
 from tempfile import TemporaryDirectory
+from unittest import mock
 
 # Avoid import globbing: each function is imported separately instead.
 import skaff
+import skaff.driver
+import skaff.layouttools
 # --------------------------------- MODULES -----------------------------------
 
 
@@ -26,6 +33,7 @@ class TestDriver(unittest.TestCase):
         # NOTE: the 'directories' argument needs to be an iterable;
         # a tuple (denoted by an extra comma inside the parentheses) is used.
         self.config = skaff.SkaffConfig((self.tmp_dir.name,))
+        self.job = skaff.job_create(self.tmp_dir.name, self.config)
 
     def tearDown(self):
         # No need to invoke 'directory_discard' since for each test member
@@ -41,25 +49,249 @@ class TestDriver(unittest.TestCase):
         with self.assertRaises(FileExistsError):
             skaff.skaff_drive(self.config)
 
-    def test__arguments_check(self):
-        # Fail because 'directory' does not exist
-        with self.assertRaises(ValueError):
-            # This 'tmp_dir' only exist within the scope of context manager
-            with TemporaryDirectory() as tmp_dir:
-                self.config.directory_add(tmp_dir)
-            skaff._arguments_check(tmp_dir, self.config)
-        self.config.directory_discard(tmp_dir)
+    def test_skaff_drive_hooks(self):
+        directories = (self.tmp_dir.name + "alpha", self.tmp_dir.name + "beta")
+        marker = ("import os; "
+                  "open(os.environ['SKAFF_PHASE'], 'w').close()")
+        config = self.config.derive(directories=directories, quiet=True)
+
+        config.hook_add("post_license", [sys.executable, "-c", marker])
+        config.hook_add("post_project", [sys.executable, "-c", marker])
+        config.hook_add("post_batch",
+                        [sys.executable, "-c",
+                         "import os; print(os.environ['SKAFF_DIRECTORIES'])"])
+        results = skaff.skaff_drive(config, hook_workers=2)
+
+        # Success if every hook ran (once per project except 'post_batch')
+        self.assertEqual(5, len(results))
+        self.assertTrue(all(0 == result.returncode for result in results))
+        self.assertEqual("post_batch", results[-1].phase)
+        for directory in directories:
+            self.assertIn(directory, results[-1].output)
+            for phase in ("post_license", "post_project"):
+                self.assertTrue(os.path.isfile(directory + os.sep + phase))
+
+        # Fail because a failing 'pre_tree' hook stops the generation before
+        # anything of the project is written
+        config = self.config.derive(directories=(self.tmp_dir.name + "gamma",),
+                                    quiet=True)
+        config.hook_add("pre_tree", [sys.executable, "-c", "exit(1)"])
+        with self.assertRaises(RuntimeError):
+            skaff.skaff_drive(config)
+        self.assertFalse(os.path.isdir(self.tmp_dir.name + "gamma"))
+
+    @unittest.skipIf(shutil.which("git") is None, "'git' is not installed")
+    def test_skaff_drive_git_init(self):
+        directory = self.tmp_dir.name + "alpha" + os.sep
+        config = self.config.derive(directories=(directory,), quiet=True)
+
+        config.hook_add("post_project",
+                        [sys.executable, "-c",
+                         "import os; os.mkdir('build'); "
+                         "open(os.path.join('build', 'artifact.o'), "
+                         "'w').close(); open('hooked', 'w').close()"])
+        skaff.skaff_drive(config, git_init=True)
+        # Success if the generated files are committed and the index is clean
+        self.assertTrue(os.path.isfile(directory + ".git" + os.sep + "HEAD"))
+        self.assertTrue(os.path.isfile(directory + ".git" + os.sep + "index"))
+        # Success if none of the files created by the hooks is committed
+        tracked = subprocess.run(("git", "ls-files"),
+                                 cwd=directory,
+                                 stdout=subprocess.PIPE,
+                                 check=True).stdout.decode().splitlines()
+        self.assertIn("CMakeLists.txt", tracked)
+        self.assertIn(".gitignore", tracked)
+        self.assertNotIn("build/artifact.o", tracked)
+        self.assertNotIn("hooked", tracked)
+
+    def test_skaff_drive_staging(self):
+        directory = self.tmp_dir.name + "alpha" + os.sep
+        config = self.config.derive(directories=(directory,), quiet=True)
+        stale = self.tmp_dir.name + skaff.STAGE_PREFIX +\
+            skaff.stagetools._stage_host_get() + "-0-stale"
+        os.makedirs(stale + os.sep + "alpha")
+
+        # Fail without leaving anything behind if the generation fails
+        # halfway; the stale staging directory is removed on the way
+        with mock.patch.object(skaff.driver, "_doc_create",
+                               side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                skaff.skaff_drive(config)
+        self.assertEqual([], os.listdir(self.tmp_dir.name))
+
+        # Success if the next run generates the project with the same files
+        # as generating it in place, staged under another directory
+        with TemporaryDirectory() as stage_directory:
+            skaff.skaff_drive(config, stage_directory=stage_directory)
+            self.assertEqual([], os.listdir(stage_directory))
+        self.assertEqual(["alpha"], os.listdir(self.tmp_dir.name))
+        with open(directory + "README.md", "r") as readme_file:
+            self.assertIn("![{0}]".format(directory[:-1]), readme_file.read())
+        self.assertTrue(os.path.isdir(directory + "include" + os.sep +
+                                      "alpha"))
+
+    def test_skaff_drive_stream(self):
+        directories = [self.tmp_dir.name + name + os.sep
+                       for name in ("alpha", "beta", "gamma")]
+        config = self.config.derive(quiet=True)
+        config.hook_add("post_batch",
+                        [sys.executable, "-c",
+                         ("import os; print(open(os.environ"
+                          "['SKAFF_DIRECTORIES_FILE']).read())")])
+
+        # Success if the streamed projects are generated a chunk at a time
+        # instead of the one tracked by 'config'
+        streamed = list()
+        with mock.patch.object(skaff.driver, "_STREAM_CHUNK", 2):
+            results = skaff.skaff_drive(config,
+                                        directories=iter(directories),
+                                        hook_callback=streamed.append)
+        # Success if the results are handed to 'hook_callback' instead of
+        # being kept
+        self.assertEqual([], results)
+        self.assertEqual(directories, streamed[-1].output.split())
+        self.assertFalse(os.path.exists(self.tmp_dir.name + "README.md"))
+        for directory in directories:
+            self.assertTrue(os.path.isfile(directory + "README.md"))
+        # The listing is removed after the 'post_batch' hooks
+        self.assertEqual([], [name for name in os.listdir(self.tmp_dir.name)
+                              if name.endswith(".list")])
 
-        # Fail because 'directory' is not in 'config'
+    def test_skaff_drive_resume(self):
+        directories = [self.tmp_dir.name + name + os.sep
+                       for name in ("alpha", "beta", "gamma")]
+        config = self.config.derive(directories=directories, quiet=True)
+        journal = self.tmp_dir.name + "journal"
+        build = skaff.driver._project_build
+
+        def _project_build(job, *args, **kwargs):
+            if job.directory in directories[1:]:
+                raise KeyboardInterrupt
+            return build(job, *args, **kwargs)
+
+        # Fail due to resuming without a journal
         with self.assertRaises(ValueError):
-            self.config.directory_discard(self.tmp_dir.name)
-            skaff._arguments_check(self.tmp_dir.name, self.config)
-        self.config.directory_add(self.tmp_dir.name)
+            skaff.skaff_drive(config, resume=True)
 
-    def test__conf_doc_prompt(self):
-        # Omitted because this is an interactive UI-related function
-        # and the author does not know how to test it properly
-        pass
+        # A batch interrupted after the first project
+        with mock.patch.object(skaff.driver, "_project_build",
+                               _project_build):
+            with self.assertRaises(KeyboardInterrupt):
+                skaff.skaff_drive(config, journal=journal)
+        self.assertTrue(os.path.isdir(directories[0]))
+        self.assertFalse(os.path.exists(directories[1]))
+        # Leftover of a project interrupted while it was staged
+        stage = skaff.stage_create(directories[2])
+        os.mkdir(stage)
+        with open(journal, "a") as journal_file:
+            journal_file.write("start\t{0}\t{1}\n".format(directories[2],
+                                                          stage))
+
+        # Fail without removing anything if a started project-directory
+        # exists, since it may not have been written by skaff
+        os.mkdir(directories[2])
+        open(directories[2] + "data", "w").close()
+        with self.assertRaises(FileExistsError):
+            skaff.skaff_drive(config, journal=journal, resume=True)
+        self.assertTrue(os.path.isfile(directories[2] + "data"))
+        self.assertTrue(os.path.isdir(stage))
+        shutil.rmtree(directories[2])
+
+        # Success if the committed project is left untouched, the staging
+        # directory is removed and the rest is generated
+        with open(directories[0] + "README.md", "a") as readme_file:
+            readme_file.write("edited\n")
+        skaff.skaff_drive(config, journal=journal, resume=True)
+        self.assertFalse(os.path.exists(os.path.dirname(stage[:-1])))
+        with open(directories[0] + "README.md", "r") as readme_file:
+            self.assertTrue(readme_file.read().endswith("edited\n"))
+        for directory in directories[1:]:
+            self.assertTrue(os.path.isfile(directory + "README.md"))
+        with skaff.Journal(journal, resume=True) as journal_file:
+            self.assertTrue(all(journal_file.committed_contains(directory)
+                                for directory in directories))
+            self.assertEqual(set(), journal_file.partial_get())
+
+        # Success if the committed projects are skipped however their names
+        # are spelled
+        skaff.skaff_drive(config, journal=journal, resume=True,
+                          directories=(directory + os.curdir
+                                       for directory in directories))
+
+    def _drive_edited(self, config, **kwargs):
+        """
+        Calls 'skaff_drive' with an editor that records the files it is given
+        and returns the list of its invocations.
+        """
+        record = self.tmp_dir.name + "editor.txt"
+        editor = self.tmp_dir.name + "editor.py"
+        environ_editor = os.environ.get("EDITOR")
+
+        with open(editor, "w") as editor_file:
+            editor_file.write("import json, sys\n"
+                              "with open({0!r}, 'a') as record:\n"
+                              "    record.write(json.dumps(sys.argv[1:]))\n"
+                              "    record.write('\\n')\n".format(record))
+
+        try:
+            os.environ["EDITOR"] = " ".join((sys.executable, editor))
+            skaff.skaff_drive(config, **kwargs)
+        finally:
+            if environ_editor is None:
+                del os.environ["EDITOR"]
+            else:
+                os.environ["EDITOR"] = environ_editor
+
+        if not os.path.isfile(record):
+            return list()
+
+        with open(record, "r") as record_file:
+            return [json.loads(line) for line in record_file]
+
+    def test_skaff_drive_batch_edit(self):
+        directories = (self.tmp_dir.name + "alpha", self.tmp_dir.name + "beta")
+        config = self.config.derive(directories=directories, quiet=False)
+        invocations = self._drive_edited(config, batch_edit=True)
+
+        # Success if all the files are opened in a single editor invocation
+        self.assertEqual([[directory + os.sep + conf_file
+                           for directory in directories
+                           for conf_file in ("CMakeLists.txt", "Doxyfile")]],
+                         invocations)
+
+    def test_skaff_drive_pipeline(self):
+        directories = [self.tmp_dir.name + name
+                       for name in ("alpha", "beta", "gamma")]
+        config = self.config.derive(directories=directories, quiet=False)
+        prompted = list()
+
+        def _conf_prompt(job):
+            # Every project is fully generated before it is handed over
+            self.assertTrue(os.path.isfile(job.directory + "Doxyfile"))
+            prompted.append(job.directory)
+            return "k" if 1 == len(prompted) else "c"
+
+        with mock.patch.object(skaff.driver, "_conf_prompt", _conf_prompt):
+            invocations = self._drive_edited(config)
+
+        # Success if every project is prompted for once, and the ones not
+        # skipped are edited in the order they are prompted for
+        self.assertCountEqual([directory + os.sep
+                               for directory in directories], prompted)
+        self.assertEqual([[directory + conf_file]
+                          for directory in prompted[1:]
+                          for conf_file in ("CMakeLists.txt", "Doxyfile")],
+                         invocations)
+
+        # Success if nothing is edited once all the rest are skipped
+        config = self.config.derive(directories=(self.tmp_dir.name + "delta",
+                                                 self.tmp_dir.name + "zeta"),
+                                    quiet=False)
+        with mock.patch.object(skaff.driver, "_conf_prompt",
+                               mock.Mock(return_value="a")) as prompt:
+            os.remove(self.tmp_dir.name + "editor.txt")
+            self.assertEqual([], self._drive_edited(config))
+            self.assertEqual(1, prompt.call_count)
 
     def test__conf_edit(self):
         # Omitted because this is an interactive UI-related function
@@ -70,7 +302,7 @@ class TestDriver(unittest.TestCase):
         conf_files = frozenset((".editorconfig", ".gdbinit", ".gitattributes",
                                 ".gitignore", ".travis.yml", "CMakeLists.txt"))
 
-        skaff._conf_spawn(self.tmp_dir.name, self.config)
+        skaff._conf_spawn(self.job)
         for conf_file in conf_files:
             self.assertTrue(os.path.isfile(self.tmp_dir.name + conf_file))
         # Fail because of newly spawned configuration files
@@ -83,7 +315,7 @@ class TestDriver(unittest.TestCase):
         docs = frozenset(("CHANGELOG.md", "Doxyfile", "README.md"))
         licenses = frozenset(self.config.licenses_list())
 
-        skaff._doc_create(self.tmp_dir.name, self.config)
+        skaff._doc_create(self.job)
         for doc in docs:
             self.assertTrue(os.path.isfile(self.tmp_dir.name + doc))
         # Fail because of newly created documentation
@@ -95,7 +327,8 @@ class TestDriver(unittest.TestCase):
         # ensure that correct 'README.md' is created
         for license in licenses:
             self.config.license_set(license)
-            skaff._doc_create(self.tmp_dir.name, self.config)
+            skaff._doc_create(skaff.job_create(self.tmp_dir.name,
+                                               self.config))
             with open(self.tmp_dir.name + "README.md", "r") as readme_file:
                 self.assertIn(license.upper(), readme_file.read())
 
@@ -138,7 +371,7 @@ class TestDriver(unittest.TestCase):
                              "\n")
 
     def test__doxyfile_generate(self):
-        skaff._doxyfile_generate(self.tmp_dir.name, self.config)
+        skaff._doxyfile_generate(self.job)
         self.assertTrue(os.path.isfile(self.tmp_dir.name + "Doxyfile"))
         # Fail because of newly created documentation
         # the 'directory' is no longer empty
@@ -146,12 +379,53 @@ class TestDriver(unittest.TestCase):
             os.rmdir(self.tmp_dir.name)
 
     def test__license_sign(self):
-        skaff._license_sign(self.tmp_dir.name, self.config)
+        # Fail because the helpers only accept a 'SkaffJob'
+        with self.assertRaises(ValueError):
+            skaff._license_sign((self.tmp_dir.name, self.config))
+
+        skaff._license_sign(self.job)
         self.assertTrue(os.path.isfile(self.tmp_dir.name + "LICENSE.txt"))
         # Fail because of newly created documentation
         # the 'directory' is no longer empty
         with self.assertRaises(OSError):
             os.rmdir(self.tmp_dir.name)
+
+    def test__project_tree_create(self):
+        directory = self.tmp_dir.name + "alpha" + os.sep
+        config = self.config.derive(directories=(directory,),
+                                    subdirectories=("doc" + os.sep + "api",
+                                                    "src", "src" + os.sep))
+        job = skaff.job_create(directory, config)
+
+        # Success if the parents missing from 'subdirectories' are created
+        # ahead of their children and duplicates are created once
+        self.assertEqual(("doc", "src", "doc" + os.sep + "api"),
+                         skaff.layouttools.tree_plan_get(job.subdirectories))
+        skaff.driver._project_tree_create(job)
+        for sub_dir in ("doc" + os.sep + "api", "src",
+                        "include" + os.sep + "alpha"):
+            self.assertTrue(os.path.isdir(directory + sub_dir))
+
+        # Fail because the subdirectory leads out of the project-directory
+        with self.assertRaises(ValueError):
+            skaff.layouttools.tree_plan_get(("src",
+                                             os.pardir + os.sep + "src"))
+
+    def test__source_size_get(self):
+        source = self.tmp_dir.name + "source.txt"
+        sizes = dict()
+
+        with open(source, "w") as source_file:
+            source_file.write("1234")
+
+        # Success if a missing source counts as empty and the sizes cached
+        # in 'sizes' are kept while the ones without it are looked at again
+        self.assertEqual(0, skaff.driver._source_size_get(None))
+        self.assertEqual(4, skaff.driver._source_size_get(source, sizes))
+        with open(source, "a") as source_file:
+            source_file.write("5678")
+        self.assertEqual(4, skaff.driver._source_size_get(source, sizes))
+        self.assertEqual(8, skaff.driver._source_size_get(source))
 # --------------------------------- CLASSES -----------------------------------
 
 if __name__ == "__main__":
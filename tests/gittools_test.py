@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for gittools module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import os
+import shutil
+import subprocess
+import unittest
+
+from tempfile import TemporaryDirectory
+from skaff.gittools import (
+    GitDefaults,
+    git_defaults_get,
+    git_repository_init,
+    git_repositories_init
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+@unittest.skipIf(shutil.which("git") is None, "'git' is not installed")
+class TestGitTools(unittest.TestCase):
+    """
+    Unit testing suite for 'gittools' module.
+    """
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        if not self.tmp_dir.name.endswith(os.sep):
+            self.tmp_dir.name += os.sep
+        self.defaults = GitDefaults(author="Ada <ada@example.com> 0 +0000",
+                                    committer="Ada <ada@example.com> 0 +0000",
+                                    branch="main")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _git(self, directory, *args):
+        return subprocess.run(("git",) + args,
+                              cwd=directory,
+                              stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT,
+                              check=True).stdout.decode()
+
+    def _project_create(self, name):
+        directory = self.tmp_dir.name + name + os.sep
+        os.makedirs(directory + "src" + os.sep + "empty")
+        with open(directory + "README.md", "w") as readme_file:
+            readme_file.write("# " + name + "\n")
+        with open(directory + "src" + os.sep + "main.c", "w") as main_file:
+            main_file.write("int main(void) { return 0; }\n")
+        with open(directory + "build.sh", "w") as script_file:
+            script_file.write("#!/bin/sh\n")
+        os.chmod(directory + "build.sh", 0o755)
+        return directory
+
+    def test_git_defaults_get(self):
+        environ = dict(os.environ,
+                       GIT_AUTHOR_NAME="Ada",
+                       GIT_AUTHOR_EMAIL="ada@example.com",
+                       GIT_COMMITTER_NAME="Grace",
+                       GIT_COMMITTER_EMAIL="grace@example.com")
+        defaults = git_defaults_get(environ)
+
+        self.assertTrue(defaults.author.startswith("Ada <ada@example.com> "))
+        self.assertTrue(
+            defaults.committer.startswith("Grace <grace@example.com> "))
+        self.assertTrue(defaults.branch)
+
+    def test_git_repository_init(self):
+        directory = self._project_create("alpha")
+
+        # Fail due to wrong type for the 'defaults' argument
+        with self.assertRaises(ValueError):
+            git_repository_init(directory, None)
+
+        commit = git_repository_init(directory, self.defaults)
+
+        # Success if the repository is consistent and identical to the one
+        # 'git add' and 'git commit' would have created
+        self._git(directory, "fsck", "--strict")
+        self.assertEqual(commit,
+                         self._git(directory, "rev-parse", "HEAD").strip())
+        self.assertEqual("main",
+                         self._git(directory, "symbolic-ref", "--short",
+                                   "HEAD").strip())
+        self.assertEqual(str(), self._git(directory, "status", "--porcelain"))
+        self.assertEqual(["100644 README.md", "100755 build.sh",
+                          "100644 src/main.c"],
+                         [line.split()[0] + " " + line.split()[-1]
+                          for line in self._git(directory, "ls-files",
+                                                "-s").splitlines()])
+        self.assertEqual("Initial commit",
+                         self._git(directory, "log", "--format=%s").strip())
+
+        # Fail because 'directory' is already a git repository
+        with self.assertRaises(FileExistsError):
+            git_repository_init(directory, self.defaults)
+
+        # Success if the ignored paths are left out
+        directory = self._project_create("beta")
+        os.makedirs(directory + "build")
+        for name in ("build" + os.sep + "main.o", "main.o", "keep.o"):
+            open(directory + name, "w").close()
+        with open(directory + ".gitignore", "w") as ignore_file:
+            ignore_file.write("# Objects\nbuild/\n*.o\n!keep.o\n")
+        git_repository_init(directory, self.defaults)
+        self.assertEqual([".gitignore", "README.md", "build.sh", "keep.o",
+                          "src/main.c"],
+                         self._git(directory, "ls-files").splitlines())
+
+        # Success if only the given 'paths' are committed
+        directory = self._project_create("gamma")
+        git_repository_init(directory, self.defaults,
+                            paths=("src" + os.sep + "main.c",))
+        self.assertEqual(["src/main.c"],
+                         self._git(directory, "ls-files").splitlines())
+        self.assertEqual("?? README.md\n?? build.sh\n",
+                         self._git(directory, "status", "--porcelain"))
+
+    def test_git_repositories_init(self):
+        directories = [self._project_create(name)
+                       for name in ("alpha", "beta", "gamma")]
+        commits = git_repositories_init(directories, "Import", 2,
+                                        self.defaults)
+
+        self.assertEqual(len(directories), len(commits))
+        for directory, commit in zip(directories, commits):
+            self.assertEqual(commit,
+                             self._git(directory, "rev-parse",
+                                       "HEAD").strip())
+
+        # Fail because every repository already exists
+        with self.assertRaises(FileExistsError):
+            git_repositories_init(directories, defaults=self.defaults)
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for hooktools module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import os
+import sys
+import time
+import unittest
+
+from tempfile import TemporaryDirectory
+from skaff.hooktools import (
+    Hook,
+    HookRunner,
+    hook_create,
+    hook_format,
+    hook_run
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class TestHookTools(unittest.TestCase):
+    """
+    Unit testing suite for 'hooktools' module.
+    """
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        if not self.tmp_dir.name.endswith(os.sep):
+            self.tmp_dir.name += os.sep
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _python_hook(self, code, timeout=None):
+        return hook_create((sys.executable, "-c", code), timeout)
+
+    def test_hook_create(self):
+        hook = hook_create("cmake -S . -B 'build dir'", 30)
+
+        self.assertEqual(("cmake", "-S", ".", "-B", "build dir"),
+                         hook.command)
+        self.assertEqual(30, hook.timeout)
+        # Success if the formatted command is parsed back to the same hook
+        self.assertEqual(hook.command,
+                         hook_create(hook_format(hook)).command)
+        self.assertEqual(Hook(("git", "init"), None),
+                         hook_create(["git", "init"]))
+
+        # Fail due to empty command
+        with self.assertRaises(ValueError):
+            hook_create(str())
+
+        # Fail due to non-positive timeout
+        with self.assertRaises(ValueError):
+            hook_create("git init", 0)
+
+        # Fail due to wrong type of command
+        with self.assertRaises(TypeError):
+            hook_create(None)
+
+    def test_hook_run(self):
+        hook = self._python_hook("import os; "
+                                 "print(os.environ['SKAFF_PHASE']); "
+                                 "print(os.getcwd())")
+
+        result = hook_run(hook, "post_project", self.tmp_dir.name)
+        self.assertEqual(0, result.returncode)
+        self.assertFalse(result.timed_out)
+        self.assertIn("post_project", result.output)
+        self.assertIn(os.path.realpath(self.tmp_dir.name[:-1]),
+                      result.output)
+
+        # Success if a hook exceeding its own timeout is reported as such
+        hook = self._python_hook("import time; time.sleep(10)", 0.2)
+        result = hook_run(hook, "post_project", self.tmp_dir.name, timeout=60)
+        self.assertTrue(result.timed_out)
+        self.assertIsNone(result.returncode)
+
+        # Success if a missing program is reported instead of raised
+        hook = hook_create(self.tmp_dir.name + "missing")
+        self.assertIsNone(hook_run(hook, "post_batch").returncode)
+
+        # Fail due to unknown phase
+        with self.assertRaises(ValueError):
+            hook_run(hook, "post_lunch")
+
+    def test_hook_runner(self):
+        sleep = self._python_hook("import time; time.sleep(0.5)")
+        fail = self._python_hook("import sys; sys.exit(3)")
+        echo = self._python_hook("print('unreachable')")
+
+        # Success if the hooks of different projects overlap
+        start = time.monotonic()
+        with HookRunner(workers=4) as runner:
+            for index in range(4):
+                runner.submit((sleep,), "post_project", str(index))
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertEqual(4, len(runner.results_get()))
+
+        # Success if the hooks of a phase stop at the first failure and
+        # 'after' keeps the phases in order
+        with HookRunner(workers=2) as runner:
+            first = runner.submit((sleep,), "post_license", "project")
+            second = runner.submit((fail, echo), "post_project", "project",
+                                   after=first)
+        results = runner.results_get()
+        self.assertEqual(["post_license", "post_project"],
+                         [result.phase for result in results])
+        self.assertEqual(3, second.result()[-1].returncode)
+
+        # Success if nothing is scheduled without hooks
+        runner = HookRunner()
+        self.assertIsNone(runner.submit(tuple(), "post_project"))
+        self.assertEqual(list(), runner.results_get())
+
+        # Success if the results are handed to the 'callback' instead of
+        # being kept
+        streamed = list()
+        with HookRunner(workers=2, callback=streamed.append) as runner:
+            runner.submit((sleep,), "post_license", "alpha")
+            runner.submit((fail, echo), "post_license", "beta")
+        self.assertEqual(list(), runner.results_get())
+        self.assertEqual(["alpha", "beta"],
+                         sorted(result.directory for result in streamed))
+
+        # Fail due to invalid number of workers
+        with self.assertRaises(ValueError):
+            HookRunner(workers=0)
+
+        # Fail due to a 'callback' that cannot be called
+        with self.assertRaises(ValueError):
+            HookRunner(callback=list())
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for jobtools module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import os
+import pickle
+import unittest
+
+from tempfile import TemporaryDirectory
+from skaff.config import SkaffConfig
+from skaff.jobtools import (
+    DigestSet,
+    SkaffJob,
+    job_check,
+    job_create,
+    job_directory_key,
+    job_root_get,
+    job_template_get,
+    jobs_create,
+    jobs_stream
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class TestJobTools(unittest.TestCase):
+    """
+    Unit testing suite for 'jobtools' module.
+    """
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        if not self.tmp_dir.name.endswith(os.sep):
+            self.tmp_dir.name += os.sep
+        self.directories = [self.tmp_dir.name + name + os.sep
+                            for name in ("alpha", "beta")]
+        self.config = SkaffConfig(self.directories,
+                                  authors=["Ada Lovelace"],
+                                  license="mit",
+                                  quiet=True)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_digest_set(self):
+        names = ["project{0}".format(index) for index in range(1000)]
+        digests = DigestSet(names[:10])
+
+        # Success if each name is only added once, across the growths of
+        # the table
+        self.assertEqual(10, len(digests))
+        self.assertEqual([False] * 10, [digests.add(name)
+                                        for name in names[:10]])
+        self.assertEqual([True] * 990, [digests.add(name)
+                                        for name in names[10:]])
+        self.assertEqual(1000, len(digests))
+        self.assertTrue(all(name in digests for name in names))
+        self.assertNotIn("project1000", digests)
+
+    def test_job_check(self):
+        job_check(job_create(self.directories[0], self.config))
+
+        # Fail due to a plain tuple with the same fields
+        with self.assertRaises(ValueError):
+            job_check(tuple(job_create(self.directories[0], self.config)))
+
+    def test_job_create(self):
+        job = job_create(self.directories[0][:-1], self.config)
+
+        self.assertEqual(self.directories[0], job.directory)
+        self.assertEqual(("Ada Lovelace",), job.authors)
+        self.assertEqual("mit", job.license)
+        self.assertEqual(self.config.license_get(fullname=True),
+                         list(job.license_sources))
+        self.assertTrue(job.quiet)
+
+        # Success if the job is immutable, hashable and survives pickling
+        with self.assertRaises(AttributeError):
+            job.quiet = False
+        self.assertEqual(job, pickle.loads(pickle.dumps(job)))
+        self.assertIn(job, {job})
+
+        # Success if later changes to 'config' do not affect the job
+        self.config.quiet_set(False)
+        self.assertTrue(job.quiet)
+
+        # Fail because the directory is not tracked by 'config'
+        with self.assertRaises(ValueError):
+            job_create(self.tmp_dir.name + "gamma", self.config)
+
+    def test_job_directory_key(self):
+        # Success if the names of the same project-directory share a key
+        self.assertEqual(job_directory_key("a"),
+                         job_directory_key(os.curdir + os.sep + "a" + os.sep))
+        self.assertNotEqual(job_directory_key("a"), job_directory_key("b"))
+
+    def test_job_root_get(self):
+        job = job_create(self.directories[0], self.config)
+        stage = self.tmp_dir.name + ".stage" + os.sep + "alpha" + os.sep
+
+        # Success if the files are written to the stage only while staged
+        self.assertIsNone(job.stage)
+        self.assertEqual(self.directories[0], job_root_get(job))
+        self.assertEqual(stage, job_root_get(job._replace(stage=stage)))
+
+    def test_job_template_get(self):
+        job = job_create(self.directories[0], self.config)
+        doxyfile = self.config.template_resolve("Doxyfile").path
+
+        self.assertEqual(doxyfile, job_template_get(job, "Doxyfile"))
+        # Success if every template is found by the binary search
+        self.assertEqual(sorted(job.templates), list(job.templates))
+        for template, path in job.templates:
+            self.assertEqual(path, job_template_get(job, template))
+
+        # Fail due to a template sorting between (or after) the enabled ones
+        for template in ("Doxyfilf", "~"):
+            with self.assertRaises(FileNotFoundError):
+                job_template_get(job, template)
+
+        # Fail because disabled templates are not part of the job
+        self.config.template_discard("Doxyfile")
+        job = job_create(self.directories[0], self.config)
+        with self.assertRaises(FileNotFoundError):
+            job_template_get(job, "Doxyfile")
+
+    def test_jobs_create(self):
+        jobs = list(jobs_create(self.config))
+
+        self.assertEqual(self.directories, [job.directory for job in jobs])
+        self.assertTrue(all(isinstance(job, SkaffJob) for job in jobs))
+        # Success if the resolved fields are shared instead of copied
+        self.assertIs(jobs[0].templates, jobs[1].templates)
+
+        # Fail due to wrong type for the 'config' argument
+        with self.assertRaises(ValueError):
+            jobs_create(None)
+
+    def test_jobs_stream(self):
+        names = [self.tmp_dir.name + "gamma",
+                 self.tmp_dir.name + "./gamma/",
+                 self.tmp_dir.name + "delta"]
+        names_iter = iter(names)
+        jobs = jobs_stream(self.config, names_iter)
+
+        # Success if the names are only read as the jobs are taken and need
+        # not be tracked by 'config'
+        self.assertEqual(names[0] + os.sep, next(jobs).directory)
+        self.assertEqual(names[1], next(names_iter))
+        self.assertEqual([names[2] + os.sep],
+                         [job.directory for job in jobs])
+
+        # Success if the duplicate is skipped
+        jobs = jobs_stream(self.config, names)
+        self.assertEqual([names[0] + os.sep, names[2] + os.sep],
+                         [job.directory for job in jobs])
+        jobs = list(jobs_stream(self.config, self.directories))
+        self.assertEqual(self.directories, [job.directory for job in jobs])
+        self.assertIs(jobs[0].templates, jobs[1].templates)
+
+        # Fail due to wrong types for the arguments
+        with self.assertRaises(ValueError):
+            jobs_stream(None, self.directories)
+        with self.assertRaises(TypeError):
+            jobs_stream(self.config, "alpha")
+        with self.assertRaises(TypeError):
+            list(jobs_stream(self.config, [None]))
+
+        # Fail due to an invalid name
+        with self.assertRaises(ValueError):
+            list(jobs_stream(self.config, ["alpha\nbeta"]))
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
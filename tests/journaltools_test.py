@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for journaltools module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import os
+import unittest
+
+from tempfile import TemporaryDirectory
+from skaff.journaltools import (
+    JOURNAL_HEADER,
+    Journal
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class TestJournalTools(unittest.TestCase):
+    """
+    Unit testing suite for 'journaltools' module.
+    """
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.path = self.tmp_dir.name + os.sep + "journal"
+        self.directories = ("alpha" + os.sep, "beta" + os.sep)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_journal(self):
+        with Journal(self.path) as journal:
+            journal.plan(self.directories)
+            for directory in self.directories:
+                journal.start(directory)
+            journal.commit(self.directories[0])
+            self.assertEqual(self.path, journal.path_get())
+
+        # Success if the events are recorded one per line
+        with open(self.path, "r") as journal_file:
+            self.assertEqual(JOURNAL_HEADER +
+                             "plan\talpha/\nplan\tbeta/\n"
+                             "start\talpha/\nstart\tbeta/\n"
+                             "commit\talpha/\n".replace("/", os.sep),
+                             journal_file.read())
+
+        # Fail because the journal is closed
+        with self.assertRaises(ValueError):
+            journal.commit(self.directories[1])
+
+    def test_journal_resume(self):
+        with Journal(self.path) as journal:
+            journal.plan(self.directories)
+            journal.start(self.directories[0])
+            journal.commit(self.directories[0])
+            journal.start(self.directories[1], "stage" + os.sep)
+        # A crash in the middle of the last event
+        with open(self.path, "a") as journal_file:
+            journal_file.write("commit\t" + self.directories[1][:-1])
+
+        # Success if the committed and started events are read back and the
+        # line cut short is dropped
+        with Journal(self.path, resume=True) as journal:
+            self.assertTrue(journal.committed_contains(self.directories[0]))
+            self.assertTrue(journal.committed_contains(
+                os.curdir + os.sep + self.directories[0][:-1]))
+            self.assertFalse(journal.committed_contains(self.directories[1]))
+            self.assertTrue(journal.partial_contains(self.directories[1]))
+            self.assertEqual({self.directories[1][:-1]},
+                             journal.partial_get())
+            self.assertEqual("stage" + os.sep,
+                             journal.stage_get(self.directories[1]))
+            self.assertIsNone(journal.stage_get(self.directories[0]))
+            journal.commit(self.directories[1])
+        with Journal(self.path, resume=True) as journal:
+            self.assertTrue(all(journal.committed_contains(directory)
+                                for directory in self.directories))
+            self.assertEqual(set(), journal.partial_get())
+            self.assertIsNone(journal.stage_get(self.directories[1]))
+
+        # Success if the journal is started over without 'resume'
+        with Journal(self.path) as journal:
+            self.assertFalse(journal.committed_contains(self.directories[0]))
+        with open(self.path, "r") as journal_file:
+            self.assertEqual(JOURNAL_HEADER, journal_file.read())
+
+        # Fail because the file is not a journal
+        with open(self.path, "w") as journal_file:
+            journal_file.write("plan\talpha\n")
+        with self.assertRaises(ValueError):
+            Journal(self.path, resume=True)
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for layouttools module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import os
+import unittest
+
+from tempfile import TemporaryDirectory
+from skaff.config import SkaffConfig
+from skaff.jobtools import job_create
+from skaff.layouttools import (
+    DOXYFILE,
+    LAYOUT_OPS,
+    LAYOUT_STEPS,
+    layout_get,
+    layout_paths_get,
+    layout_write,
+    tree_plan_get
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class TestLayoutTools(unittest.TestCase):
+    """
+    Unit testing suite for 'layouttools' module.
+    """
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        if not self.tmp_dir.name.endswith(os.sep):
+            self.tmp_dir.name += os.sep
+        self.directories = [self.tmp_dir.name + name + os.sep
+                            for name in ("alpha", "beta")]
+        self.config = SkaffConfig(self.directories, quiet=True)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_layout_get(self):
+        alpha, beta = (job_create(directory, self.config)
+                       for directory in self.directories)
+        layout = layout_get(alpha, False)
+
+        # Success if the jobs sharing their settings share the layout
+        self.assertIs(layout, layout_get(beta, False))
+        for index, entry in enumerate(layout):
+            self.assertIn(entry.op, LAYOUT_OPS)
+            self.assertIn(entry.step, LAYOUT_STEPS)
+            # Success if every entry comes after the directory it is in
+            self.assertLess(entry.parent, index)
+            if -1 != entry.parent:
+                self.assertEqual("mkdir", layout[entry.parent].op)
+
+        # Success if only the source of 'Doxyfile' follows 'doxygen'
+        doxyfiles = [entry for entry in layout_get(alpha, True)
+                     if DOXYFILE == entry.name]
+        self.assertEqual(1, len(doxyfiles))
+        self.assertEqual(("render", None), (doxyfiles[0].op,
+                                            doxyfiles[0].source))
+
+        # Fail because the subdirectory leads out of the project-directory
+        with self.assertRaises(ValueError):
+            layout_get(alpha._replace(subdirectories=(os.pardir,)), False)
+
+    def test_layout_write(self):
+        job = job_create(self.directories[0], self.config)
+        layout = layout_get(job, False)
+
+        # Fail due to unknown step
+        with self.assertRaises(ValueError):
+            layout_write(job, "install")
+
+        # Success if every entry of the layout is written where
+        # 'layout_paths_get' says
+        for step in LAYOUT_STEPS:
+            layout_write(job, step, False)
+        for path, entry in zip(layout_paths_get(job, layout), layout):
+            if "mkdir" == entry.op:
+                self.assertTrue(path.endswith(os.sep))
+                self.assertTrue(os.path.isdir(job.directory + path))
+            else:
+                self.assertTrue(os.path.isfile(job.directory + path))
+
+        # Fail because the project-directory already exists
+        with self.assertRaises(FileExistsError):
+            layout_write(job, "tree")
+
+        # Fail because a template of the 'conf' step is not enabled
+        job = job._replace(templates=tuple())
+        with self.assertRaises(FileNotFoundError):
+            layout_write(job, "conf")
+
+    def test_tree_plan_get(self):
+        # Success if the parents missing from 'subdirectories' are listed
+        # ahead of their children and duplicates are listed once
+        self.assertEqual(("doc", "src", "doc" + os.sep + "api"),
+                         tree_plan_get(("doc" + os.sep + "api", "src",
+                                        "src" + os.sep, os.curdir)))
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
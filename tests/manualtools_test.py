@@ -4,6 +4,7 @@
 Unit testing suite for manualtools module.
 """
 # --------------------------------- MODULES -----------------------------------
+import gzip
 import os
 import string
 import tempfile
@@ -11,8 +12,14 @@ import unittest
 
 from skaff.manualtools import (
     manual_check,
+    manual_compress,
+    manuals_compress,
+    manuals_index,
     manuals_install,
     manuals_probe,
+    manpath_resolve,
+    manpath_select,
+    _manpath_config_parse
 )
 # --------------------------------- MODULES -----------------------------------
 
@@ -55,6 +62,59 @@ class TestManualTools(unittest.TestCase):
         manuals = [os.path.basename(manual) for manual in manuals]
         self.assertTrue(all(manual_check(manual) for manual in manuals))
 
+    def test_manual_compress(self):
+        manual = self.tmp_dir.name + "test.1"
+        content = b".TH TEST 1\n" * 100
+
+        with open(manual, "wb") as manual_file:
+            manual_file.write(content)
+
+        target = manual_compress(manual)
+        self.assertEqual(manual + ".gz", target)
+        with gzip.open(target, "rb") as gzip_file:
+            self.assertEqual(content, gzip_file.read())
+
+        # Success if the output is reproducible regardless of the time and
+        # the name of the target
+        with open(target, "rb") as gzip_file:
+            expected = gzip_file.read()
+        os.utime(manual, (1, 1))
+        target = manual_compress(manual, self.tmp_dir.name + "other.gz")
+        with open(target, "rb") as gzip_file:
+            self.assertEqual(expected, gzip_file.read())
+
+    def test_manuals_compress(self):
+        directory = self.tmp_dir.name
+        custom_man_path = directory + "man" + os.sep
+        manuals = [directory + "test." + str(digit) for digit in range(1, 4)]
+
+        # Fail due to non-existing manuals
+        with self.assertRaises(FileNotFoundError):
+            manuals_compress(*manuals)
+
+        for manual in manuals:
+            with open(manual, "w") as manual_file:
+                manual_file.write(".TH " + manual + "\n")
+
+        gzipped = manuals_compress(*manuals, workers=2)
+        self.assertEqual([manual + ".gz" for manual in manuals], gzipped)
+        self.assertTrue(all(os.path.isfile(manual) for manual in gzipped))
+
+        # Success if the pre-compressed manual pages are copied as is
+        with open(gzipped[0], "wb") as gzip_file:
+            gzip_file.write(b"precompressed")
+        os.mkdir(custom_man_path)
+        manuals_install(custom_man_path, False, *manuals)
+        with open(custom_man_path + "test.1.gz", "rb") as gzip_file:
+            self.assertEqual(b"precompressed", gzip_file.read())
+
+        # Success if a stale pre-compressed manual page is ignored
+        os.utime(gzipped[0], (1, 1))
+        manuals_install(custom_man_path, False, *manuals)
+        with gzip.open(custom_man_path + "test.1.gz", "rb") as gzip_file:
+            self.assertEqual(".TH " + manuals[0] + "\n",
+                             gzip_file.read().decode())
+
     def test_manuals_install(self):
         isfile = os.path.isfile
         basename = os.path.basename
@@ -82,6 +142,14 @@ class TestManualTools(unittest.TestCase):
         for manual in manuals:
             self.assertTrue(isfile(custom_man_path + basename(manual) + ".gz"))
 
+        # Success - identical manuals are not written again
+        self.assertEqual([], manuals_install(custom_man_path, False, *manuals))
+
+        with open(manuals[0], "w") as manual_file:
+            manual_file.write(".TH TEST 1\n")
+        self.assertEqual([custom_man_path + basename(manuals[0]) + ".gz"],
+                         manuals_install(custom_man_path, False, *manuals))
+
         # Success - manuals are installed to the subdirectory that ends with
         # an extra manual page section number
         for digit, manual in zip(range(1, 10), manuals):
@@ -90,6 +158,18 @@ class TestManualTools(unittest.TestCase):
             manuals_install(manpath_subdir, False, manual)
             self.assertTrue(isfile(manpath_subdir + basename(manual) + ".gz"))
 
+    def test_manuals_index(self):
+        # Success if there is nothing to update
+        self.assertIsNone(manuals_index())
+        self.assertIsNone(manuals_index(background=True))
+
+        # Success if the background update does not block the caller; its
+        # failure (e.g. 'mandb' is not installed) is not reported
+        process = manuals_index(self.tmp_dir.name + "test.1.gz",
+                                background=True)
+        self.assertIsNotNone(process)
+        process.wait()
+
     def test_manuals_probe(self):
         directory = self.tmp_dir.name
         dummy_file = None
@@ -140,11 +220,58 @@ class TestManualTools(unittest.TestCase):
         # so there is no need to call something like 'os.remove' for files in
         # the original 'file_entries' set.
 
+    def test_manpath_resolve(self):
+        directory = self.tmp_dir.name
+        config_file = directory + "manpath.config"
+        environ_manpath = os.environ.get("MANPATH")
+
+        with open(config_file, "w") as config:
+            config.write("# MANDATORY_MANPATH /ignored\n"
+                         "MANDATORY_MANPATH /usr/man\n"
+                         "MANPATH_MAP /bin /usr/share/man # comment\n"
+                         "MANDB_MAP /usr/man /var/cache/man/fsstnd\n")
+        self.assertEqual(["/usr/man", "/usr/share/man"],
+                         _manpath_config_parse(config_file))
+
+        try:
+            os.environ["MANPATH"] = os.pathsep.join((directory + "a",
+                                                     directory + "b",
+                                                     directory + "a"))
+            # Success if duplicates are dropped and separators appended
+            self.assertEqual([directory + "a" + os.sep,
+                              directory + "b" + os.sep],
+                             manpath_resolve())
+        finally:
+            if environ_manpath is None:
+                del os.environ["MANPATH"]
+            else:
+                os.environ["MANPATH"] = environ_manpath
+
     def test_manpath_select(self):
-        # Untested because the author does not know how to inject a mock
-        # 'manpath' program into the 'manpath_select' function without adding
-        # an extra formal parameter for it.
-        pass
+        directory = self.tmp_dir.name
+        environ_manpath = os.environ.get("MANPATH")
+        paths = [directory + name + os.sep for name in ("a", "b", "c")]
+
+        for path in paths:
+            os.mkdir(path)
+        with open(paths[1] + "test.1", "w"):
+            pass
+
+        try:
+            os.environ["MANPATH"] = os.pathsep.join(paths)
+            # Success if the first non-empty directory is selected
+            self.assertEqual(paths[1], manpath_select())
+            self.assertEqual(paths, manpath_select(False))
+
+            # Fail because all the directories are empty
+            os.environ["MANPATH"] = os.pathsep.join((paths[0], paths[2]))
+            with self.assertRaises(RuntimeError):
+                manpath_select()
+        finally:
+            if environ_manpath is None:
+                del os.environ["MANPATH"]
+            else:
+                os.environ["MANPATH"] = environ_manpath
 # --------------------------------- CLASSES -----------------------------------
 
 if __name__ == "__main__":
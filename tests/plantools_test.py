@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for plantools module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import os
+import unittest
+
+from tempfile import TemporaryDirectory
+from unittest import mock
+from skaff.config import SkaffConfig
+from skaff.driver import skaff_drive
+from skaff.jobtools import jobs_create
+from skaff.plantools import (
+    Plan,
+    PlanOp,
+    plan_create
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class TestPlanTools(unittest.TestCase):
+    """
+    Unit testing suite for 'plantools' module.
+    """
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        if not self.tmp_dir.name.endswith(os.sep):
+            self.tmp_dir.name += os.sep
+        self.directories = [self.tmp_dir.name + name + os.sep
+                            for name in ("alpha", "beta")]
+        self.config = SkaffConfig(self.directories, quiet=True)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_plan(self):
+        plan = Plan()
+        root = plan.add("mkdir", -1, "alpha")
+        src = plan.add("mkdir", root, "src")
+        main = plan.add("copy", src, "main.c", "template.c")
+        plan.add("mkdir", -1, "beta")
+
+        # Success if the paths are joined from the interned names
+        self.assertEqual([PlanOp("mkdir", "alpha" + os.sep, None),
+                          PlanOp("mkdir", os.sep.join(("alpha", "src", "")),
+                                 None),
+                          PlanOp("copy", os.sep.join(("alpha", "src",
+                                                      "main.c")),
+                                 "template.c"),
+                          PlanOp("mkdir", "beta" + os.sep, None)],
+                         list(plan))
+        self.assertEqual(4, len(plan))
+        self.assertEqual(os.sep.join(("alpha", "src", "main.c")),
+                         plan.path_get(main))
+        self.assertEqual("beta" + os.sep, plan.path_get(3))
+
+        # Fail due to an unknown operation
+        with self.assertRaises(ValueError):
+            plan.add("remove", root, "src")
+
+        # Fail because the parent is not a directory (or does not exist)
+        for parent in (main, len(plan), -2):
+            with self.assertRaises(ValueError):
+                plan.add("mkdir", parent, "include")
+
+    def test_plan_create(self):
+        plan = plan_create(jobs_create(self.config))
+        skaff_drive(self.config)
+
+        # Success if the plan lists exactly what is generated
+        generated = set()
+        for directory in self.directories:
+            for root, sub_dirs, files in os.walk(directory):
+                generated.add(root.rstrip(os.sep) + os.sep)
+                generated.update(root.rstrip(os.sep) + os.sep + name
+                                 for name in files)
+        self.assertEqual(generated, {op.path for op in plan})
+        for op in plan:
+            self.assertEqual(op.path.endswith(os.sep), "mkdir" == op.op)
+            if "copy" == op.op:
+                self.assertTrue(os.path.isfile(op.source))
+
+        # Success if the names shared by the projects are only stored once
+        size = plan.nbytes_get()
+        plan_create(jobs_create(self.config), plan)
+        self.assertEqual(2 * len(plan_create(jobs_create(self.config))),
+                         len(plan))
+        self.assertLess(plan.nbytes_get() - size, size / 2)
+
+        # Success if the source of 'Doxyfile' follows whether 'doxygen' is
+        # found, even after a plan is created for the same jobs
+        for found in (False, True):
+            with mock.patch("skaff.plantools.doxygen_found",
+                            return_value=found):
+                plan = plan_create(jobs_create(self.config))
+            doxyfiles = [op for op in plan
+                         if os.path.basename(op.path) == "Doxyfile"]
+            self.assertEqual(len(self.directories), len(doxyfiles))
+            for op in doxyfiles:
+                self.assertEqual(found, op.source is None)
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for registry module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import os
+import tempfile
+import unittest
+
+from skaff.registry import (
+    LicenseEntry,
+    LicenseRegistry,
+    TemplateRegistry,
+    license_registry_get,
+    template_registry_get
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class TestRegistry(unittest.TestCase):
+    """
+    Unit testing suite for 'registry' module.
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        if not self.tmp_dir.name.endswith(os.sep):
+            self.tmp_dir.name += os.sep
+        self.user_path = self.tmp_dir.name + "user" + os.sep
+        self.system_path = self.tmp_dir.name + "system" + os.sep
+        os.mkdir(self.user_path)
+        os.mkdir(self.system_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _files_create(self, path, *names):
+        for name in names:
+            with open(path + name, "w"):
+                pass
+
+    def _age(self, *paths):
+        # Moves the time stamps back so the directories are not 'racy'
+        for path in paths:
+            timestamp = os.stat(path).st_mtime - 60
+            os.utime(path, (timestamp, timestamp))
+
+    def test_license_registry_get(self):
+        registry = license_registry_get(self.user_path, self.system_path)
+
+        # Success if the registry is shared regardless of trailing separators
+        self.assertIs(registry, license_registry_get(self.user_path[:-1],
+                                                     self.system_path[:-1]))
+        self.assertIsInstance(registry, LicenseRegistry)
+
+        # Fail due to wrong type of path
+        with self.assertRaises(TypeError):
+            license_registry_get(None, self.system_path)
+
+    def test_refresh(self):
+        registry = LicenseRegistry(self.user_path, self.system_path)
+        self._files_create(self.system_path,
+                           "bsd2.txt", "bsd2.md", "mit.txt", "mit.md",
+                           "orphan.txt", ".hidden.txt", ".hidden.md")
+        self._files_create(self.user_path, "mit.txt", "mit.md")
+        self._age(self.user_path, self.system_path)
+
+        entries = registry.refresh()
+        self.assertCountEqual(("bsd2", "mit"), entries.keys())
+        self.assertEqual(frozenset(("bsd2", "mit")),
+                         registry.system_names_get())
+        # Success if the 'user' license overrides the 'system' one
+        self.assertEqual(LicenseEntry(self.user_path + "mit.txt",
+                                      self.user_path + "mit.md"),
+                         entries["mit"])
+        self.assertEqual(self.system_path + "bsd2.txt", entries["bsd2"].text)
+
+        # Success if nothing is re-scanned while the paths are unchanged
+        self.assertIs(entries, registry.refresh())
+        self.assertIs(entries, registry.entries_get())
+
+        # Success if adding a license is picked up
+        self._files_create(self.user_path, "zlib.txt", "zlib.md")
+        self.assertIn("zlib", registry.refresh())
+
+        # Fail due to the lack of the corresponding markdown file
+        self._files_create(self.user_path, "isc.txt")
+        with self.assertRaises(FileNotFoundError) as context:
+            registry.refresh()
+        self.assertTrue(str(context.exception).endswith(
+            "file extension: .txt, .md"))
+
+        # Success if the 'user' path does not exist at all
+        registry = LicenseRegistry(self.tmp_dir.name + "void" + os.sep,
+                                   self.system_path)
+        self.assertCountEqual(("bsd2", "mit"), registry.refresh().keys())
+
+    def test_template_registry_get(self):
+        registry = template_registry_get(self.user_path, self.system_path)
+
+        self.assertIs(registry, template_registry_get(self.user_path[:-1],
+                                                      self.system_path))
+        self.assertIsInstance(registry, TemplateRegistry)
+
+        # Fail due to wrong type of path
+        with self.assertRaises(TypeError):
+            template_registry_get(self.user_path, None)
+
+    def test_template_refresh(self):
+        registry = TemplateRegistry(self.user_path, self.system_path)
+        nested = "c" + os.sep + "src" + os.sep
+        os.makedirs(self.system_path + nested)
+        os.makedirs(self.user_path + nested)
+        self._files_create(self.system_path, "Doxyfile", nested + "main.c")
+        with open(self.user_path + nested + "main.c", "w") as template:
+            template.write("int main(void) { return 0; }\n")
+        self._age(self.user_path, self.user_path + "c",
+                  self.user_path + nested, self.system_path,
+                  self.system_path + "c", self.system_path + nested)
+
+        entries = registry.refresh()
+        self.assertCountEqual(("Doxyfile", nested + "main.c"), entries.keys())
+        # Success if the 'user' template overrides the 'system' one
+        self.assertEqual(self.user_path + nested + "main.c",
+                         entries[nested + "main.c"].path)
+        self.assertEqual(29, entries[nested + "main.c"].size)
+        self.assertEqual(os.path.getsize(self.system_path + "Doxyfile"),
+                         entries["Doxyfile"].size)
+
+        # Success if nothing is re-walked while the trees are unchanged
+        self.assertIs(entries, registry.refresh())
+
+        # Success if a template added to a nested directory is picked up
+        self._files_create(self.system_path, nested + "CMakeLists.txt")
+        self.assertIn(nested + "CMakeLists.txt", registry.refresh())
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for schedtools module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import threading
+import time
+import unittest
+
+from skaff.schedtools import (
+    IOMetrics,
+    IOScheduler
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class TestSchedTools(unittest.TestCase):
+    """
+    Unit testing suite for 'schedtools' module.
+    """
+    def test_io_scheduler(self):
+        # Fail due to the starting limit being out of bounds
+        with self.assertRaises(ValueError):
+            IOScheduler(limit_max=2, limit=4)
+        with self.assertRaises(ValueError):
+            IOScheduler(limit_max=0)
+
+        with IOScheduler(limit_max=4, limit=1) as scheduler:
+            self.assertEqual(4, scheduler.limit_max_get())
+            futures = [scheduler.submit(pow, 2, power) for power in range(8)]
+            failure = scheduler.submit(int, "not a number")
+            self.assertEqual([2 ** power for power in range(8)],
+                             [future.result() for future in futures])
+            # Fail with the exception raised by the operation
+            with self.assertRaises(ValueError):
+                failure.result()
+
+        metrics = scheduler.metrics_get()
+        self.assertIsInstance(metrics, IOMetrics)
+        self.assertEqual(9, metrics.operations)
+        self.assertTrue(1 <= metrics.concurrency <= 4)
+        self.assertTrue(1 <= metrics.peak <= 4)
+
+    def test_io_scheduler_order(self):
+        started = list()
+        gate = threading.Event()
+
+        with IOScheduler(limit_max=1) as scheduler:
+            # Holds the only slot while the rest is queued
+            scheduler.submit(gate.wait)
+            for size in (1, 30, 2, 30):
+                scheduler.submit(started.append, size, size=size)
+            gate.set()
+
+        # Success if the largest are started first, in the order submitted
+        # among equal sizes
+        self.assertEqual([30, 30, 2, 1], started)
+
+    def test_io_scheduler_adapt(self):
+        # Operations that slow down as more of them are in flight, like a
+        # saturated disk
+        flight = [0]
+        lock = threading.Lock()
+
+        def _operation():
+            with lock:
+                flight[0] += 1
+                delay = 0.001 * flight[0] ** 2
+            time.sleep(delay)
+            with lock:
+                flight[0] -= 1
+
+        with IOScheduler(limit_max=32, limit=2) as scheduler:
+            for _ in range(200):
+                scheduler.submit(_operation)
+
+        # Success if the concurrency stays where the latency is still low
+        self.assertLessEqual(scheduler.metrics_get().concurrency, 4)
+
+        # Success if the concurrency grows while the latency stays the same
+        with IOScheduler(limit_max=32, limit=1) as scheduler:
+            for _ in range(200):
+                scheduler.submit(time.sleep, 0.001)
+        self.assertGreater(scheduler.metrics_get().concurrency, 4)
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
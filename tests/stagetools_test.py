@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for stagetools module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import os
+import shutil
+import time
+import unittest
+
+from tempfile import TemporaryDirectory
+from unittest import mock
+from skaff.stagetools import (
+    STAGE_PREFIX,
+    rename_noreplace,
+    stage_create,
+    stage_discard,
+    stage_publish,
+    stages_clean,
+    stages_parents_clean,
+    _stage_host_get
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# ------------------------------- CONSTANTS -----------------------------------
+# A 'tmpfs' on most Linux distributions
+_SHM_DIRECTORY = os.sep + "dev" + os.sep + "shm"
+# ------------------------------- CONSTANTS -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class TestStageTools(unittest.TestCase):
+    """
+    Unit testing suite for 'stagetools' module.
+    """
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        if not self.tmp_dir.name.endswith(os.sep):
+            self.tmp_dir.name += os.sep
+        self.project = self.tmp_dir.name + "project" + os.sep
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _stage_fill(self, stage):
+        """
+        Writes a small project into 'stage'.
+        """
+        os.makedirs(stage + "src")
+        with open(stage + "src" + os.sep + "main.c", "w") as output_file:
+            output_file.write("int main(void) { return 0; }\n")
+
+    def test_rename_noreplace(self):
+        source = self.tmp_dir.name + "source"
+        os.mkdir(source)
+        os.mkdir(self.project)
+
+        # Fail even though the target is an empty directory
+        with self.assertRaises(FileExistsError):
+            rename_noreplace(source, self.project)
+        self.assertTrue(os.path.isdir(source))
+
+        os.rmdir(self.project)
+        rename_noreplace(source, self.project)
+        self.assertTrue(os.path.isdir(self.project))
+        self.assertFalse(os.path.exists(source))
+
+    def test_stage_create(self):
+        stage = stage_create(self.project)
+
+        # Success if the stage is hidden next to the project-directory and
+        # the project-directory itself is not created
+        self.assertTrue(os.path.dirname(os.path.dirname(stage[:-1]))
+                        .startswith(self.tmp_dir.name[:-1]))
+        self.assertTrue(os.path.basename(os.path.dirname(stage[:-1]))
+                        .startswith(STAGE_PREFIX + _stage_host_get() + "-" +
+                                    str(os.getpid()) + "-"))
+        self.assertFalse(os.path.exists(stage))
+        self.assertFalse(os.path.exists(self.project))
+
+        stage_discard(stage)
+        self.assertEqual([], os.listdir(self.tmp_dir.name))
+
+        # Fail due to pre-existing project-directory
+        os.mkdir(self.project)
+        with self.assertRaises(FileExistsError):
+            stage_create(self.project)
+
+    def test_stage_publish(self):
+        stage = stage_create(self.project)
+        self._stage_fill(stage)
+        stage_publish(stage, self.project, "strict")
+
+        # Success if the project is renamed into place and nothing else is
+        # left behind
+        self.assertEqual(["project"], os.listdir(self.tmp_dir.name))
+        self.assertTrue(os.path.isfile(self.project + "src" + os.sep +
+                                       "main.c"))
+
+        # Fail (keeping the stage) if the project-directory appears while the
+        # project is staged
+        stage = stage_create(self.tmp_dir.name + "other")
+        self._stage_fill(stage)
+        os.mkdir(self.tmp_dir.name + "other")
+        with self.assertRaises(FileExistsError):
+            stage_publish(stage, self.tmp_dir.name + "other")
+        self.assertTrue(os.path.isdir(stage))
+        stage_discard(stage)
+
+    @unittest.skipIf(not os.path.isdir(_SHM_DIRECTORY), "no shared memory")
+    def test_stage_publish_copy(self):
+        if os.stat(_SHM_DIRECTORY).st_dev == os.stat(self.tmp_dir.name).st_dev:
+            self.skipTest("shared memory on the same file system")
+
+        with TemporaryDirectory(dir=_SHM_DIRECTORY) as stage_directory:
+            stage = stage_create(self.project, stage_directory)
+            self._stage_fill(stage)
+            with mock.patch("shutil.copytree",
+                            wraps=shutil.copytree) as copytree:
+                stage_publish(stage, self.project, "batch")
+            # Success if a stage on another file system is copied next to the
+            # project-directory in one go before being renamed into place
+            self.assertEqual(stage, copytree.call_args_list[0][0][0])
+            self.assertEqual([], os.listdir(stage_directory))
+
+        self.assertEqual(["project"], os.listdir(self.tmp_dir.name))
+        self.assertTrue(os.path.isfile(self.project + "src" + os.sep +
+                                       "main.c"))
+
+    def test_stages_clean(self):
+        stale = self.tmp_dir.name + STAGE_PREFIX + _stage_host_get() +\
+            "-0-stale"
+        remote = self.tmp_dir.name + STAGE_PREFIX + "other-host-0-remote"
+        live = stage_create(self.project)
+        os.makedirs(stale + os.sep + "project")
+        os.makedirs(remote + os.sep + "project")
+
+        # Success if only the staging directory of no running process is
+        # removed; the one of another host is kept (its owner cannot be
+        # probed) as long as it is not older than a day
+        self.assertEqual([stale], stages_clean(self.tmp_dir.name))
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.isdir(remote))
+        self.assertTrue(os.path.isdir(os.path.dirname(live[:-1])))
+
+        two_days_ago = time.time() - 2 * 24 * 60 * 60
+        os.utime(remote, (two_days_ago, two_days_ago))
+        self.assertEqual([remote], stages_clean(self.tmp_dir.name))
+        self.assertTrue(os.path.isdir(os.path.dirname(live[:-1])))
+
+        # Success if a staging directory named after this process but not
+        # in use by it is only removed once it is older than a day, unlike
+        # the ones in use
+        leaked = self.tmp_dir.name + STAGE_PREFIX + _stage_host_get() +\
+            "-" + str(os.getpid()) + "-leaked"
+        os.mkdir(leaked)
+        self.assertEqual([], stages_clean(self.tmp_dir.name))
+        for path in (leaked, os.path.dirname(live[:-1])):
+            os.utime(path, (two_days_ago, two_days_ago))
+        self.assertEqual([leaked], stages_clean(self.tmp_dir.name))
+        self.assertTrue(os.path.isdir(os.path.dirname(live[:-1])))
+        stage_discard(live)
+
+        # Success if nothing is done for a missing directory
+        self.assertEqual([], stages_clean(self.project))
+
+    def test_stages_parents_clean(self):
+        stale = self.tmp_dir.name + STAGE_PREFIX + _stage_host_get() +\
+            "-0-stale"
+        cleaned = set()
+
+        # Success if the parent of the project-directories is cleaned once
+        # and recorded in 'cleaned'
+        os.mkdir(stale)
+        stages_parents_clean((self.project, self.tmp_dir.name + "beta"),
+                             cleaned=cleaned)
+        self.assertFalse(os.path.exists(stale))
+        self.assertEqual({self.tmp_dir.name.rstrip(os.sep)}, cleaned)
+
+        # Success if the parents in 'cleaned' are skipped
+        os.mkdir(stale)
+        stages_parents_clean((self.project,), cleaned=cleaned)
+        self.assertTrue(os.path.isdir(stale))
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
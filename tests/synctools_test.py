@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+"""
+Unit testing suite for synctools module.
+"""
+# --------------------------------- MODULES -----------------------------------
+import os
+import unittest
+
+from tempfile import TemporaryDirectory
+from unittest import mock
+from skaff.synctools import (
+    DURABILITY_MODES,
+    durability_check,
+    tree_sync
+)
+# --------------------------------- MODULES -----------------------------------
+
+
+# --------------------------------- CLASSES -----------------------------------
+class TestSyncTools(unittest.TestCase):
+    """
+    Unit testing suite for 'synctools' module.
+    """
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        if not self.tmp_dir.name.endswith(os.sep):
+            self.tmp_dir.name += os.sep
+        self.project = self.tmp_dir.name + "project" + os.sep
+        os.makedirs(self.project + "src" + os.sep + "empty")
+        for name in ("README.md", "src" + os.sep + "main.c"):
+            with open(self.project + name, "w") as output_file:
+                output_file.write(name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_durability_check(self):
+        for mode in DURABILITY_MODES:
+            durability_check(mode)
+
+        # Fail due to unknown mode
+        with self.assertRaises(ValueError):
+            durability_check("paranoid")
+
+    def test_tree_sync(self):
+        # Fail due to unknown mode
+        with self.assertRaises(ValueError):
+            tree_sync(self.project, "paranoid")
+
+        with mock.patch("os.fsync", wraps=os.fsync) as fsync:
+            # Success if nothing is flushed
+            self.assertEqual(0, tree_sync(self.project, "none"))
+            self.assertEqual(0, fsync.call_count)
+
+            # Success if the 2 files, the 3 directories of the tree and the
+            # parent directory are flushed once each, without flushing the
+            # file system as a whole unless asked to
+            with mock.patch("skaff.synctools._syncfs_call") as syncfs:
+                self.assertEqual(2, tree_sync(self.project, "batch",
+                                              workers=2))
+            self.assertFalse(syncfs.called)
+            expected = 6 if "posix" == os.name else 2
+            self.assertEqual(expected, fsync.call_count)
+
+            # Success if a whole file system flush replaces them, without
+            # listing the tree
+            fsync.reset_mock()
+            with mock.patch("skaff.synctools._syncfs_call",
+                            return_value=True):
+                with mock.patch("os.walk") as walk:
+                    self.assertEqual(0, tree_sync(self.project, "batch",
+                                                  filesystem=True))
+            self.assertFalse(walk.called)
+            self.assertFalse(fsync.called)
+
+            # Success if each directory is flushed once, after the files in
+            # it
+            with open(self.project + "CHANGELOG.md", "w") as output_file:
+                output_file.write("CHANGELOG.md")
+            fsync.reset_mock()
+            self.assertEqual(3, tree_sync(self.project, "strict"))
+            expected = 7 if "posix" == os.name else 3
+            self.assertEqual(expected, fsync.call_count)
+# --------------------------------- CLASSES -----------------------------------
+
+if __name__ == "__main__":
+    unittest.main()